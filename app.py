@@ -3,12 +3,20 @@ import json
 import os
 
 # Import from restructured packages
-from src.scrapers import scrape_papers_with_abstracts, scrape_mendeley_papers, search_semantic_scholar
+from src.scrapers import search_sources, get_http_client, get_response_cache
 from src.core import (
+    RANKERS,
     rank_papers_with_cbf, 
+    rank_papers_batch_with_cbf,
     get_paper_recommendations, 
     find_similar_papers, 
     get_cbf_calculation_details,
+    build_paper_index,
+    get_paper_index,
+    preprocess_papers,
+    deduplicate_papers,
+    get_query_cache,
+    invalidate_query_cache,
     generate_evaluation_report, 
     evaluate_by_relevance_threshold
 )
@@ -33,6 +41,9 @@ if not os.path.exists('uploads'):
 def index():
     return render_template('index.html')
 
+# Batas candidate_pool /api/search (Semantic Scholar: offset + limit <= 1000)
+MAX_CANDIDATE_POOL = 1000
+
 @app.route('/api/search', methods=['POST'])
 def search_papers():
     try:
@@ -42,65 +53,65 @@ def search_papers():
         filters = data.get('filters', {})
         source = data.get('source', 'semantic')  # scholar, mendeley, semantic, or both
         use_cbf = data.get('use_cbf', True)  # Use Content-Based Filtering
-        
-        print(f"[DEBUG] Search request: query='{query}', max_results={max_results}, source={source}")
-        print(f"[DEBUG] Filters: {filters}, CBF: {use_cbf}")
+        ranker = data.get('ranker', 'tfidf')  # tfidf or bm25
         
         if not query:
             return jsonify({'error': 'Query is required'}), 400
-        
-        papers = []
-        
-        # Search based on source selection
-        if source == 'scholar':
-            print(f"[DEBUG] Searching Google Scholar...")
-            scholar_papers = scrape_papers_with_abstracts(query, max_results, filters)
-            for paper in scholar_papers:
-                paper['source'] = 'Google Scholar'
-            papers.extend(scholar_papers)
-            print(f"[DEBUG] Found {len(scholar_papers)} papers from Google Scholar")
-            
-            # Fallback to Semantic Scholar if Google fails
-            if len(papers) == 0:
-                print(f"[DEBUG] Google Scholar failed, falling back to Semantic Scholar...")
-                semantic_papers = search_semantic_scholar(query, max_results, filters)
-                papers.extend(semantic_papers)
-        
-        elif source == 'semantic':
-            print(f"[DEBUG] Searching Semantic Scholar...")
-            semantic_papers = search_semantic_scholar(query, max_results, filters)
-            papers.extend(semantic_papers)
-            print(f"[DEBUG] Found {len(semantic_papers)} papers from Semantic Scholar")
-        
-        elif source == 'mendeley':
-            print(f"[DEBUG] Searching Mendeley...")
-            mendeley_papers = scrape_mendeley_papers(query, max_results, filters)
-            for paper in mendeley_papers:
-                paper['source'] = 'Mendeley'
-            papers.extend(mendeley_papers)
-            print(f"[DEBUG] Found {len(mendeley_papers)} papers from Mendeley")
-        
-        elif source == 'both':
-            # Use Semantic Scholar (more reliable) + Mendeley
-            print(f"[DEBUG] Searching multiple sources...")
-            
-            # Semantic Scholar
-            semantic_papers = search_semantic_scholar(query, max_results // 2, filters)
-            papers.extend(semantic_papers)
-            print(f"[DEBUG] Found {len(semantic_papers)} papers from Semantic Scholar")
-            
-            # Mendeley
-            mendeley_papers = scrape_mendeley_papers(query, max_results // 2, filters)
-            for paper in mendeley_papers:
-                paper['source'] = 'Mendeley'
-            papers.extend(mendeley_papers)
-            print(f"[DEBUG] Found {len(mendeley_papers)} papers from Mendeley")
+        if ranker not in RANKERS:
+            return jsonify({'error': f"Unknown ranker '{ranker}', use one of: {', '.join(RANKERS)}"}), 400
+        # Jumlah papers yang diambil untuk di-rank (>= max_results, maksimum 1000)
+        try:
+            candidate_pool = int(data.get('candidate_pool') or max_results)
+        except (TypeError, ValueError):
+            return jsonify({'error': 'candidate_pool must be an integer'}), 400
+        candidate_pool = min(max(candidate_pool, max_results), MAX_CANDIDATE_POOL)
+        
+        print(f"[DEBUG] Search request: query='{query}', max_results={max_results}, source={source}, "
+              f"candidate_pool={candidate_pool}")
+        print(f"[DEBUG] Filters: {filters}, CBF: {use_cbf}, ranker: {ranker}")
+        
+        # Query yang sama (setelah normalisasi) dilayani dari cache tanpa scraping ulang
+        cache = get_query_cache()
+        cache_key = cache.make_key(query, source, filters, max_results, use_cbf, ranker, candidate_pool)
+        # Entri hanya dipakai selama index result set-nya masih ada dengan versi yang sama
+        cached = cache.get(cache_key)
+        if cached is not None:
+            print(f"[DEBUG] Query cache hit: {cache_key[:8]}")
+            return jsonify(dict(cached, cached=True))
+        
+        # Semua source yang dipilih di-query bersamaan (timeout per source),
+        # latensi mengikuti source paling lambat, bukan jumlah semuanya
+        print(f"[DEBUG] Searching source(s): {source}...")
+        # Halaman hasil Semantic Scholar di-preprocess saat tiba (cache
+        # preprocessing), sehingga fit TF-IDF tidak menunggu semua halaman
+        papers, source_report = search_sources(query, source, candidate_pool, filters,
+                                               on_page=preprocess_papers if use_cbf else None)
+        
+        # Semua source gagal (misalnya 429 setelah retry): laporkan sebagai
+        # error, bukan "0 jurnal ditemukan"
+        failed = {name: r for name, r in source_report.items() if r['status'] in ('error', 'timeout')}
+        if not papers and failed:
+            details = '; '.join(f"{name}: {r.get('error', r['status'])}" for name, r in failed.items())
+            return jsonify({'error': f"Sumber pencarian tidak tersedia ({details})",
+                            'sources': source_report}), 503
+        
+        # Gabungkan paper duplikat antar source sebelum fit TF-IDF
+        if len(papers) > 1:
+            n_before = len(papers)
+            papers = deduplicate_papers(papers)
+            if len(papers) < n_before:
+                print(f"[DEBUG] Merged {n_before - len(papers)} duplicate papers")
         
         # Apply Content-Based Filtering (TF-IDF + Cosine Similarity ranking)
+        index = None
+        result_set_id = None
         if use_cbf and papers:
             print(f"[DEBUG] Applying Content-Based Filtering...")
             try:
-                papers = rank_papers_with_cbf(papers, query)
+                # Index disimpan agar endpoint lanjutan tidak perlu fit ulang
+                index = build_paper_index(papers)
+                result_set_id = index.result_set_id
+                papers = rank_papers_with_cbf(papers, query, index=index, top_k=max_results, ranker=ranker)
                 print(f"[DEBUG] Papers ranked by relevance")
             except Exception as e:
                 print(f"[WARNING] CBF failed: {e}, returning unranked results")
@@ -116,17 +127,136 @@ def search_papers():
         if papers:
             print(f"[DEBUG] Top paper: {papers[0].get('title', 'No title')[:50]}...")
         
-        return jsonify({
+        response = {
             'success': True,
             'papers': papers,
             'total': len(papers),
-            'evaluation': evaluation
-        })
+            'evaluation': evaluation,
+            'result_set_id': result_set_id,
+            'ranker': ranker,
+            'sources': source_report
+        }
+        # Hasil kosong / source yang gagal bisa karena scraping gagal sementara,
+        # jadi tidak di-cache
+        sources_ok = all(r['status'] in ('ok', 'skipped') for r in source_report.values())
+        if papers and sources_ok:
+            cache.put(cache_key, response, index=index)
+        return jsonify(dict(response, cached=False))
     
     except Exception as e:
         print(f"[ERROR] Search error: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+# Batas jumlah query per request /api/search/batch
+MAX_BATCH_QUERIES = 1000
+
+@app.route('/api/search/batch', methods=['POST'])
+def search_batch():
+    """
+    Rank banyak query terhadap corpus yang sama dalam satu request
+    
+    Corpus diambil dari result_set_id hasil /api/search (tanpa fit ulang)
+    atau dari daftar papers (fit satu kali untuk semua query).
+    """
+    try:
+        data = request.get_json()
+        queries = data.get('queries', [])
+        top_k = data.get('top_k', 10)
+        ranker = data.get('ranker', 'tfidf')
+        papers = data.get('papers', [])
+        
+        if not queries or not isinstance(queries, list):
+            return jsonify({'error': 'queries must be a non-empty list'}), 400
+        if len(queries) > MAX_BATCH_QUERIES:
+            return jsonify({'error': f'At most {MAX_BATCH_QUERIES} queries per request'}), 400
+        if ranker not in RANKERS:
+            return jsonify({'error': f"Unknown ranker '{ranker}', use one of: {', '.join(RANKERS)}"}), 400
+        
+        result_set_id = data.get('result_set_id')
+        index = get_paper_index(result_set_id)
+        if result_set_id and index is None and not papers:
+            return jsonify({'error': 'Result set expired, please search again'}), 404
+        if index is None and not papers:
+            return jsonify({'error': 'result_set_id or papers is required'}), 400
+        
+        print(f"[DEBUG] Batch search: {len(queries)} queries, top_k={top_k}, ranker={ranker}")
+        
+        ranked = rank_papers_batch_with_cbf(papers, [str(q) for q in queries], index=index,
+                                            top_k=top_k, ranker=ranker)
+        
+        return jsonify({
+            'success': True,
+            'results': [
+                {'query': query, 'papers': result, 'total': len(result)}
+                for query, result in zip(queries, ranked)
+            ],
+            'total_queries': len(queries),
+            'result_set_id': index.result_set_id if index is not None else None,
+            'ranker': ranker
+        })
+    
+    except Exception as e:
+        print(f"[ERROR] Batch search error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/search/cache', methods=['GET'])
+def search_cache_stats():
+    """Statistik cache hasil pencarian (hit rate, ukuran, fingerprint index)"""
+    return jsonify({'success': True, 'cache': get_query_cache().stats()})
+
+@app.route('/api/search/cache/invalidate', methods=['POST'])
+def search_cache_invalidate():
+    """Buang semua hasil pencarian yang di-cache (index berubah)"""
+    invalidate_query_cache()
+    return jsonify({'success': True, 'cache': get_query_cache().stats()})
+
+@app.route('/api/http/stats', methods=['GET'])
+def http_stats():
+    """Statistik connection pool scraper dan response cache API"""
+    return jsonify({
+        'success': True,
+        'http': get_http_client().stats(),
+        'response_cache': get_response_cache().stats()
+    })
+
+@app.route('/api/index/update', methods=['POST'])
+def update_index():
+    """
+    Tambah / hapus papers pada result set yang tersimpan tanpa fit ulang.
+    Papers baru diberi doc_id baru; doc_id papers lain tidak berubah, dan
+    doc_id yang dihapus tidak berlaku lagi (404 di endpoint lanjutan).
+    """
+    try:
+        data = request.get_json()
+        papers = data.get('papers', [])
+        remove_doc_ids = data.get('remove_doc_ids', [])
+        
+        if not isinstance(papers, list) or not isinstance(remove_doc_ids, list):
+            return jsonify({'error': 'papers and remove_doc_ids must be lists'}), 400
+        
+        index = get_paper_index(data.get('result_set_id'))
+        if index is None:
+            return jsonify({'error': 'Result set expired, please search again'}), 404
+        
+        removed = index.remove_papers(remove_doc_ids) if remove_doc_ids else 0
+        added = index.add_papers(deduplicate_papers(papers)) if papers else []
+        # Hasil pencarian yang di-cache untuk result set ini ikut tidak terpakai
+        # (versi index berubah), cache query lain tetap
+        print(f"[DEBUG] Index {index.result_set_id}: +{len(added)} -{removed} papers")
+        
+        return jsonify({
+            'success': True,
+            'result_set_id': index.result_set_id,
+            'added_doc_ids': added,
+            'removed': removed,
+            'total': len(index),
+            'index': index.cbf.update_stats()
+        })
+    
+    except Exception as e:
+        print(f"[ERROR] Index update error: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/analyze-papers', methods=['POST'])
 def analyze_papers():
     try:
@@ -204,6 +334,9 @@ def upload_pdf():
 def get_recommendations():
     """
     Content-Based Filtering: Rekomendasi paper berdasarkan yang dipilih user
+    
+    Cukup kirim result_set_id + selected_ids (doc_id) dari /api/search;
+    selected_papers + all_papers tetap didukung untuk client lama.
     """
     try:
         data = request.get_json()
@@ -211,12 +344,28 @@ def get_recommendations():
         all_papers = data.get('all_papers', [])
         top_n = data.get('top_n', 10)
         
+        result_set_id = data.get('result_set_id')
+        index = get_paper_index(result_set_id)
+        if result_set_id and index is None and not all_papers:
+            return jsonify({'error': 'Result set expired, please search again'}), 404
+        negative_papers = []
+        if index is not None:
+            # Satu versi index untuk seluruh request
+            index = index.snapshot()
+            if data.get('selected_ids'):
+                selected_papers, missing = index.find_papers(data['selected_ids'])
+                if missing:
+                    return jsonify({'error': 'Paper not found in result set', 'missing_doc_ids': missing}), 404
+            # Feedback negatif (paper yang ditandai tidak relevan), hanya dengan result set
+            negative_papers = index.get_papers(data.get('negative_ids'))
+        
         if not selected_papers:
             return jsonify({'error': 'No papers selected'}), 400
         
         print(f"[DEBUG] Getting recommendations based on {len(selected_papers)} selected papers")
         
-        recommendations = get_paper_recommendations(selected_papers, all_papers, top_n)
+        recommendations = get_paper_recommendations(selected_papers, all_papers, top_n, index=index,
+                                                     negative_papers=negative_papers)
         
         return jsonify({
             'success': True,
@@ -232,6 +381,9 @@ def get_recommendations():
 def get_similar_papers_api():
     """
     Cari paper yang mirip dengan paper tertentu
+    
+    Cukup kirim result_set_id + doc_id dari /api/search;
+    reference_paper + all_papers tetap didukung untuk client lama.
     """
     try:
         data = request.get_json()
@@ -239,12 +391,23 @@ def get_similar_papers_api():
         all_papers = data.get('all_papers', [])
         top_n = data.get('top_n', 5)
         
+        result_set_id = data.get('result_set_id')
+        index = get_paper_index(result_set_id)
+        if result_set_id and index is None and not all_papers:
+            return jsonify({'error': 'Result set expired, please search again'}), 404
+        if index is not None and data.get('doc_id') is not None:
+            index = index.snapshot()
+            found, missing = index.find_papers([data['doc_id']])
+            if missing:
+                return jsonify({'error': 'Paper not found in result set', 'missing_doc_ids': missing}), 404
+            reference_paper = found[0]
+        
         if not reference_paper:
             return jsonify({'error': 'No reference paper provided'}), 400
         
         print(f"[DEBUG] Finding similar papers to: {reference_paper.get('title', 'Unknown')[:50]}")
         
-        similar = find_similar_papers(reference_paper, all_papers, top_n)
+        similar = find_similar_papers(reference_paper, all_papers, top_n, index=index)
         
         return jsonify({
             'success': True,
@@ -340,18 +503,31 @@ def get_cbf_details():
     """
     Dapatkan detail perhitungan TF-IDF dan Cosine Similarity
     untuk papers yang dipilih
+    
+    Cukup kirim result_set_id + doc_ids dari /api/search;
+    papers tetap didukung untuk client lama.
     """
     try:
         data = request.get_json()
         selected_papers = data.get('papers', [])
         query = data.get('query', '')
         
+        result_set_id = data.get('result_set_id')
+        index = get_paper_index(result_set_id)
+        if result_set_id and index is None and not selected_papers:
+            return jsonify({'error': 'Result set expired, please search again'}), 404
+        if index is not None and data.get('doc_ids'):
+            index = index.snapshot()
+            selected_papers, missing = index.find_papers(data['doc_ids'])
+            if missing:
+                return jsonify({'error': 'Paper not found in result set', 'missing_doc_ids': missing}), 404
+        
         if not selected_papers:
             return jsonify({'error': 'No papers selected'}), 400
         
         print(f"[DEBUG] Getting CBF calculation details for {len(selected_papers)} papers")
         
-        details = get_cbf_calculation_details(selected_papers, query)
+        details = get_cbf_calculation_details(selected_papers, query, index=index)
         
         return jsonify({
             'success': True,
@@ -44,6 +44,10 @@ Examples:
   python main.py --port 8080        Run on port 8080
   python main.py --host 0.0.0.0     Allow external connections
   python main.py --debug            Enable debug mode
+  python main.py --preprocess-cache cache/preprocess.json
+                                    Persist preprocessing cache to disk
+  python main.py --response-cache cache/responses.sqlite
+                                    Persist scraper API responses to disk
         """
     )
     
@@ -67,6 +71,48 @@ Examples:
         help='Enable debug mode'
     )
     
+    parser.add_argument(
+        '--preprocess-cache',
+        type=str,
+        default=None,
+        help='JSON file to load/save the text preprocessing cache (default: memory only)'
+    )
+    
+    parser.add_argument(
+        '--query-cache-mb',
+        type=int,
+        default=64,
+        help='Memory limit in MB for cached /api/search results (default: 64, 0 disables)'
+    )
+    
+    parser.add_argument(
+        '--query-cache-ttl',
+        type=int,
+        default=600,
+        help='Seconds a cached /api/search result stays valid (default: 600)'
+    )
+    
+    parser.add_argument(
+        '--http-pool-size',
+        type=int,
+        default=16,
+        help='Keep-alive connections kept per host for the API scrapers (default: 16)'
+    )
+    
+    parser.add_argument(
+        '--response-cache',
+        type=str,
+        default=None,
+        help='SQLite file for cached Semantic Scholar / Mendeley API responses (default: memory only)'
+    )
+    
+    parser.add_argument(
+        '--response-cache-ttl',
+        type=int,
+        default=86400,
+        help='Seconds a cached API response stays fresh (default: 86400, 0 disables)'
+    )
+    
     args = parser.parse_args()
     
     # Banner
@@ -89,6 +135,38 @@ Examples:
         os.makedirs('uploads')
         print("📁 Created uploads directory")
     
+    # Persistent preprocessing cache
+    if args.preprocess_cache:
+        import atexit
+        from src.core import configure_preprocess_cache
+        cache_dir = os.path.dirname(args.preprocess_cache)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+        cache = configure_preprocess_cache(path=args.preprocess_cache)
+        atexit.register(cache.save)
+        print(f"🗂️  Preprocessing cache: {args.preprocess_cache} ({cache.stats()['size']} entries)")
+    
+    # Cache hasil pencarian (query yang diulang tidak di-scrape ulang)
+    from src.core import configure_query_cache
+    configure_query_cache(max_bytes=args.query_cache_mb * 1024 * 1024, ttl_seconds=args.query_cache_ttl)
+    print(f"🗃️  Query result cache: {args.query_cache_mb} MB, TTL {args.query_cache_ttl}s")
+    
+    # Connection pool bersama untuk scraper (keep-alive per host)
+    from src.scrapers import configure_http_client
+    configure_http_client(pool_maxsize=args.http_pool_size)
+    print(f"🔌 HTTP connection pool: {args.http_pool_size} connections per host")
+    
+    # Cache response API scraper (SQLite, stale-while-revalidate)
+    from src.scrapers import configure_response_cache
+    if args.response_cache:
+        cache_dir = os.path.dirname(args.response_cache)
+        if cache_dir and not os.path.exists(cache_dir):
+            os.makedirs(cache_dir)
+    response_cache = configure_response_cache(path=args.response_cache or ':memory:',
+                                              ttl_seconds=args.response_cache_ttl)
+    print(f"💾 API response cache: {args.response_cache or 'memory'}, TTL {args.response_cache_ttl}s "
+          f"({response_cache.stats()['size']} entries)")
+    
     # Import and run Flask app
     print(f"\n🚀 Starting server on http://{args.host}:{args.port}")
     print("   Press Ctrl+C to stop\n")
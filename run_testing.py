@@ -9,15 +9,18 @@ import os
 import json
 import csv
 from datetime import datetime
-from semantic_scholar import search_semantic_scholar
-from content_based_filter import ContentBasedFilter, rank_papers_with_cbf
-from evaluation_metrics import evaluate_by_relevance_threshold, generate_evaluation_report
+from src.scrapers import search_semantic_scholar, configure_response_cache, UpstreamError
+from src.core import ContentBasedFilter, rank_papers_with_cbf
+from src.core import evaluate_by_relevance_threshold, generate_evaluation_report
 
 # Buat folder output
 OUTPUT_DIR = 'testing_results'
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR)
 
+# Response API disimpan di disk: testing ulang tidak mengakses jaringan
+RESPONSE_CACHE = os.path.join('cache', 'responses.sqlite')
+
 def save_json(data, filename):
     """Simpan data ke file JSON"""
     filepath = os.path.join(OUTPUT_DIR, filename)
@@ -58,7 +61,11 @@ def run_test(query, max_results=10):
     # =====================================================
     print("\n[1] PENGUMPULAN DATA dari Semantic Scholar...")
     
-    papers = search_semantic_scholar(query, max_results)
+    try:
+        papers = search_semantic_scholar(query, max_results)
+    except UpstreamError as e:
+        print(f"    ✗ Semantic Scholar tidak tersedia: {e}")
+        return None
     print(f"    Ditemukan: {len(papers)} jurnal")
     
     # Simpan hasil pencarian mentah
@@ -330,6 +337,10 @@ def run_all_tests():
     print("Testing Otomatis - Sesuai Proposal Penelitian")
     print("="*70)
     
+    if not os.path.exists(os.path.dirname(RESPONSE_CACHE)):
+        os.makedirs(os.path.dirname(RESPONSE_CACHE))
+    response_cache = configure_response_cache(path=RESPONSE_CACHE)
+    
     # Query untuk testing
     test_queries = [
         "machine learning classification",
@@ -351,6 +362,10 @@ def run_all_tests():
     }
     save_json(summary, 'RINGKASAN_TESTING.json')
     
+    cache_stats = response_cache.stats()
+    print(f"\nResponse cache: {cache_stats['hits'] + cache_stats['stale_hits']} hit, "
+          f"{cache_stats['misses']} request ke API ({RESPONSE_CACHE})")
+    
     print("\n" + "="*70)
     print("TESTING SELESAI!")
     print(f"Semua hasil tersimpan di folder: {OUTPUT_DIR}/")
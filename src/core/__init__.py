@@ -1,11 +1,41 @@
 # Core Package - Content-Based Filtering & Evaluation
 from .content_based_filter import (
     ContentBasedFilter,
+    RANKERS,
+    create_ranker,
+    preprocess_papers,
     rank_papers_with_cbf,
+    rank_papers_batch_with_cbf,
     get_paper_recommendations,
     find_similar_papers,
     get_cbf_calculation_details
 )
+from .bm25 import BM25Filter
+from .lsa import LSAFilter
+from .paper_index import (
+    PaperIndex,
+    build_paper_index,
+    get_paper_index
+)
+from .index_snapshot import (
+    save_snapshot,
+    load_snapshot
+)
+from .query_cache import (
+    QueryResultCache,
+    get_query_cache,
+    configure_query_cache,
+    invalidate_query_cache
+)
+from .dedup import (
+    MinHashDeduplicator,
+    deduplicate_papers
+)
+from .preprocess_cache import (
+    PreprocessCache,
+    get_preprocess_cache,
+    configure_preprocess_cache
+)
 from .evaluation_metrics import (
     generate_evaluation_report,
     evaluate_by_relevance_threshold
@@ -13,10 +43,30 @@ from .evaluation_metrics import (
 
 __all__ = [
     'ContentBasedFilter',
+    'RANKERS',
+    'create_ranker',
+    'preprocess_papers',
     'rank_papers_with_cbf',
+    'rank_papers_batch_with_cbf',
     'get_paper_recommendations',
     'find_similar_papers',
     'get_cbf_calculation_details',
+    'BM25Filter',
+    'LSAFilter',
+    'PaperIndex',
+    'build_paper_index',
+    'get_paper_index',
+    'save_snapshot',
+    'load_snapshot',
+    'QueryResultCache',
+    'get_query_cache',
+    'configure_query_cache',
+    'invalidate_query_cache',
+    'MinHashDeduplicator',
+    'deduplicate_papers',
+    'PreprocessCache',
+    'get_preprocess_cache',
+    'configure_preprocess_cache',
     'generate_evaluation_report',
     'evaluate_by_relevance_threshold'
 ]
@@ -0,0 +1,217 @@
+"""
+BM25 / BM25F Ranking Module
+Alternatif ranking selain TF-IDF + Cosine Similarity, dengan interface
+yang sama dengan ContentBasedFilter (fit, calculate_similarity_to_query,
+rank_papers_by_relevance).
+
+BM25F dengan dua field (title, abstract):
+    tf~(t,d)  = sum_f  w_f * tf(t,f,d) / (1 - b_f + b_f * len(f,d) / avglen(f))
+    score(q,d) = sum_t  idf(t) * tf~(t,d) * (k1 + 1) / (tf~(t,d) + k1)
+    idf(t)     = ln(1 + (N - df(t) + 0.5) / (df(t) + 0.5))
+
+Seluruh bobot per (dokumen, term) dihitung sekali saat fit dan disimpan
+sebagai matriks sparse, sehingga skor query cukup satu sparse gather
+(matriks x vektor term query), tanpa fit ulang per query.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+
+from .content_based_filter import ContentBasedFilter
+from .ranking import dot_scores, top_k_scored
+
+
+class BM25Filter(ContentBasedFilter):
+    """
+    Ranking BM25F untuk papers (field title dan abstract)
+    """
+
+    def __init__(self, k1=1.2, title_weight=2.0, abstract_weight=1.0,
+                 title_b=0.5, abstract_b=0.75, **kwargs):
+        super().__init__(**kwargs)
+        self.k1 = k1
+        self.field_weights = {'title': title_weight, 'abstract': abstract_weight}
+        self.field_b = {'title': title_b, 'abstract': abstract_b}
+
+        self.bm25_matrix = None  # Bobot BM25 per (dokumen, term), CSR
+        self.idf = None
+
+    def _create_counter(self):
+        """CountVectorizer unigram, token sama dengan TF-IDF"""
+        return CountVectorizer(
+            lowercase=False,
+            token_pattern=r'(?u)\b[a-zA-Z]{3,}\b',
+            stop_words=self.analyzer.stop_words_list,
+            dtype=np.float64
+        )
+
+    def _field_norm(self, counts, field):
+        """
+        Normalisasi panjang field BM25F: w_f / (1 - b + b * len / avglen)
+
+        Returns:
+            Sparse diagonal matrix (n_docs x n_docs)
+        """
+        lengths = np.asarray(counts.sum(axis=1)).ravel()
+        avg_length = lengths.mean() if lengths.size and lengths.mean() > 0 else 1.0
+        b = self.field_b[field]
+        norm = self.field_weights[field] / (1 - b + b * lengths / avg_length)
+        return sp.diags(norm)
+
+    def fit(self, papers):
+        """
+        Hitung matriks bobot BM25F untuk papers
+
+        Args:
+            papers: List of paper dictionaries dengan 'title' dan 'abstract'
+        """
+        self.papers = papers
+        self.paper_texts = []
+        self.bm25_matrix = None
+        self.index_version += 1
+
+        if not papers:
+            return self
+
+        titles = []
+        abstracts = []
+        for paper in papers:
+            title = paper.get('title', '') or ''
+            abstract = paper.get('abstract', paper.get('snippet', '')) or ''
+            titles.append(self.preprocess_text(title))
+            abstracts.append(self.preprocess_text(abstract))
+            self.paper_texts.append(f"{titles[-1]} {abstracts[-1]}".strip())
+
+        self.vectorizer = self._create_counter()
+        try:
+            self.vectorizer.fit(self.paper_texts)
+        except ValueError as e:
+            print(f"[WARNING] BM25 vocabulary error: {e}")
+            return self
+
+        title_counts = self.vectorizer.transform(titles)
+        abstract_counts = self.vectorizer.transform(abstracts)
+
+        # tf~ gabungan dua field
+        weighted_tf = (self._field_norm(title_counts, 'title') @ title_counts +
+                       self._field_norm(abstract_counts, 'abstract') @ abstract_counts).tocsr()
+
+        n_docs = len(papers)
+        df = np.bincount(weighted_tf.indices, minlength=weighted_tf.shape[1])
+        self.idf = np.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+        # Saturasi tf dan kalikan IDF, langsung pada data sparse
+        weighted_tf.data = weighted_tf.data * (self.k1 + 1) / (weighted_tf.data + self.k1)
+        self.bm25_matrix = (weighted_tf @ sp.diags(self.idf)).tocsr()
+
+        print(f"[DEBUG] BM25F fitted: {self.bm25_matrix.shape}")
+        return self
+
+    def add_papers(self, papers):
+        """
+        Tambahkan papers. avglen field dan IDF BM25 bergantung pada seluruh
+        corpus, sehingga matriks bobot di-fit ulang.
+
+        Returns:
+            List index baris untuk papers baru
+        """
+        papers = list(papers)
+        start = len(self.papers)
+        if papers:
+            self.fit(list(self.papers) + papers)
+        return list(range(start, start + len(papers)))
+
+    def remove_papers(self, rows):
+        """
+        Hapus papers berdasarkan index baris (baris sesudahnya bergeser),
+        lalu fit ulang
+
+        Returns:
+            Jumlah papers yang dihapus
+        """
+        removed = {int(r) for r in rows}
+        kept = [paper for i, paper in enumerate(self.papers) if i not in removed]
+        n_removed = len(self.papers) - len(kept)
+        if n_removed:
+            self.fit(kept)
+        return n_removed
+
+    def reweight(self):
+        # Setiap update sudah fit ulang dengan IDF terbaru
+        return self
+
+    def query_scores(self, query):
+        """
+        Skor BM25F query terhadap semua papers, dinormalisasi ke 0-1
+        (dibagi skor maksimum yang mungkin untuk query tersebut)
+
+        Returns:
+            numpy array skor (n_papers,), atau None jika belum di-fit
+        """
+        if self.bm25_matrix is None or len(self.papers) == 0:
+            return None
+
+        query_vector = self.transform_query(query)
+        scores = dot_scores(query_vector, self.bm25_matrix)
+
+        max_score = (query_vector @ (self.idf * (self.k1 + 1)))[0]
+        if max_score > 0:
+            scores /= max_score
+        return scores
+
+    def batch_query_scores(self, queries):
+        """
+        Skor BM25F banyak query sekaligus, dinormalisasi per query
+        (sama dengan query_scores)
+
+        Returns:
+            Sparse CSR matrix skor (n_queries x n_papers), atau None
+        """
+        if self.bm25_matrix is None or len(self.papers) == 0:
+            return None
+
+        query_vectors = self.transform_queries(queries)
+        scores = (self.bm25_matrix @ query_vectors.T).T.tocsr()
+
+        max_scores = query_vectors @ (self.idf * (self.k1 + 1))
+        max_scores = np.where(max_scores > 0, max_scores, 1.0)
+        scores.data /= np.repeat(max_scores, np.diff(scores.indptr))
+        return scores
+
+    def get_inverted_index(self):
+        # Pruning MaxScore hanya dipakai untuk backend TF-IDF
+        return None
+
+    def calculate_similarity_to_query(self, query, top_k=None):
+        """
+        Hitung skor BM25F antara query dengan semua papers
+
+        Returns:
+            List of (paper_index, score) sorted by score descending
+        """
+        scores = self.query_scores(query)
+        if scores is None:
+            return []
+        return top_k_scored(scores, top_k)
+
+    def get_similar_papers(self, paper_index, top_n=5):
+        """
+        Papers yang mirip dengan paper tertentu (teks paper dipakai sebagai query)
+
+        Returns:
+            List of (paper_index, score)
+        """
+        if self.bm25_matrix is None or paper_index >= len(self.papers):
+            return []
+
+        scores = self.query_scores(self.paper_texts[paper_index])
+        scores[paper_index] = -np.inf
+        return top_k_scored(scores, min(top_n, len(scores) - 1))
+
+    def memory_bytes(self):
+        """Perkiraan memori matriks bobot + IDF"""
+        if self.bm25_matrix is None:
+            return 0
+        m = self.bm25_matrix
+        return m.data.nbytes + m.indices.nbytes + m.indptr.nbytes + self.idf.nbytes
@@ -10,14 +10,22 @@ Alur:
 5. Ranking & Rekomendasi
 """
 
-import re
+import copy
+from collections import namedtuple
+
 import numpy as np
+import scipy.sparse as sp
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import PorterStemmer, WordNetLemmatizer
+from nltk.stem import WordNetLemmatizer
+
+from .preprocess_cache import get_preprocess_cache
+from .ann_index import RandomProjectionLSH
+from .inverted_index import InvertedIndex
+from .ranking import dot_scores, sparse_row_top_k, top_k_indices, top_k_rows, top_k_scored
+from .streaming_vectorizer import StreamingTfidfVectorizer
+from .text_engine import TextAnalyzer
 
 # Download NLTK data
 try:
@@ -35,174 +43,324 @@ try:
 except LookupError:
     nltk.download('wordnet')
 
+# Tambahan stopwords umum yang sering muncul (Inggris)
+COMMON_STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
+    'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
+    'to', 'was', 'will', 'with', 'we', 'this', 'which', 'can', 'have',
+    'been', 'had', 'were', 'their', 'they', 'our', 'may', 'also',
+    'these', 'those', 'than', 'such', 'into', 'through', 'more',
+    'over', 'both', 'between', 'during', 'before', 'after', 'above',
+    'below', 'up', 'down', 'out', 'off', 'again', 'further', 'then'
+})
 
-class ContentBasedFilter:
+# Tambahan stopwords bahasa Indonesia yang umum
+INDONESIAN_STOPWORDS = frozenset({
+    'ada', 'adalah', 'adanya', 'adapun', 'agak', 'agaknya', 'agar',
+    'akan', 'akankah', 'akhir', 'akhiri', 'akhirnya', 'aku', 'akulah',
+    'amat', 'amatlah', 'anda', 'andalah', 'antar', 'antara', 'antaranya',
+    'apa', 'apaan', 'apabila', 'apakah', 'apalagi', 'apatah', 'artinya',
+    'asal', 'asalkan', 'atas', 'atau', 'ataukah', 'ataupun', 'awal',
+    'awalnya', 'bagai', 'bagaikan', 'bagaimana', 'bagaimanapun', 'bagaimanakah',
+    'bagi', 'bagian', 'bahkan', 'bahwa', 'bahwasanya', 'baik', 'bakal',
+    'bakalan', 'balik', 'banyak', 'banyaknya', 'bapak', 'baru', 'bawah',
+    'beberapa', 'begini', 'beginian', 'beginikah', 'beginilah', 'begitu',
+    'begitukah', 'begitulah', 'begitupun', 'bekerja', 'belakang', 'belakangan',
+    'belum', 'belumlah', 'benar', 'benarkah', 'benarlah', 'berada', 'berakhir',
+    'berakhirlah', 'berakhirnya', 'berapa', 'berapakah', 'berapalah', 'berapapun',
+    'berarti', 'berawal', 'berbagai', 'berdatangan', 'beri', 'berikan', 'berikut',
+    'berikutnya', 'berjumlah', 'berkali', 'berkata', 'berkehendak', 'berkeinginan',
+    'berkenaan', 'berlainan', 'berlalu', 'berlangsung', 'berlebihan', 'bermacam',
+    'bermaksud', 'bermula', 'bersama', 'bersiap', 'bersiap-siap', 'bertanya',
+    'bertanya-tanya', 'berturut', 'berturut-turut', 'bertutur', 'berujar',
+    'berupa', 'besar', 'betul', 'betulkah', 'biasa', 'biasanya', 'bila',
+    'bilakah', 'bisa', 'bisakah', 'boleh', 'bolehkah', 'bolehlah', 'buat',
+    'bukan', 'bukankah', 'bukanlah', 'bukannya', 'bulan', 'bung', 'cara',
+    'caranya', 'cukup', 'cukupkah', 'cukuplah', 'cuma', 'dahulu', 'dalam',
+    'dan', 'dapat', 'dari', 'daripada', 'datang', 'dekat', 'demi', 'demikian',
+    'demikianlah', 'dengan', 'depan', 'di', 'dia', 'diakhiri', 'diakhirinya',
+    'dialah', 'diantara', 'diantaranya', 'diberi', 'diberikan', 'diberikannya',
+    'dibuat', 'dibuatnya', 'didapat', 'didatangkan', 'digunakan', 'diibaratkan',
+    'diibaratkannya', 'diingat', 'diingatkan', 'diinginkan', 'dijawab',
+    'dijelaskan', 'dijelaskannya', 'dikatakan', 'dikatakannya', 'dikehendaki',
+    'diketahui', 'diketahuinya', 'dikira', 'dilakukan', 'dilalui', 'dilihat',
+    'dimaksud', 'dimaksudkan', 'dimaksudkannya', 'dimaksudnya', 'diminta',
+    'dimintai', 'dimisalkan', 'dimulai', 'dimulailah', 'dimulainya', 'dimungkinkan',
+    'dini', 'dipastikan', 'diperbuat', 'diperbuatnya', 'dipergunakan',
+    'diperkirakan', 'diperlihatkan', 'diperlukan', 'diperlukannya', 'dipersoalkan',
+    'dipertanyakan', 'dipunyai', 'diri', 'dirinya', 'disampaikan', 'disebut',
+    'disebutkan', 'disebutkannya', 'disini', 'disinilah', 'ditambahkan',
+    'ditandaskan', 'ditanya', 'ditanyai', 'ditanyakan', 'ditegaskan', 'ditujukan',
+    'ditunjuk', 'ditunjuki', 'ditunjukkan', 'ditunjukkannya', 'ditunjuknya',
+    'dituturkan', 'dituturkannya', 'diucapkan', 'diucapkannya', 'diungkapkan',
+    'dong', 'dua', 'dulu', 'empat', 'enggak', 'enggaknya', 'entah', 'entahlah',
+    'guna', 'gunakan', 'hal', 'hampir', 'hanya', 'hanyalah', 'hari', 'harus',
+    'haruslah', 'harusnya', 'hendak', 'hendaklah', 'hendaknya', 'hingga', 'ia',
+    'ialah', 'ibarat', 'ibaratkan', 'ibaratnya', 'ibu', 'ikut', 'ingat',
+    'ingat-ingat', 'ingin', 'inginkah', 'inginkan', 'ini', 'inikah', 'inilah',
+    'itu', 'itukah', 'itulah', 'jadi', 'jadilah', 'jadinya', 'jangan', 'jangankan',
+    'janganlah', 'jauh', 'jawab', 'jawaban', 'jawabnya', 'jelas', 'jelaskan',
+    'jelaslah', 'jelasnya', 'jika', 'jikalau', 'juga', 'jumlah', 'jumlahnya',
+    'justru', 'kala', 'kalau', 'kalaulah', 'kalaupun', 'kalian', 'kami', 'kamilah',
+    'kamu', 'kamulah', 'kan', 'kapan', 'kapankah', 'kapanpun', 'karena',
+    'karenanya', 'kasus', 'kata', 'katakan', 'katakanlah', 'katanya', 'ke',
+    'keadaan', 'kebetulan', 'kecil', 'kedua', 'keduanya', 'keinginan', 'kelamaan',
+    'kelihatan', 'kelihatannya', 'kelima', 'keluar', 'kembali', 'kemudian',
+    'kemungkinan', 'kemungkinannya', 'kenapa', 'kepada', 'kepadanya', 'kesampaian',
+    'keseluruhan', 'keseluruhannya', 'keterlaluan', 'ketika', 'khususnya', 'kini',
+    'kinilah', 'kira', 'kira-kira', 'kiranya', 'kita', 'kitalah', 'kok', 'kurang',
+    'lagi', 'lagian', 'lah', 'lain', 'lainnya', 'lalu', 'lama', 'lamanya', 'lanjut',
+    'lanjutnya', 'lebih', 'lewat', 'lima', 'luar', 'lusa', 'maka', 'makanya',
+    'makin', 'malah', 'malahan', 'mampu', 'mampukah', 'mana', 'manakala', 'manalagi',
+    'masa', 'masalah', 'masalahnya', 'masih', 'masihkah', 'masing', 'masing-masing',
+    'mau', 'maupun', 'melainkan', 'melakukan', 'melalui', 'melihat', 'melihatnya',
+    'memang', 'memastikan', 'memberi', 'memberikan', 'membuat', 'memerlukan',
+    'memihak', 'meminta', 'memintakan', 'memisalkan', 'memperbuat', 'mempergunakan',
+    'memperkirakan', 'memperlihatkan', 'mempersiapkan', 'mempersoalkan',
+    'mempertanyakan', 'mempunyai', 'memulai', 'memungkinkan', 'menaiki', 'menambahkan',
+    'menandaskan', 'menanti', 'menanti-nanti', 'menantikan', 'menanya', 'menanyai',
+    'menanyakan', 'mendapat', 'mendapatkan', 'mendatang', 'mendatangi', 'mendatangkan',
+    'menegaskan', 'mengakhiri', 'mengapa', 'mengatakan', 'mengatakannya', 'mengenai',
+    'mengerjakan', 'mengetahui', 'menggunakan', 'menghendaki', 'mengibaratkan',
+    'mengibaratkannya', 'mengingat', 'mengingatkan', 'menginginkan', 'mengira',
+    'mengucapkan', 'mengucapkannya', 'mengungkapkan', 'menjadi', 'menjawab',
+    'menjelaskan', 'menuju', 'menunjuk', 'menunjuki', 'menunjukkan', 'menunjuknya',
+    'menurut', 'menuturkan', 'menyampaikan', 'menyangkut', 'menyatakan', 'menyebutkan',
+    'menyeluruh', 'menyiapkan', 'merasa', 'mereka', 'merekalah', 'merupakan',
+    'meski', 'meskipun', 'meyakini', 'meyakinkan', 'minta', 'mirip', 'misal',
+    'misalkan', 'misalnya', 'mula', 'mulai', 'mulailah', 'mulanya', 'mungkin',
+    'mungkinkah', 'nah', 'naik', 'namun', 'nanti', 'nantinya', 'nyaris', 'nyatanya',
+    'oleh', 'olehnya', 'pada', 'padahal', 'padanya', 'pak', 'paling', 'panjang',
+    'pantas', 'para', 'pasti', 'pastilah', 'per', 'percuma', 'pergi', 'pernah',
+    'perlu', 'perlukah', 'perlunya', 'pertama', 'pertama-tama', 'pertanyaan',
+    'pertanyakan', 'pihak', 'pihaknya', 'pukul', 'pula', 'pun', 'punya', 'rasa',
+    'rasanya', 'rata', 'rupanya', 'saat', 'saatnya', 'saja', 'sajalah', 'saling',
+    'sama', 'sama-sama', 'sambil', 'sampai', 'sampai-sampai', 'sampaikan', 'sana',
+    'sangat', 'sangatlah', 'satu', 'saya', 'sayalah', 'se', 'sebab', 'sebabnya',
+    'sebagai', 'sebagaimana', 'sebagainya', 'sebagian', 'sebaik', 'sebaik-baiknya',
+    'sebaiknya', 'sebaliknya', 'sebanyak', 'sebegini', 'sebegitu', 'sebelum',
+    'sebelumnya', 'sebenarnya', 'seberapa', 'sebesar', 'sebetulnya', 'sebisanya',
+    'sebuah', 'sebut', 'sebutlah', 'sebutnya', 'secara', 'secukupnya', 'sedang',
+    'sedangkan', 'sedemikian', 'sedikit', 'sedikitnya', 'seenaknya', 'segala',
+    'segalanya', 'segera', 'seharusnya', 'sehingga', 'seingat', 'sejak', 'sejauh',
+    'sejenak', 'sejumlah', 'sekadar', 'sekadarnya', 'sekali', 'sekali-kali',
+    'sekalian', 'sekaligus', 'sekalipun', 'sekarang', 'sekarang', 'sekecil',
+    'seketika', 'sekiranya', 'sekitar', 'sekitarnya', 'sekurang-kurangnya',
+    'sekurangnya', 'sela', 'selain', 'selaku', 'selalu', 'selama', 'selama-lamanya',
+    'selamanya', 'selanjutnya', 'seluruh', 'seluruhnya', 'semacam', 'semakin',
+    'semampu', 'semampunya', 'semasa', 'semasih', 'semata', 'semata-mata', 'semaunya',
+    'sementara', 'semisal', 'semisalnya', 'sempat', 'semua', 'semuanya', 'semula',
+    'sendiri', 'sendirian', 'sendirinya', 'seolah', 'seolah-olah', 'seorang',
+    'sepanjang', 'sepantasnya', 'sepantasnyalah', 'seperlunya', 'seperti',
+    'sepertinya', 'sepihak', 'sering', 'seringnya', 'serta', 'serupa', 'sesaat',
+    'sesama', 'sesampai', 'sesegera', 'sesekali', 'seseorang', 'sesuatu', 'sesuatunya',
+    'sesudah', 'sesudahnya', 'setelah', 'setelahnya', 'setempat', 'setengah',
+    'seterusnya', 'setiap', 'setiba', 'setibanya', 'setidak-tidaknya', 'setidaknya',
+    'setinggi', 'seusai', 'sewaktu', 'siap', 'siapa', 'siapakah', 'siapapun',
+    'sini', 'sinilah', 'soal', 'soalnya', 'suatu', 'sudah', 'sudahkah', 'sudahlah',
+    'supaya', 'tadi', 'tadinya', 'tahu', 'tahun', 'tak', 'tambah', 'tambahnya',
+    'tampak', 'tampaknya', 'tandas', 'tandasnya', 'tanpa', 'tanya', 'tanyakan',
+    'tanyanya', 'tapi', 'tegas', 'tegasnya', 'telah', 'tempat', 'tengah', 'tentang',
+    'tentu', 'tentulah', 'tentunya', 'tepat', 'terakhir', 'terasa', 'terbanyak',
+    'terdahulu', 'terdapat', 'terdiri', 'terhadap', 'terhadapnya', 'teringat',
+    'teringat-ingat', 'terjadi', 'terjadilah', 'terjadinya', 'terkira', 'terlalu',
+    'terlebih', 'terlihat', 'termasuk', 'ternyata', 'tersampaikan', 'tersebut',
+    'tersebutlah', 'tertentu', 'tertuju', 'terus', 'terutama', 'tetap', 'tetapi',
+    'tiap', 'tiba', 'tiba-tiba', 'tidak', 'tidakkah', 'tidaklah', 'tiga', 'tinggi',
+    'toh', 'tunjuk', 'turut', 'tutur', 'tuturnya', 'ucap', 'ucapnya', 'ujar',
+    'ujarnya', 'umum', 'umumnya', 'ungkap', 'ungkapnya', 'untuk', 'usai', 'usai',
+    'waduh', 'wah', 'wahai', 'waktu', 'waktunya', 'walau', 'walaupun', 'wong',
+    'yaitu', 'yakin', 'yakni', 'yang'
+})
+
+# Tambahan stopwords untuk domain akademik (HANYA kata yang tidak informatif)
+ACADEMIC_STOPWORDS = frozenset({
+    'doi', 'vol', 'pp', 'et', 'al', 'page', 'pages', 'volume', 'issue',
+    'isbn', 'issn', 'http', 'https', 'www', 'com', 'org', 'edu'
+})
+
+
+def build_stop_words():
     """
-    Content-Based Filtering menggunakan TF-IDF dan Cosine Similarity
+    Gabungkan stopwords NLTK (Inggris + Indonesia) dengan stopwords tambahan
+
+    Returns:
+        frozenset of stopwords
     """
-    
-    def __init__(self):
-        # TF-IDF dengan parameter yang lebih permissive untuk menghindari pruning error
-        self.vectorizer = None  # Will be created dynamically based on corpus size
-        self.stemmer = PorterStemmer()
-        self.lemmatizer = WordNetLemmatizer()
+    stop_words = set()
 
-        # Stopwords bahasa Inggris yang lebih lengkap
-        try:
-            self.stop_words = set(stopwords.words('english'))
-        except:
-            self.stop_words = set()
+    # Stopwords bahasa Inggris yang lebih lengkap
+    try:
+        stop_words.update(stopwords.words('english'))
+    except:
+        pass
 
-        # Tambahkan stopwords bahasa Indonesia juga
-        try:
-            self.stop_words.update(stopwords.words('indonesian'))
-        except:
-            pass
-
-        # Tambahan stopwords umum yang sering muncul (Inggris)
-        common_stopwords = {
-            'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from',
-            'has', 'he', 'in', 'is', 'it', 'its', 'of', 'on', 'that', 'the',
-            'to', 'was', 'will', 'with', 'we', 'this', 'which', 'can', 'have',
-            'been', 'had', 'were', 'their', 'they', 'our', 'may', 'also',
-            'these', 'those', 'than', 'such', 'into', 'through', 'more',
-            'over', 'both', 'between', 'during', 'before', 'after', 'above',
-            'below', 'up', 'down', 'out', 'off', 'again', 'further', 'then'
-        }
+    # Tambahkan stopwords bahasa Indonesia juga
+    try:
+        stop_words.update(stopwords.words('indonesian'))
+    except:
+        pass
 
-        # Tambahan stopwords bahasa Indonesia yang umum
-        indonesian_stopwords = {
-            'ada', 'adalah', 'adanya', 'adapun', 'agak', 'agaknya', 'agar',
-            'akan', 'akankah', 'akhir', 'akhiri', 'akhirnya', 'aku', 'akulah',
-            'amat', 'amatlah', 'anda', 'andalah', 'antar', 'antara', 'antaranya',
-            'apa', 'apaan', 'apabila', 'apakah', 'apalagi', 'apatah', 'artinya',
-            'asal', 'asalkan', 'atas', 'atau', 'ataukah', 'ataupun', 'awal',
-            'awalnya', 'bagai', 'bagaikan', 'bagaimana', 'bagaimanapun', 'bagaimanakah',
-            'bagi', 'bagian', 'bahkan', 'bahwa', 'bahwasanya', 'baik', 'bakal',
-            'bakalan', 'balik', 'banyak', 'banyaknya', 'bapak', 'baru', 'bawah',
-            'beberapa', 'begini', 'beginian', 'beginikah', 'beginilah', 'begitu',
-            'begitukah', 'begitulah', 'begitupun', 'bekerja', 'belakang', 'belakangan',
-            'belum', 'belumlah', 'benar', 'benarkah', 'benarlah', 'berada', 'berakhir',
-            'berakhirlah', 'berakhirnya', 'berapa', 'berapakah', 'berapalah', 'berapapun',
-            'berarti', 'berawal', 'berbagai', 'berdatangan', 'beri', 'berikan', 'berikut',
-            'berikutnya', 'berjumlah', 'berkali', 'berkata', 'berkehendak', 'berkeinginan',
-            'berkenaan', 'berlainan', 'berlalu', 'berlangsung', 'berlebihan', 'bermacam',
-            'bermaksud', 'bermula', 'bersama', 'bersiap', 'bersiap-siap', 'bertanya',
-            'bertanya-tanya', 'berturut', 'berturut-turut', 'bertutur', 'berujar',
-            'berupa', 'besar', 'betul', 'betulkah', 'biasa', 'biasanya', 'bila',
-            'bilakah', 'bisa', 'bisakah', 'boleh', 'bolehkah', 'bolehlah', 'buat',
-            'bukan', 'bukankah', 'bukanlah', 'bukannya', 'bulan', 'bung', 'cara',
-            'caranya', 'cukup', 'cukupkah', 'cukuplah', 'cuma', 'dahulu', 'dalam',
-            'dan', 'dapat', 'dari', 'daripada', 'datang', 'dekat', 'demi', 'demikian',
-            'demikianlah', 'dengan', 'depan', 'di', 'dia', 'diakhiri', 'diakhirinya',
-            'dialah', 'diantara', 'diantaranya', 'diberi', 'diberikan', 'diberikannya',
-            'dibuat', 'dibuatnya', 'didapat', 'didatangkan', 'digunakan', 'diibaratkan',
-            'diibaratkannya', 'diingat', 'diingatkan', 'diinginkan', 'dijawab',
-            'dijelaskan', 'dijelaskannya', 'dikatakan', 'dikatakannya', 'dikehendaki',
-            'diketahui', 'diketahuinya', 'dikira', 'dilakukan', 'dilalui', 'dilihat',
-            'dimaksud', 'dimaksudkan', 'dimaksudkannya', 'dimaksudnya', 'diminta',
-            'dimintai', 'dimisalkan', 'dimulai', 'dimulailah', 'dimulainya', 'dimungkinkan',
-            'dini', 'dipastikan', 'diperbuat', 'diperbuatnya', 'dipergunakan',
-            'diperkirakan', 'diperlihatkan', 'diperlukan', 'diperlukannya', 'dipersoalkan',
-            'dipertanyakan', 'dipunyai', 'diri', 'dirinya', 'disampaikan', 'disebut',
-            'disebutkan', 'disebutkannya', 'disini', 'disinilah', 'ditambahkan',
-            'ditandaskan', 'ditanya', 'ditanyai', 'ditanyakan', 'ditegaskan', 'ditujukan',
-            'ditunjuk', 'ditunjuki', 'ditunjukkan', 'ditunjukkannya', 'ditunjuknya',
-            'dituturkan', 'dituturkannya', 'diucapkan', 'diucapkannya', 'diungkapkan',
-            'dong', 'dua', 'dulu', 'empat', 'enggak', 'enggaknya', 'entah', 'entahlah',
-            'guna', 'gunakan', 'hal', 'hampir', 'hanya', 'hanyalah', 'hari', 'harus',
-            'haruslah', 'harusnya', 'hendak', 'hendaklah', 'hendaknya', 'hingga', 'ia',
-            'ialah', 'ibarat', 'ibaratkan', 'ibaratnya', 'ibu', 'ikut', 'ingat',
-            'ingat-ingat', 'ingin', 'inginkah', 'inginkan', 'ini', 'inikah', 'inilah',
-            'itu', 'itukah', 'itulah', 'jadi', 'jadilah', 'jadinya', 'jangan', 'jangankan',
-            'janganlah', 'jauh', 'jawab', 'jawaban', 'jawabnya', 'jelas', 'jelaskan',
-            'jelaslah', 'jelasnya', 'jika', 'jikalau', 'juga', 'jumlah', 'jumlahnya',
-            'justru', 'kala', 'kalau', 'kalaulah', 'kalaupun', 'kalian', 'kami', 'kamilah',
-            'kamu', 'kamulah', 'kan', 'kapan', 'kapankah', 'kapanpun', 'karena',
-            'karenanya', 'kasus', 'kata', 'katakan', 'katakanlah', 'katanya', 'ke',
-            'keadaan', 'kebetulan', 'kecil', 'kedua', 'keduanya', 'keinginan', 'kelamaan',
-            'kelihatan', 'kelihatannya', 'kelima', 'keluar', 'kembali', 'kemudian',
-            'kemungkinan', 'kemungkinannya', 'kenapa', 'kepada', 'kepadanya', 'kesampaian',
-            'keseluruhan', 'keseluruhannya', 'keterlaluan', 'ketika', 'khususnya', 'kini',
-            'kinilah', 'kira', 'kira-kira', 'kiranya', 'kita', 'kitalah', 'kok', 'kurang',
-            'lagi', 'lagian', 'lah', 'lain', 'lainnya', 'lalu', 'lama', 'lamanya', 'lanjut',
-            'lanjutnya', 'lebih', 'lewat', 'lima', 'luar', 'lusa', 'maka', 'makanya',
-            'makin', 'malah', 'malahan', 'mampu', 'mampukah', 'mana', 'manakala', 'manalagi',
-            'masa', 'masalah', 'masalahnya', 'masih', 'masihkah', 'masing', 'masing-masing',
-            'mau', 'maupun', 'melainkan', 'melakukan', 'melalui', 'melihat', 'melihatnya',
-            'memang', 'memastikan', 'memberi', 'memberikan', 'membuat', 'memerlukan',
-            'memihak', 'meminta', 'memintakan', 'memisalkan', 'memperbuat', 'mempergunakan',
-            'memperkirakan', 'memperlihatkan', 'mempersiapkan', 'mempersoalkan',
-            'mempertanyakan', 'mempunyai', 'memulai', 'memungkinkan', 'menaiki', 'menambahkan',
-            'menandaskan', 'menanti', 'menanti-nanti', 'menantikan', 'menanya', 'menanyai',
-            'menanyakan', 'mendapat', 'mendapatkan', 'mendatang', 'mendatangi', 'mendatangkan',
-            'menegaskan', 'mengakhiri', 'mengapa', 'mengatakan', 'mengatakannya', 'mengenai',
-            'mengerjakan', 'mengetahui', 'menggunakan', 'menghendaki', 'mengibaratkan',
-            'mengibaratkannya', 'mengingat', 'mengingatkan', 'menginginkan', 'mengira',
-            'mengucapkan', 'mengucapkannya', 'mengungkapkan', 'menjadi', 'menjawab',
-            'menjelaskan', 'menuju', 'menunjuk', 'menunjuki', 'menunjukkan', 'menunjuknya',
-            'menurut', 'menuturkan', 'menyampaikan', 'menyangkut', 'menyatakan', 'menyebutkan',
-            'menyeluruh', 'menyiapkan', 'merasa', 'mereka', 'merekalah', 'merupakan',
-            'meski', 'meskipun', 'meyakini', 'meyakinkan', 'minta', 'mirip', 'misal',
-            'misalkan', 'misalnya', 'mula', 'mulai', 'mulailah', 'mulanya', 'mungkin',
-            'mungkinkah', 'nah', 'naik', 'namun', 'nanti', 'nantinya', 'nyaris', 'nyatanya',
-            'oleh', 'olehnya', 'pada', 'padahal', 'padanya', 'pak', 'paling', 'panjang',
-            'pantas', 'para', 'pasti', 'pastilah', 'per', 'percuma', 'pergi', 'pernah',
-            'perlu', 'perlukah', 'perlunya', 'pertama', 'pertama-tama', 'pertanyaan',
-            'pertanyakan', 'pihak', 'pihaknya', 'pukul', 'pula', 'pun', 'punya', 'rasa',
-            'rasanya', 'rata', 'rupanya', 'saat', 'saatnya', 'saja', 'sajalah', 'saling',
-            'sama', 'sama-sama', 'sambil', 'sampai', 'sampai-sampai', 'sampaikan', 'sana',
-            'sangat', 'sangatlah', 'satu', 'saya', 'sayalah', 'se', 'sebab', 'sebabnya',
-            'sebagai', 'sebagaimana', 'sebagainya', 'sebagian', 'sebaik', 'sebaik-baiknya',
-            'sebaiknya', 'sebaliknya', 'sebanyak', 'sebegini', 'sebegitu', 'sebelum',
-            'sebelumnya', 'sebenarnya', 'seberapa', 'sebesar', 'sebetulnya', 'sebisanya',
-            'sebuah', 'sebut', 'sebutlah', 'sebutnya', 'secara', 'secukupnya', 'sedang',
-            'sedangkan', 'sedemikian', 'sedikit', 'sedikitnya', 'seenaknya', 'segala',
-            'segalanya', 'segera', 'seharusnya', 'sehingga', 'seingat', 'sejak', 'sejauh',
-            'sejenak', 'sejumlah', 'sekadar', 'sekadarnya', 'sekali', 'sekali-kali',
-            'sekalian', 'sekaligus', 'sekalipun', 'sekarang', 'sekarang', 'sekecil',
-            'seketika', 'sekiranya', 'sekitar', 'sekitarnya', 'sekurang-kurangnya',
-            'sekurangnya', 'sela', 'selain', 'selaku', 'selalu', 'selama', 'selama-lamanya',
-            'selamanya', 'selanjutnya', 'seluruh', 'seluruhnya', 'semacam', 'semakin',
-            'semampu', 'semampunya', 'semasa', 'semasih', 'semata', 'semata-mata', 'semaunya',
-            'sementara', 'semisal', 'semisalnya', 'sempat', 'semua', 'semuanya', 'semula',
-            'sendiri', 'sendirian', 'sendirinya', 'seolah', 'seolah-olah', 'seorang',
-            'sepanjang', 'sepantasnya', 'sepantasnyalah', 'seperlunya', 'seperti',
-            'sepertinya', 'sepihak', 'sering', 'seringnya', 'serta', 'serupa', 'sesaat',
-            'sesama', 'sesampai', 'sesegera', 'sesekali', 'seseorang', 'sesuatu', 'sesuatunya',
-            'sesudah', 'sesudahnya', 'setelah', 'setelahnya', 'setempat', 'setengah',
-            'seterusnya', 'setiap', 'setiba', 'setibanya', 'setidak-tidaknya', 'setidaknya',
-            'setinggi', 'seusai', 'sewaktu', 'siap', 'siapa', 'siapakah', 'siapapun',
-            'sini', 'sinilah', 'soal', 'soalnya', 'suatu', 'sudah', 'sudahkah', 'sudahlah',
-            'supaya', 'tadi', 'tadinya', 'tahu', 'tahun', 'tak', 'tambah', 'tambahnya',
-            'tampak', 'tampaknya', 'tandas', 'tandasnya', 'tanpa', 'tanya', 'tanyakan',
-            'tanyanya', 'tapi', 'tegas', 'tegasnya', 'telah', 'tempat', 'tengah', 'tentang',
-            'tentu', 'tentulah', 'tentunya', 'tepat', 'terakhir', 'terasa', 'terbanyak',
-            'terdahulu', 'terdapat', 'terdiri', 'terhadap', 'terhadapnya', 'teringat',
-            'teringat-ingat', 'terjadi', 'terjadilah', 'terjadinya', 'terkira', 'terlalu',
-            'terlebih', 'terlihat', 'termasuk', 'ternyata', 'tersampaikan', 'tersebut',
-            'tersebutlah', 'tertentu', 'tertuju', 'terus', 'terutama', 'tetap', 'tetapi',
-            'tiap', 'tiba', 'tiba-tiba', 'tidak', 'tidakkah', 'tidaklah', 'tiga', 'tinggi',
-            'toh', 'tunjuk', 'turut', 'tutur', 'tuturnya', 'ucap', 'ucapnya', 'ujar',
-            'ujarnya', 'umum', 'umumnya', 'ungkap', 'ungkapnya', 'untuk', 'usai', 'usai',
-            'waduh', 'wah', 'wahai', 'waktu', 'waktunya', 'walau', 'walaupun', 'wong',
-            'yaitu', 'yakin', 'yakni', 'yang'
-        }
+    stop_words.update(COMMON_STOPWORDS)
+    stop_words.update(INDONESIAN_STOPWORDS)
+    stop_words.update(ACADEMIC_STOPWORDS)
+    return frozenset(stop_words)
 
-        # Tambahan stopwords untuk domain akademik (HANYA kata yang tidak informatif)
-        self.academic_stopwords = {
-            'doi', 'vol', 'pp', 'et', 'al', 'page', 'pages', 'volume', 'issue',
-            'isbn', 'issn', 'http', 'https', 'www', 'com', 'org', 'edu'
-        }
 
-        # Gabungkan semua stopwords
-        self.stop_words.update(common_stopwords)
-        self.stop_words.update(indonesian_stopwords)
-        self.stop_words.update(self.academic_stopwords)
+# Analyzer dibangun sekali per proses dan dipakai bersama (read-only)
+# oleh semua instance ContentBasedFilter dan semua thread
+ANALYZER = TextAnalyzer(build_stop_words(), WordNetLemmatizer())
 
-        self.tfidf_matrix = None
-        self.papers = []
-        self.paper_texts = []
+# Ranker yang bisa dipilih untuk /api/search (lihat create_ranker)
+RANKERS = ('tfidf', 'bm25', 'lsa')
+
+
+class IndexState(namedtuple('IndexState', ['vectorizer', 'tfidf_matrix', 'papers', 'paper_texts', 'version'])):
+    """
+    Hasil fit ContentBasedFilter: vectorizer, matriks TF-IDF, papers dan
+    teksnya selalu dari versi yang sama. Update incremental menerbitkan
+    objek state baru dalam satu assignment; objek lama tidak diubah, sehingga
+    reader yang memegang state lama (lihat ContentBasedFilter.snapshot)
+    tidak pernah melihat matriks dari versi lain dengan papers versi lama.
+    """
+    __slots__ = ()
+
+
+class ContentBasedFilter:
+    """
+    Content-Based Filtering menggunakan TF-IDF dan Cosine Similarity
+    
+    search_backend:
+        'matrix'   - dot product dengan seluruh matriks TF-IDF
+        'inverted' - inverted index + MaxScore top-k (hasil identik)
+        'auto'     - inverted jika jumlah papers >= INVERTED_INDEX_MIN_DOCS
+    
+    vectorizer_mode:
+        'exact'   - TfidfVectorizer dengan vocabulary (default)
+        'hashing' - StreamingTfidfVectorizer (feature hashing + tabel df),
+                    bisa di-fit bertahap per chunk dengan memori tetap
+    
+    n_workers:
+        Jumlah proses untuk preprocessing + penghitungan term saat fit
+        (lihat parallel_ingest). 1 = serial; hasil fit selalu identik.
+    
+    similar_backend (get_similar_papers):
+        'exact' - cosine similarity dengan seluruh matriks
+        'ann'   - random-projection LSH (approximate, lihat ann_index)
+        'auto'  - ann jika jumlah papers >= ANN_MIN_DOCS
+    
+    idf_drift_threshold / background_reweight (add_papers, remove_papers):
+        Matriks dinormalisasi ulang dengan IDF baru jika perubahan relatif
+        IDF melewati threshold (None = tidak pernah otomatis), di thread
+        background atau langsung (lihat incremental_index)
+    """
+    
+    INVERTED_INDEX_MIN_DOCS = 5000
+    ANN_MIN_DOCS = 50000
+    PARALLEL_MIN_DOCS = 2000
+    BATCH_QUERY_BLOCK = 256
+    
+    # Bobot Rocchio untuk profile rekomendasi (positif / negatif)
+    ROCCHIO_BETA = 1.0
+    ROCCHIO_GAMMA = 0.25
+    
+    def __init__(self, preprocess_cache=None, analyzer=None, search_backend='auto',
+                 similar_backend='auto', ann_params=None, vectorizer_mode='exact',
+                 n_hash_features=2 ** 20, n_workers=1, idf_drift_threshold=0.05,
+                 background_reweight=True):
+        # vectorizer / tfidf_matrix / papers / paper_texts / index_version dibaca
+        # dari satu IndexState (lihat property di bawah). Vectorizer TF-IDF
+        # dibuat saat fit sesuai jumlah dokumen
+        self.state = IndexState(None, None, [], [], 0)
+
+        # Stopwords, lemmatizer dan engine preprocessing diambil dari analyzer
+        # bersama, sehingga membuat filter baru hampir tanpa biaya
+        self.analyzer = analyzer or ANALYZER
+        self.stemmer = self.analyzer.stemmer
+        self.lemmatizer = self.analyzer.lemmatizer
+        self.stop_words = self.analyzer.stop_words
+        self.academic_stopwords = ACADEMIC_STOPWORDS
+        self.engine = self.analyzer.engine
+
+        # Cache turunan state (feature names, inverted index, LSH), dicocokkan
+        # dengan identitas vectorizer / matriks; dipakai bersama oleh snapshot
+        self._derived = {}
+
+        # Mode vectorizer (lihat docstring class)
+        self.vectorizer_mode = vectorizer_mode
+        self.n_hash_features = n_hash_features
+        
+        # Fit paralel per shard (exact mode, analyzer default saja)
+        self.n_workers = n_workers
+        
+        # Cache hasil preprocessing (default: cache global bersama)
+        self.preprocess_cache = preprocess_cache
+        
+        # Backend pencarian top-k (inverted index dibangun saat dibutuhkan)
+        self.search_backend = search_backend
+        
+        # Backend similar papers (index LSH dibangun saat dibutuhkan)
+        self.similar_backend = similar_backend
+        self.ann_params = ann_params or {}
+        
+        # Update incremental (state df / tf dibuat saat update pertama)
+        self.idf_drift_threshold = idf_drift_threshold
+        self.background_reweight = background_reweight
+        self._incremental = None
+    
+    @property
+    def vectorizer(self):
+        return self.state.vectorizer
+    
+    @vectorizer.setter
+    def vectorizer(self, value):
+        self.state = self.state._replace(vectorizer=value)
+    
+    @property
+    def tfidf_matrix(self):
+        return self.state.tfidf_matrix
+    
+    @tfidf_matrix.setter
+    def tfidf_matrix(self, value):
+        self.state = self.state._replace(tfidf_matrix=value)
+    
+    @property
+    def papers(self):
+        return self.state.papers
+    
+    @papers.setter
+    def papers(self, value):
+        self.state = self.state._replace(papers=value)
+    
+    @property
+    def paper_texts(self):
+        return self.state.paper_texts
+    
+    @paper_texts.setter
+    def paper_texts(self, value):
+        self.state = self.state._replace(paper_texts=value)
+    
+    @property
+    def index_version(self):
+        return self.state.version
+    
+    @index_version.setter
+    def index_version(self, value):
+        self.state = self.state._replace(version=value)
+    
+    def snapshot(self):
+        """
+        View read-only atas state saat ini. add_papers / remove_papers /
+        reweight pada filter asli tidak mengubah view, sehingga satu request
+        membaca vectorizer, matriks dan papers dari versi yang sama.
+        Cache turunan (inverted index, LSH, feature names) dipakai bersama.
+        
+        Returns:
+            ContentBasedFilter (jangan di-update)
+        """
+        view = copy.copy(self)
+        view._incremental = None
+        return view
     
     def _create_vectorizer(self, n_docs):
         """Create TF-IDF vectorizer dengan parameter yang sesuai jumlah dokumen"""
@@ -220,11 +378,11 @@ class ContentBasedFilter:
             min_df = 1
             max_df = 0.9
 
-        # Gunakan stopwords yang sudah didefinisikan di __init__
-        # Konversi ke list karena TfidfVectorizer membutuhkan list
+        # Gunakan list stopwords milik analyzer bersama
+        # (TfidfVectorizer membutuhkan list, list ini dibuat sekali saja)
         return TfidfVectorizer(
             max_features=5000,
-            stop_words=list(self.stop_words),  # Gunakan stopwords lengkap
+            stop_words=self.analyzer.stop_words_list,  # Gunakan stopwords lengkap
             ngram_range=(1, 2),
             min_df=min_df,
             max_df=max_df,
@@ -240,44 +398,69 @@ class ContentBasedFilter:
         3. Tokenization
         4. Remove stopwords
         5. Stemming/Lemmatization
+        
+        Hasil di-cache berdasarkan hash teks mentah, sehingga teks yang sama
+        tidak diproses ulang.
         """
         if not text:
             return ""
         
-        # 1. Lowercase
-        text = str(text).lower()
-        
-        # 2. Remove URLs
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text)
-        
-        # 3. Remove email addresses
-        text = re.sub(r'\S+@\S+', '', text)
+        cache = self.preprocess_cache
+        if cache is None and self.analyzer is ANALYZER:
+            # Cache global hanya valid untuk analyzer default
+            cache = get_preprocess_cache()
+        if cache is None:
+            return self._preprocess_uncached(text)
+        return cache.get_or_compute(text, self._preprocess_uncached)
+    
+    def _preprocess_uncached(self, text):
+        """
+        Pipeline preprocessing tanpa cache (lihat preprocess_text).
+        Dijalankan oleh PreprocessEngine: hasilnya sama dengan pipeline
+        regex + word_tokenize + WordNetLemmatizer (text_engine.reference_preprocess).
+        """
+        return self.engine.process(text)
+    
+    def _paper_text(self, paper):
+        """Teks ter-preprocess untuk satu paper (title diulang + abstract)"""
+        title = paper.get('title', '') or ''
+        abstract = paper.get('abstract', paper.get('snippet', '')) or ''
+        combined = f"{title} {title} {abstract}"  # Title diulang untuk bobot lebih
         
-        # 4. Remove special characters and numbers
-        text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+        processed = self.preprocess_text(combined)
+        return processed if processed else title.lower()
+    
+    def _create_streaming_vectorizer(self):
+        return StreamingTfidfVectorizer(
+            stop_words=self.analyzer.stop_words_list,
+            n_features=self.n_hash_features
+        )
+    
+    def partial_fit(self, papers):
+        """
+        Mode hashing, pass 1: akumulasi document frequency dari satu chunk
+        papers. Papers dan teksnya tidak disimpan.
         
-        # 5. Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        Args:
+            papers: Chunk paper dictionaries
+        """
+        if self.vectorizer_mode != 'hashing':
+            raise ValueError("partial_fit requires vectorizer_mode='hashing'")
+        if self.vectorizer is None:
+            self.vectorizer = self._create_streaming_vectorizer()
+        self.vectorizer.partial_fit([self._paper_text(p) for p in papers])
+        return self
+    
+    def transform_papers(self, papers):
+        """
+        Pass 2: TF-IDF untuk satu chunk papers dengan IDF yang sudah diakumulasi
         
-        # 6. Tokenization
-        try:
-            tokens = word_tokenize(text)
-        except:
-            tokens = text.split()
-
-        # 7. Remove stopwords and short words (minimal 3 karakter)
-        tokens = [t for t in tokens if t not in self.stop_words and len(t) >= 3]
-
-        # 8. Lemmatization (lebih baik dari stemming untuk NLP)
-        try:
-            tokens = [self.lemmatizer.lemmatize(t) for t in tokens]
-        except:
-            pass  # Skip lemmatization if fails
-
-        # 9. Filter lagi setelah lemmatization untuk memastikan tidak ada stopwords
-        tokens = [t for t in tokens if t not in self.stop_words and len(t) >= 3]
-
-        return ' '.join(tokens)
+        Returns:
+            Sparse CSR matrix (len(papers) x n_features)
+        """
+        if self.vectorizer is None:
+            raise ValueError('Vectorizer is not fitted')
+        return self.vectorizer.transform([self._paper_text(p) for p in papers])
     
     def fit(self, papers):
         """
@@ -288,19 +471,27 @@ class ContentBasedFilter:
         """
         self.papers = papers
         self.paper_texts = []
+        self._incremental = None
+        self.index_version += 1
         
         if not papers:
             return self
         
-        for paper in papers:
-            # Gabungkan title dan abstract
-            title = paper.get('title', '') or ''
-            abstract = paper.get('abstract', paper.get('snippet', '')) or ''
-            combined = f"{title} {title} {abstract}"  # Title diulang untuk bobot lebih
-            
-            # Preprocess
-            processed = self.preprocess_text(combined)
-            self.paper_texts.append(processed if processed else title.lower())
+        counts = None
+        if self._use_parallel_fit(papers):
+            from .parallel_ingest import parallel_count
+            # Worker memakai analyzer default, hasil disimpan ke cache global
+            cache = self.preprocess_cache if self.preprocess_cache is not None else get_preprocess_cache()
+            self.paper_texts, vocabulary, counts = parallel_count(papers, self.n_workers, cache)
+        else:
+            self.paper_texts = [self._paper_text(paper) for paper in papers]
+        
+        if self.vectorizer_mode == 'hashing':
+            # Satu chunk: akumulasi df lalu transform
+            self.vectorizer = self._create_streaming_vectorizer()
+            self.tfidf_matrix = self.vectorizer.fit_transform(self.paper_texts)
+            print(f"[DEBUG] Hashing TF-IDF fitted: {self.tfidf_matrix.shape}")
+            return self
         
         # Filter out empty texts
         valid_indices = [i for i, t in enumerate(self.paper_texts) if t.strip()]
@@ -314,14 +505,20 @@ class ContentBasedFilter:
         
         # Fit TF-IDF with error handling
         try:
-            self.tfidf_matrix = self.vectorizer.fit_transform(self.paper_texts)
+            if counts is not None:
+                from .parallel_ingest import fit_from_counts
+                self.tfidf_matrix = fit_from_counts(self.vectorizer, vocabulary, counts)
+            else:
+                self.tfidf_matrix = self.vectorizer.fit_transform(self.paper_texts)
             print(f"[DEBUG] TF-IDF fitted: {self.tfidf_matrix.shape}")
+            # Siapkan lemma untuk term vocabulary (dipakai saat preprocessing query)
+            self.engine.warm(self.vectorizer.vocabulary_)
         except ValueError as e:
             print(f"[WARNING] TF-IDF error: {e}")
             # Fallback: use simpler vectorizer
             self.vectorizer = TfidfVectorizer(
                 max_features=1000,
-                stop_words=list(self.stop_words),
+                stop_words=self.analyzer.stop_words_list,
                 ngram_range=(1, 1),
                 min_df=1,
                 max_df=1.0,
@@ -336,12 +533,169 @@ class ContentBasedFilter:
         
         return self
     
-    def calculate_similarity_to_query(self, query):
+    def _get_incremental(self):
+        if self._incremental is None:
+            from .incremental_index import IncrementalTfidf
+            self._incremental = IncrementalTfidf(self)
+        return self._incremental
+    
+    def add_papers(self, papers):
+        """
+        Tambahkan papers ke index yang sudah di-fit tanpa fit ulang:
+        df, IDF dan vocabulary diperbarui, baris baru ditambahkan ke matriks
+        (lihat incremental_index). Jika belum di-fit, sama dengan fit.
+        
+        Args:
+            papers: List of paper dictionaries
+            
+        Returns:
+            List index baris untuk papers baru
+        """
+        papers = list(papers)
+        if self.tfidf_matrix is None or self.vectorizer is None:
+            self.fit(list(self.papers) + papers)
+            return list(range(len(self.papers) - len(papers), len(self.papers)))
+        if not papers:
+            return []
+        return self._get_incremental().add(papers, [self._paper_text(p) for p in papers])
+    
+    def remove_papers(self, rows):
+        """
+        Hapus papers berdasarkan index baris (baris sesudahnya bergeser),
+        df dan IDF diperbarui tanpa fit ulang
+        
+        Args:
+            rows: List index baris
+            
+        Returns:
+            Jumlah papers yang dihapus
+        """
+        if self.tfidf_matrix is None or self.vectorizer is None:
+            removed = {int(r) for r in rows}
+            kept = [i for i in range(len(self.papers)) if i not in removed]
+            n_removed = len(self.papers) - len(kept)
+            self.papers = [self.papers[i] for i in kept]
+            self.paper_texts = [self.paper_texts[i] for i in kept] if self.paper_texts else []
+            return n_removed
+        return self._get_incremental().remove(rows)
+    
+    def reweight(self):
+        """Normalisasi ulang matriks dengan IDF terbaru sekarang (tanpa menunggu drift)"""
+        if self.tfidf_matrix is not None and self.vectorizer is not None:
+            self._get_incremental().reweight()
+        return self
+    
+    def wait_for_reweight(self, timeout=None):
+        """Tunggu reweight background yang sedang berjalan (jika ada)"""
+        if self._incremental is not None:
+            self._incremental.wait(timeout)
+        return self
+    
+    def update_stats(self):
+        """
+        Statistik update incremental (drift IDF, jumlah reweight, vocabulary)
+        
+        Returns:
+            Dictionary, atau None jika belum pernah ada update
+        """
+        return self._incremental.stats() if self._incremental is not None else None
+    
+    def save_snapshot(self, path, dtype=np.float32):
+        """Simpan hasil fit ke direktori snapshot (lihat index_snapshot)"""
+        from .index_snapshot import save_snapshot
+        return save_snapshot(self, path, dtype=dtype)
+    
+    @classmethod
+    def load_snapshot(cls, path, mmap_mode='r', **params):
+        """Muat filter dari snapshot tanpa preprocessing / fit ulang"""
+        from .index_snapshot import load_snapshot
+        return load_snapshot(path, mmap_mode=mmap_mode, **params)
+    
+    def _use_parallel_fit(self, papers):
+        """
+        Fit paralel hanya untuk mode exact, analyzer default, corpus besar
+        dan versi scikit-learn yang sudah diuji (lihat parallel_ingest)
+        """
+        if not (
+            self.n_workers is not None and self.n_workers > 1
+            and self.vectorizer_mode == 'exact'
+            and self.analyzer is ANALYZER
+            and len(papers) >= self.PARALLEL_MIN_DOCS
+        ):
+            return False
+        from .parallel_ingest import sklearn_supported
+        if not sklearn_supported():
+            print("[WARNING] Parallel fit not tested with this scikit-learn version, using serial fit")
+            return False
+        return True
+    
+    def transform_query(self, query):
+        """Preprocess query lalu transform ke TF-IDF vector"""
+        return self.vectorizer.transform([self.preprocess_text(query)])
+    
+    def get_inverted_index(self):
+        """
+        Inverted index untuk matriks TF-IDF saat ini (dibangun saat pertama dipakai)
+        
+        Returns:
+            InvertedIndex, atau None jika backend tidak memakai inverted index
+        """
+        if self.tfidf_matrix is None:
+            return None
+        if self.search_backend == 'matrix':
+            return None
+        if self.search_backend == 'auto' and self.tfidf_matrix.shape[0] < self.INVERTED_INDEX_MIN_DOCS:
+            return None
+        
+        matrix = self.tfidf_matrix
+        inverted = self._derived.get('inverted')
+        if inverted is None or inverted.matrix is not matrix:
+            inverted = self._derived['inverted'] = InvertedIndex(matrix)
+        return inverted
+    
+    def get_ann_index(self):
+        """
+        Index LSH untuk matriks TF-IDF saat ini (dibangun saat pertama dipakai)
+        
+        Returns:
+            RandomProjectionLSH, atau None jika backend exact
+        """
+        if self.tfidf_matrix is None:
+            return None
+        if self.similar_backend == 'exact':
+            return None
+        if self.similar_backend == 'auto' and self.tfidf_matrix.shape[0] < self.ANN_MIN_DOCS:
+            return None
+        
+        matrix = self.tfidf_matrix
+        cached = self._derived.get('ann')
+        if cached is None or cached[0] is not matrix:
+            cached = self._derived['ann'] = (matrix, RandomProjectionLSH.from_matrix(matrix, **self.ann_params))
+        return cached[1]
+    
+    def query_scores(self, query):
+        """
+        Skor cosine similarity query terhadap semua papers (belum diurutkan)
+        
+        Args:
+            query: String query dari user
+            
+        Returns:
+            numpy array skor (n_papers,), atau None jika belum di-fit
+        """
+        if self.tfidf_matrix is None or len(self.papers) == 0:
+            return None
+        
+        # Vektor TF-IDF sudah ter-normalisasi L2: cosine = dot product
+        return dot_scores(self.transform_query(query), self.tfidf_matrix)
+    
+    def calculate_similarity_to_query(self, query, top_k=None):
         """
         Hitung Cosine Similarity antara query dengan semua papers
         
         Args:
             query: String query dari user
+            top_k: Jumlah hasil teratas (None = semua papers)
             
         Returns:
             List of (paper_index, similarity_score) sorted by score descending
@@ -349,20 +703,12 @@ class ContentBasedFilter:
         if self.tfidf_matrix is None or len(self.papers) == 0:
             return []
         
-        # Preprocess query
-        processed_query = self.preprocess_text(query)
-        
-        # Transform query ke TF-IDF vector
-        query_vector = self.vectorizer.transform([processed_query])
-        
-        # Hitung Cosine Similarity
-        similarities = cosine_similarity(query_vector, self.tfidf_matrix).flatten()
+        # Top-k lewat inverted index: hanya dokumen kandidat yang dihitung
+        inverted = self.get_inverted_index() if top_k is not None else None
+        if inverted is not None:
+            return inverted.search_scored(self.transform_query(query), top_k)
         
-        # Create list of (index, score) dan sort
-        scored_papers = [(i, score) for i, score in enumerate(similarities)]
-        scored_papers.sort(key=lambda x: x[1], reverse=True)
-        
-        return scored_papers
+        return top_k_scored(self.query_scores(query), top_k)
     
     def get_similar_papers(self, paper_index, top_n=5):
         """
@@ -378,30 +724,36 @@ class ContentBasedFilter:
         if self.tfidf_matrix is None or paper_index >= len(self.papers):
             return []
         
-        # Get TF-IDF vector untuk paper referensi
-        paper_vector = self.tfidf_matrix[paper_index]
+        # Corpus besar: kandidat dari LSH, skor persis hanya untuk kandidat
+        ann = self.get_ann_index()
+        if ann is not None:
+            return ann.search_scored(self.tfidf_matrix[paper_index], top_n, exclude=paper_index)
         
-        # Hitung similarity dengan semua papers
-        similarities = cosine_similarity(paper_vector, self.tfidf_matrix).flatten()
+        # Similarity vektor paper referensi dengan semua papers
+        scores = dot_scores(self.tfidf_matrix[paper_index], self.tfidf_matrix)
         
-        # Sort dan exclude paper itu sendiri
-        scored_papers = [(i, score) for i, score in enumerate(similarities) if i != paper_index]
-        scored_papers.sort(key=lambda x: x[1], reverse=True)
+        # Exclude paper itu sendiri
+        scores[paper_index] = -np.inf
+        top_n = min(top_n, len(scores) - 1)
         
-        return scored_papers[:top_n]
+        return top_k_scored(scores, top_n)
     
-    def rank_papers_by_relevance(self, query):
+    def rank_papers_by_relevance(self, query, top_k=None):
         """
-        Rank semua papers berdasarkan relevansi dengan query
+        Rank papers berdasarkan relevansi dengan query
         
         Args:
             query: Search query
+            top_k: Jumlah papers teratas yang dikembalikan (None = semua)
             
         Returns:
             List of papers dengan tambahan field 'relevance_score'
         """
-        similarities = self.calculate_similarity_to_query(query)
-        
+        return self._ranked_papers(self.calculate_similarity_to_query(query, top_k))
+    
+    def _ranked_papers(self, similarities):
+        """Salinan papers top-k dengan relevance_score dan relevance_rank"""
+        # Hanya papers top-k yang di-copy
         ranked_papers = []
         for idx, score in similarities:
             paper = self.papers[idx].copy()
@@ -411,86 +763,172 @@ class ContentBasedFilter:
         
         return ranked_papers
     
-    def get_recommendations(self, selected_papers, all_papers, top_n=10):
+    def transform_queries(self, queries):
+        """Preprocess lalu transform banyak query sekaligus (satu baris per query)"""
+        return self.vectorizer.transform([self.preprocess_text(q) for q in queries])
+    
+    def batch_query_scores(self, queries):
         """
-        Content-Based Filtering: Rekomendasikan papers berdasarkan yang dipilih
+        Skor banyak query sekaligus dengan satu perkalian matriks sparse
+        (papers x features) @ (features x queries)
         
         Args:
-            selected_papers: List of papers yang dipilih user
-            all_papers: Semua papers untuk direkomendasikan
-            top_n: Jumlah rekomendasi
+            queries: List of query strings
             
         Returns:
-            List of recommended papers dengan similarity scores
+            Sparse CSR matrix skor (n_queries x n_papers), atau None jika belum di-fit
         """
-        if not selected_papers or not all_papers:
-            return []
+        if self.tfidf_matrix is None or len(self.papers) == 0:
+            return None
         
-        # Gabungkan teks dari selected papers sebagai "user profile"
-        selected_texts = []
-        for paper in selected_papers:
-            title = paper.get('title', '')
-            abstract = paper.get('abstract', paper.get('snippet', ''))
-            selected_texts.append(f"{title} {abstract}")
+        # Matriks papers di kiri: urutan penjumlahan per skor sama dengan dot_scores
+        return (self.tfidf_matrix @ self.transform_queries(queries).T).T.tocsr()
+    
+    def calculate_similarity_batch(self, queries, top_k=None):
+        """
+        Top-k papers untuk banyak query (hasil per query sama dengan
+        calculate_similarity_to_query)
         
-        user_profile = ' '.join(selected_texts)
-        processed_profile = self.preprocess_text(user_profile)
+        Returns:
+            List (per query) of list of (paper_index, score)
+        """
+        queries = list(queries)
+        results = []
+        # Query diproses per blok agar matriks skor tetap kecil
+        for start in range(0, len(queries), self.BATCH_QUERY_BLOCK):
+            block = queries[start:start + self.BATCH_QUERY_BLOCK]
+            scores = self.batch_query_scores(block)
+            if scores is None:
+                return [[] for _ in queries]
+            results.extend(
+                list(zip(indices.tolist(), values.tolist())) for indices, values in top_k_rows(scores, top_k)
+            )
+        return results
+    
+    def rank_papers_batch(self, queries, top_k=None):
+        """
+        Rank papers untuk banyak query sekaligus
+        
+        Returns:
+            List (per query) of ranked papers dengan 'relevance_score'
+        """
+        return [self._ranked_papers(similarities) for similarities in self.calculate_similarity_batch(queries, top_k)]
+    
+    def build_profile(self, rows, negative_rows=None, weights=None):
+        """
+        Profile user (Rocchio) dari vektor TF-IDF papers yang sudah di-fit:
+        beta x centroid berbobot papers terpilih - gamma x centroid papers
+        negatif. Bobot negatif dipotong ke 0 lalu dinormalisasi L2.
+        
+        Args:
+            rows: Index papers terpilih (feedback positif)
+            negative_rows: Index papers yang tidak relevan (opsional)
+            weights: Bobot per paper terpilih (default sama rata)
+            
+        Returns:
+            Sparse row vector (1 x n_features), atau None jika profile kosong
+        """
+        if self.tfidf_matrix is None or not len(rows):
+            return None
         
-        # Prepare all papers untuk comparison
-        all_texts = []
-        for paper in all_papers:
-            title = paper.get('title', '')
-            abstract = paper.get('abstract', paper.get('snippet', ''))
-            all_texts.append(self.preprocess_text(f"{title} {abstract}"))
+        weights = np.ones(len(rows)) if weights is None else np.asarray(weights, dtype=np.float64)
+        weights = weights / weights.sum()
+        profile = self.ROCCHIO_BETA * (sp.csr_matrix(weights) @ self.tfidf_matrix[rows])
         
-        # Fit vectorizer dengan semua teks
-        combined_texts = all_texts + [processed_profile]
+        if negative_rows is not None and len(negative_rows):
+            negative = self.tfidf_matrix[negative_rows]
+            profile = profile - self.ROCCHIO_GAMMA * sp.csr_matrix(negative.mean(axis=0))
         
-        # Use try-catch for vectorizer
-        try:
-            temp_vectorizer = TfidfVectorizer(
-                max_features=3000,
-                stop_words=list(self.stop_words),  # Gunakan stopwords lengkap
-                ngram_range=(1, 2),
-                min_df=1,
-                max_df=1.0,  # No max_df limit to avoid pruning
-                token_pattern=r'(?u)\b[a-zA-Z]{3,}\b'  # Hanya kata minimal 3 huruf
-            )
-            tfidf_all = temp_vectorizer.fit_transform(combined_texts)
-        except ValueError:
-            # Fallback with simpler settings
-            temp_vectorizer = TfidfVectorizer(
-                max_features=1000,
-                stop_words=list(self.stop_words),
-                ngram_range=(1, 1),
-                min_df=1,
-                max_df=1.0,
-                token_pattern=r'(?u)\b[a-zA-Z]{3,}\b'
-            )
-            tfidf_all = temp_vectorizer.fit_transform(combined_texts)
+        profile = sp.csr_matrix(profile)
+        profile.data = np.maximum(profile.data, 0)
+        profile.eliminate_zeros()
+        norm = np.sqrt(profile.multiply(profile).sum())
+        if norm == 0:
+            return None
+        return profile / norm
+    
+    def profile_scores(self, rows, negative_rows=None, weights=None):
+        """
+        Skor semua papers terhadap profile Rocchio, satu sparse
+        matrix-vector product (tanpa preprocessing atau fit ulang).
+        Papers feedback (positif dan negatif) diberi skor -inf.
         
-        # User profile vector adalah yang terakhir
-        user_vector = tfidf_all[-1]
-        paper_vectors = tfidf_all[:-1]
+        Returns:
+            numpy array skor (n_papers,), atau None jika profile kosong
+        """
+        profile = self.build_profile(rows, negative_rows, weights)
+        if profile is None:
+            return None
         
-        # Hitung similarity
-        similarities = cosine_similarity(user_vector, paper_vectors).flatten()
+        scores = dot_scores(profile, self.tfidf_matrix)
+        scores[list(rows)] = -np.inf
+        if negative_rows is not None and len(negative_rows):
+            scores[list(negative_rows)] = -np.inf
+        return scores
+    
+    def recommend(self, rows, top_n=10, negative_rows=None, weights=None):
+        """
+        Rekomendasi dari profile Rocchio papers terpilih
         
-        # Create recommendations
-        recommendations = []
-        selected_titles = {p.get('title', '').lower() for p in selected_papers}
+        Args:
+            rows: Index papers terpilih
+            top_n: Jumlah rekomendasi
+            negative_rows: Index papers yang tidak relevan (opsional)
+            weights: Bobot per paper terpilih (opsional)
+            
+        Returns:
+            List of (paper_index, similarity_score), tanpa papers feedback
+        """
+        scores = self.profile_scores(rows, negative_rows, weights)
+        if scores is None:
+            return []
+        return top_k_scored(scores, min(top_n, int(np.isfinite(scores).sum())))
+    
+    def get_recommendations(self, selected_papers, all_papers, top_n=10):
+        """
+        Content-Based Filtering: Rekomendasikan papers berdasarkan yang dipilih.
+        Profile Rocchio dari vektor papers terpilih, sama dengan
+        get_paper_recommendations. Jika filter ini sudah di-fit pada
+        all_papers, vektor yang tersimpan dipakai tanpa fit; selain itu
+        all_papers di-fit sekali.
         
-        for i, score in enumerate(similarities):
-            paper = all_papers[i]
-            # Exclude papers yang sudah dipilih
-            if paper.get('title', '').lower() not in selected_titles:
-                rec = paper.copy()
-                rec['similarity_score'] = round(score * 100, 2)
-                recommendations.append(rec)
+        Args:
+            selected_papers: List of papers yang dipilih user
+            all_papers: Semua papers untuk direkomendasikan
+            top_n: Jumlah rekomendasi
+            
+        Returns:
+            List of recommended papers dengan similarity scores
+        """
+        if not selected_papers or not all_papers:
+            return []
+        if self.tfidf_matrix is None or all_papers is not self.papers:
+            return get_paper_recommendations(selected_papers, all_papers, top_n)
+        
+        rows_by_title = {}
+        for i, paper in enumerate(all_papers):
+            rows_by_title.setdefault(paper.get('title', '').lower(), i)
+        rows = {rows_by_title.get(p.get('title', '').lower()) for p in selected_papers}
+        if None in rows:
+            # Ada paper terpilih di luar corpus filter ini: perlu fit yang mencakupnya
+            return get_paper_recommendations(selected_papers, all_papers, top_n)
+        return _profile_recommendations(self, sorted(rows), selected_papers, all_papers, top_n)
+    
+    def get_feature_names(self):
+        """
+        Feature names vectorizer (dibuat sekali per vectorizer, bukan per paper)
         
-        # Sort by similarity dan return top N
-        recommendations.sort(key=lambda x: x['similarity_score'], reverse=True)
-        return recommendations[:top_n]
+        Returns:
+            numpy array term, atau list kosong jika belum di-fit
+        """
+        vectorizer = self.vectorizer
+        if vectorizer is None or not hasattr(vectorizer, 'get_feature_names_out'):
+            # Mode hashing tidak menyimpan nama term
+            return []
+        cached = self._derived.get('feature_names')
+        if cached is None or cached[0] is not vectorizer:
+            cached = self._derived['feature_names'] = (vectorizer, vectorizer.get_feature_names_out())
+        return cached[1]
     
     def get_tfidf_terms(self, paper_index, top_n=10):
         """
@@ -506,14 +944,30 @@ class ContentBasedFilter:
         if self.tfidf_matrix is None or paper_index >= len(self.papers):
             return []
         
-        feature_names = self.vectorizer.get_feature_names_out()
-        paper_vector = self.tfidf_matrix[paper_index].toarray().flatten()
+        # Top-k langsung dari entri sparse baris paper (tanpa toarray)
+        feature_names = self.get_feature_names()
+        if not len(feature_names):
+            return []
+        columns, weights = sparse_row_top_k(self.tfidf_matrix[paper_index], top_n)[0]
+        return [(feature_names[i], round(float(w), 4)) for i, w in zip(columns, weights) if w > 0]
+    
+    def get_tfidf_terms_all(self, top_n=10):
+        """
+        Top TF-IDF terms untuk semua papers sekaligus (satu lintasan CSR)
         
-        # Get top terms
-        top_indices = paper_vector.argsort()[-top_n:][::-1]
-        top_terms = [(feature_names[i], round(paper_vector[i], 4)) for i in top_indices if paper_vector[i] > 0]
+        Returns:
+            List (per paper) of list of (term, tfidf_score)
+        """
+        if self.tfidf_matrix is None:
+            return []
         
-        return top_terms
+        feature_names = self.get_feature_names()
+        if not len(feature_names):
+            return [[] for _ in range(self.tfidf_matrix.shape[0])]
+        return [
+            [(feature_names[i], round(float(w), 4)) for i, w in zip(columns, weights) if w > 0]
+            for columns, weights in sparse_row_top_k(self.tfidf_matrix, top_n)
+        ]
     
     def explain_similarity(self, paper1_idx, paper2_idx):
         """
@@ -548,13 +1002,52 @@ class ContentBasedFilter:
 
 
 # Fungsi helper untuk integrasi dengan app.py
-def rank_papers_with_cbf(papers, query):
+def create_ranker(ranker='tfidf'):
+    """
+    Buat filter untuk ranking query
+    
+    Args:
+        ranker: 'tfidf' (TF-IDF + cosine similarity), 'bm25' (BM25F)
+            atau 'lsa' (embedding TruncatedSVD)
+        
+    Returns:
+        ContentBasedFilter, BM25Filter atau LSAFilter (belum di-fit)
+    """
+    if ranker not in RANKERS:
+        raise ValueError(f"Unknown ranker: {ranker}")
+    if ranker == 'bm25':
+        from .bm25 import BM25Filter
+        return BM25Filter()
+    if ranker == 'lsa':
+        from .lsa import LSAFilter
+        return LSAFilter()
+    return ContentBasedFilter()
+
+
+def preprocess_papers(papers):
+    """
+    Preprocess papers lebih awal, misalnya setiap halaman hasil scraping
+    saat tiba. Hasilnya masuk cache preprocessing global, sehingga fit
+    untuk papers yang sama nanti tidak memproses ulang teksnya.
+    
+    Args:
+        papers: List of paper dictionaries
+    """
+    cbf = ContentBasedFilter()
+    for paper in papers:
+        cbf._paper_text(paper)
+
+
+def rank_papers_with_cbf(papers, query, index=None, top_k=None, ranker='tfidf'):
     """
     Rank papers dengan Content-Based Filtering
     
     Args:
         papers: List of papers dari scraping
         query: User's search query
+        index: PaperIndex yang sudah di-fit untuk papers (opsional, tanpa fit ulang)
+        top_k: Jumlah papers teratas yang dikembalikan (None = semua)
+        ranker: 'tfidf', 'bm25' atau 'lsa'
         
     Returns:
         Papers yang sudah di-rank dengan relevance score
@@ -562,14 +1055,46 @@ def rank_papers_with_cbf(papers, query):
     if not papers:
         return papers
     
-    cbf = ContentBasedFilter()
+    if index is not None and index.is_fitted:
+        return index.snapshot().rank(query, top_k, ranker)
+    
+    cbf = create_ranker(ranker)
     cbf.fit(papers)
-    ranked = cbf.rank_papers_by_relevance(query)
+    ranked = cbf.rank_papers_by_relevance(query, top_k)
     
     return ranked
 
 
-def get_paper_recommendations(selected_papers, all_papers, top_n=10):
+def rank_papers_batch_with_cbf(papers, queries, index=None, top_k=None, ranker='tfidf'):
+    """
+    Rank papers untuk banyak query sekaligus: fit satu kali, semua query
+    di-transform bersama dan diskor dengan satu perkalian matriks
+    
+    Args:
+        papers: List of papers (corpus yang sama untuk semua query)
+        queries: List of query strings
+        index: PaperIndex yang sudah di-fit untuk papers (opsional, tanpa fit ulang)
+        top_k: Jumlah papers teratas per query (None = semua)
+        ranker: 'tfidf', 'bm25' atau 'lsa'
+        
+    Returns:
+        List (per query) of papers yang sudah di-rank
+    """
+    if not queries:
+        return []
+    
+    if index is not None and index.is_fitted:
+        cbf = index.snapshot().get_ranker(ranker)
+    else:
+        if not papers:
+            return [[] for _ in queries]
+        cbf = create_ranker(ranker)
+        cbf.fit(papers)
+    
+    return cbf.rank_papers_batch(queries, top_k)
+
+
+def get_paper_recommendations(selected_papers, all_papers, top_n=10, index=None, negative_papers=None):
     """
     Dapatkan rekomendasi paper berdasarkan yang dipilih user
     
@@ -577,15 +1102,91 @@ def get_paper_recommendations(selected_papers, all_papers, top_n=10):
         selected_papers: Papers yang dipilih user
         all_papers: Semua papers available
         top_n: Jumlah rekomendasi
+        index: PaperIndex dari hasil pencarian (opsional, tanpa fit ulang)
+        negative_papers: Papers yang ditandai tidak relevan (opsional, hanya dengan index)
         
     Returns:
         List of recommended papers dengan similarity scores
     """
+    if index is not None and index.is_fitted:
+        if not selected_papers:
+            return []
+        # Satu versi index untuk seluruh request (update bersamaan tidak terlihat)
+        index = index.snapshot()
+        
+        selected_titles = {p.get('title', '').lower() for p in selected_papers}
+        rows = index.locate_all(selected_papers)
+        if rows is not None:
+            # Profile Rocchio dari vektor yang tersimpan di index
+            negative_rows = [r for r in (index.locate(p) for p in negative_papers or []) if r is not None]
+            scores = index.cbf.profile_scores(rows, negative_rows)
+            if scores is None:
+                return []
+        else:
+            # Ada paper yang tidak ada di index: transform teksnya dengan vectorizer index
+            profile = ' '.join(
+                f"{p.get('title', '')} {p.get('abstract', p.get('snippet', ''))}"
+                for p in selected_papers
+            )
+            scores = index.cbf.query_scores(profile)
+        
+        # Ambil top-k secukupnya; perbesar k jika banyak yang ter-exclude
+        k = top_n + len(selected_papers)
+        while True:
+            recommendations = []
+            for idx, score in top_k_scored(scores, k):
+                if score == -np.inf:
+                    return recommendations
+                paper = index.papers[idx]
+                if paper.get('title', '').lower() in selected_titles:
+                    continue
+                rec = paper.copy()
+                rec['similarity_score'] = round(score * 100, 2)
+                recommendations.append(rec)
+                if len(recommendations) >= top_n:
+                    return recommendations
+            if k >= len(scores):
+                return recommendations
+            k *= 2
+    
+    if not selected_papers or not all_papers:
+        return []
+    
+    # Tanpa index: fit sekali pada all_papers (+ paper terpilih yang tidak ada
+    # di dalamnya), lalu profile Rocchio yang sama dengan jalur index
+    rows_by_title = {}
+    for i, paper in enumerate(all_papers):
+        rows_by_title.setdefault(paper.get('title', '').lower(), i)
+    extra = [p for p in selected_papers if p.get('title', '').lower() not in rows_by_title]
+    
     cbf = ContentBasedFilter()
-    return cbf.get_recommendations(selected_papers, all_papers, top_n)
+    cbf.fit(list(all_papers) + extra)
+    rows = sorted({rows_by_title[p.get('title', '').lower()] for p in selected_papers
+                   if p.get('title', '').lower() in rows_by_title})
+    rows += list(range(len(all_papers), len(all_papers) + len(extra)))
+    return _profile_recommendations(cbf, rows, selected_papers, all_papers, top_n)
+
 
+def _profile_recommendations(cbf, rows, selected_papers, all_papers, top_n):
+    """Top-n all_papers untuk profile Rocchio dari baris rows matriks cbf"""
+    scores = cbf.profile_scores(rows)
+    if scores is None:
+        return []
+    
+    # Paper terpilih (termasuk judul ganda di all_papers) tidak direkomendasikan
+    selected_titles = {p.get('title', '').lower() for p in selected_papers}
+    scores = scores[:len(all_papers)]
+    scores[[i for i, p in enumerate(all_papers) if p.get('title', '').lower() in selected_titles]] = -np.inf
+    
+    recommendations = []
+    for idx, score in top_k_scored(scores, min(top_n, int(np.isfinite(scores).sum()))):
+        rec = all_papers[idx].copy()
+        rec['similarity_score'] = round(score * 100, 2)
+        recommendations.append(rec)
+    return recommendations
 
-def find_similar_papers(reference_paper, all_papers, top_n=5):
+
+def find_similar_papers(reference_paper, all_papers, top_n=5, index=None):
     """
     Cari papers yang mirip dengan paper referensi
     
@@ -593,10 +1194,34 @@ def find_similar_papers(reference_paper, all_papers, top_n=5):
         reference_paper: Paper yang jadi referensi
         all_papers: Semua papers untuk dicari
         top_n: Jumlah hasil
+        index: PaperIndex dari hasil pencarian (opsional, tanpa fit ulang)
         
     Returns:
         List of similar papers dengan scores
     """
+    if index is not None and index.is_fitted:
+        index = index.snapshot()
+        row = index.locate(reference_paper)
+        if row is not None:
+            similar = index.similar(row, top_n)
+        else:
+            # Paper referensi belum ada di index: transform teksnya saja
+            title = reference_paper.get('title', '') or ''
+            abstract = reference_paper.get('abstract', reference_paper.get('snippet', '')) or ''
+            text = f"{title} {title} {abstract}"
+            ann = index.cbf.get_ann_index()
+            if ann is not None:
+                similar = ann.search_scored(index.cbf.transform_query(text), top_n)
+            else:
+                similar = index.cbf.calculate_similarity_to_query(text, top_n)
+        
+        results = []
+        for idx, score in similar:
+            paper = index.papers[idx].copy()
+            paper['similarity_score'] = round(score * 100, 2)
+            results.append(paper)
+        return results
+    
     cbf = ContentBasedFilter()
     
     # Add reference paper to list for comparison
@@ -615,7 +1240,7 @@ def find_similar_papers(reference_paper, all_papers, top_n=5):
     return results
 
 
-def get_cbf_calculation_details(selected_papers, query):
+def get_cbf_calculation_details(selected_papers, query, index=None):
     """
     Dapatkan detail perhitungan CBF untuk papers yang dipilih
     Menampilkan proses TF-IDF dan Cosine Similarity
@@ -623,6 +1248,7 @@ def get_cbf_calculation_details(selected_papers, query):
     Args:
         selected_papers: Papers yang dipilih user
         query: Search query
+        index: PaperIndex dari hasil pencarian (opsional, tanpa fit ulang)
         
     Returns:
         Dictionary dengan detail perhitungan
@@ -630,8 +1256,15 @@ def get_cbf_calculation_details(selected_papers, query):
     if not selected_papers:
         return {'error': 'No papers selected'}
     
-    cbf = ContentBasedFilter()
-    cbf.fit(selected_papers)
+    if index is not None:
+        index = index.snapshot()
+    rows = index.locate_all(selected_papers) if index is not None and index.is_fitted else None
+    if rows:
+        # Ambil baris TF-IDF dari index yang sudah ada
+        cbf = index.subset(rows, selected_papers)
+    else:
+        cbf = ContentBasedFilter()
+        cbf.fit(selected_papers)
     
     # Preprocessing details
     preprocessing_results = []
@@ -653,18 +1286,22 @@ def get_cbf_calculation_details(selected_papers, query):
     }
     
     if cbf.vectorizer and cbf.tfidf_matrix is not None:
-        feature_names = cbf.vectorizer.get_feature_names_out()
-        tfidf_data['total_terms'] = len(feature_names)
+        feature_names = cbf.get_feature_names()
+        
+        # Rata-rata TF-IDF per term dari jumlah kolom sparse, df dari getnnz
+        avg_scores = np.asarray(cbf.tfidf_matrix.sum(axis=0)).ravel() / cbf.tfidf_matrix.shape[0]
+        doc_freq = cbf.tfidf_matrix.getnnz(axis=0)
+        top_indices = top_k_indices(avg_scores, 30)
         
-        # Get top terms by average TF-IDF score
-        avg_scores = np.mean(cbf.tfidf_matrix.toarray(), axis=0)
-        top_indices = np.argsort(avg_scores)[::-1][:30]
+        # Mode hashing tidak menyimpan nama term: tampilkan nomor kolom hash
+        has_names = len(feature_names) > 0
+        tfidf_data['total_terms'] = len(feature_names) if has_names else int(np.count_nonzero(doc_freq))
         
         for idx in top_indices:
             tfidf_data['top_terms'].append({
-                'term': feature_names[idx],
+                'term': str(feature_names[idx]) if has_names else f"#{idx}",
                 'score': float(avg_scores[idx]),
-                'df': int(np.sum(cbf.tfidf_matrix.toarray()[:, idx] > 0))
+                'df': int(doc_freq[idx])
             })
     
     # Calculate similarity to query
@@ -673,7 +1310,7 @@ def get_cbf_calculation_details(selected_papers, query):
         query_preprocessed = cbf.preprocess_text(query)
         try:
             query_vector = cbf.vectorizer.transform([query_preprocessed])
-            similarities = cosine_similarity(query_vector, cbf.tfidf_matrix)[0]
+            similarities = dot_scores(query_vector, cbf.tfidf_matrix)
             
             for i, paper in enumerate(selected_papers):
                 sim = similarities[i] if i < len(similarities) else 0
@@ -700,8 +1337,15 @@ def get_cbf_calculation_details(selected_papers, query):
     
     # Similarity matrix between papers
     similarity_matrix = []
-    if cbf.tfidf_matrix is not None and len(selected_papers) > 1:
-        sim_matrix = cosine_similarity(cbf.tfidf_matrix)
+    sim_matrix = None
+    if rows and len(selected_papers) > 1:
+        # Dari graph similar papers index jika sudah ada (tanpa matriks N x N)
+        sim_matrix = index.pair_scores(rows[:10])
+    elif cbf.tfidf_matrix is not None and len(selected_papers) > 1:
+        # Hanya blok 10 x 10 yang ditampilkan; vektor sudah ter-normalisasi L2
+        block = cbf.tfidf_matrix[:10]
+        sim_matrix = (block @ block.T).toarray()
+    if sim_matrix is not None:
         for i in range(min(len(selected_papers), 10)):
             row = []
             for j in range(min(len(selected_papers), 10)):
@@ -739,6 +1383,7 @@ def get_cbf_calculation_details(selected_papers, query):
     }
     
     # Analisis setiap paper (legacy support)
+    top_terms_per_paper = cbf.get_tfidf_terms_all(8)
     for i, paper in enumerate(selected_papers):
         paper_analysis = {
             'index': i + 1,
@@ -749,8 +1394,8 @@ def get_cbf_calculation_details(selected_papers, query):
         }
         
         # Get top TF-IDF terms
-        if cbf.tfidf_matrix is not None and i < len(cbf.papers):
-            terms = cbf.get_tfidf_terms(i, 8)
+        if i < len(top_terms_per_paper):
+            terms = top_terms_per_paper[i]
             paper_analysis['top_tfidf_terms'] = [
                 {'term': t, 'weight': round(w, 4)} for t, w in terms
             ]
@@ -768,7 +1413,7 @@ def get_cbf_calculation_details(selected_papers, query):
         'average_relevance': round(sum(scores) / len(scores), 2) if scores else 0,
         'max_relevance': round(max(scores), 2) if scores else 0,
         'min_relevance': round(min(scores), 2) if scores else 0,
-        'total_unique_terms': len(cbf.vectorizer.get_feature_names_out()) if cbf.vectorizer else 0
+        'total_unique_terms': tfidf_data['total_terms']
     }
     
     return calculation_details
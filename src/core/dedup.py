@@ -0,0 +1,276 @@
+"""
+Near-Duplicate Detection
+Deteksi paper yang sama dari beberapa source (Semantic Scholar, Mendeley,
+Google Scholar) sebelum fit TF-IDF, lalu gabungkan record-nya.
+
+1. Judul dinormalisasi (lowercase, tanpa aksen dan tanda baca) lalu dipecah
+   menjadi shingle 3 karakter
+2. MinHash: n_perm fungsi hash multiply-shift ((a*x + b) >> 32 pada 64 bit),
+   nilai minimum per shingle set
+3. LSH banding: signature dibagi menjadi bands; paper dengan band yang sama
+   menjadi kandidat (waktu hampir linear, tanpa membandingkan semua pasangan)
+4. Kandidat diverifikasi dengan Jaccard shingle persis (>= threshold) dan
+   tahun terbit yang berdekatan
+5. DOI yang sama (setelah normalisasi) selalu dianggap duplikat
+
+Record duplikat digabung: field kosong diisi dari source lain, abstrak
+terpanjang dipakai, sitasi terbesar dipakai, dan semua source dicatat.
+"""
+
+import re
+import unicodedata
+import zlib
+
+import numpy as np
+
+# Nilai placeholder dari scraper (dianggap kosong saat merge)
+PLACEHOLDERS = {'', 'no title', 'unknown authors', 'tidak ada abstrak tersedia', 'n/a', 'none'}
+
+_ESTIMATE_MARGIN = 0.25
+_DOI_PREFIX = re.compile(r'^(https?://(dx\.)?doi\.org/|doi:\s*)', re.IGNORECASE)
+
+
+def normalize_title(title):
+    """Judul untuk pencocokan: tanpa aksen, tanda baca dan spasi ganda"""
+    text = unicodedata.normalize('NFKD', str(title or '')).encode('ascii', 'ignore').decode('ascii')
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', text.lower()).split())
+
+
+def normalize_doi(doi):
+    """DOI lowercase tanpa prefix URL / 'doi:'"""
+    return _DOI_PREFIX.sub('', str(doi or '').strip()).lower()
+
+
+def is_placeholder(value):
+    return value is None or str(value).strip().lower() in PLACEHOLDERS
+
+
+def _shingles(text, size=3):
+    """Shingle karakter (judul pendek dipad spasi sampai size)"""
+    text = text.ljust(size)
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def _shingle_codes(titles, size=3):
+    """
+    Shingle semua judul sebagai integer (byte ASCII digabung, tanpa hash):
+    judul ter-normalisasi hanya berisi ASCII sehingga shingle <= 4 karakter
+    muat di 32 bit dan setiap shingle punya kode unik.
+
+    Returns:
+        (codes, lengths) - kode shingle berurutan per judul dan jumlahnya
+    """
+    texts = [title.ljust(size) for title in titles]
+    lengths = np.array([len(text) - size + 1 for text in texts], dtype=np.int64)
+    buffer = np.frombuffer('\n'.join(texts).encode('ascii'), dtype=np.uint8).astype(np.uint64)
+
+    n_positions = len(buffer) - size + 1
+    codes = np.zeros(n_positions, dtype=np.uint64)
+    for j in range(size):
+        codes = (codes << np.uint64(8)) | buffer[j:j + n_positions]
+
+    # Posisi awal setiap judul di buffer (+1 untuk separator)
+    starts = np.concatenate([[0], np.cumsum([len(text) + 1 for text in texts])[:-1]])
+    offsets = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    positions = np.repeat(starts - offsets, lengths) + np.arange(int(lengths.sum()))
+    return codes[positions], lengths
+
+
+def _year(paper):
+    match = re.search(r'\d{4}', str(paper.get('year', '') or ''))
+    return int(match.group()) if match else None
+
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            # Root = index terkecil, sehingga urutan paper pertama dipertahankan
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+class MinHashDeduplicator:
+    """
+    MinHash + LSH untuk judul paper
+
+    Args:
+        threshold: Jaccard minimum shingle judul untuk dianggap duplikat
+        n_perm: Jumlah fungsi hash MinHash
+        bands: Jumlah band LSH (n_perm harus habis dibagi bands)
+        shingle_size: Panjang shingle karakter (1-4)
+        max_year_gap: Selisih tahun maksimum (jika keduanya punya tahun)
+    """
+
+    def __init__(self, threshold=0.8, n_perm=64, bands=16, shingle_size=3, max_year_gap=1,
+                 block_size=1024, seed=1):
+        if n_perm % bands:
+            raise ValueError('n_perm must be divisible by bands')
+        if not 1 <= shingle_size <= 4:
+            raise ValueError('shingle_size must be between 1 and 4')
+        self.threshold = threshold
+        self.n_perm = n_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.max_year_gap = max_year_gap
+        self.block_size = block_size
+        rng = np.random.default_rng(seed)
+        # Multiply-shift: a ganjil, overflow uint64 disengaja (modulo 2^64)
+        self._a = rng.integers(1, 2 ** 63, size=(n_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=(n_perm, 1), dtype=np.uint64)
+        self._band_weights = rng.integers(1, 2 ** 63, size=n_perm // bands, dtype=np.uint64) | np.uint64(1)
+
+    def signatures(self, titles):
+        """
+        Signature MinHash (n_docs x n_perm) untuk judul ter-normalisasi
+        """
+        codes, lengths = _shingle_codes(titles, self.shingle_size)
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        signatures = np.empty((len(titles), self.n_perm), dtype=np.uint64)
+        for start in range(0, len(titles), self.block_size):
+            stop = min(start + self.block_size, len(titles))
+            block = codes[offsets[start]:offsets[stop]]
+            # (n_perm x shingle blok), lalu minimum per segmen judul
+            values = (self._a * block + self._b) >> np.uint64(32)
+            signatures[start:stop] = np.minimum.reduceat(
+                values, offsets[start:stop] - offsets[start], axis=1
+            ).T
+        return signatures
+
+    def candidate_pairs(self, signatures):
+        """
+        Pasangan kandidat dari LSH banding: setiap anggota bucket dipasangkan
+        dengan anggota pertama bucket (linear terhadap jumlah paper)
+
+        Returns:
+            numpy array (n_pairs x 2) pasangan unik index baris signatures
+        """
+        rows = self.n_perm // self.bands
+        pairs = []
+        for band in range(self.bands):
+            # Satu kunci 64-bit per band (tabrakan hanya menambah kandidat)
+            bucket = signatures[:, band * rows:(band + 1) * rows] @ self._band_weights
+            order = np.argsort(bucket, kind='stable')
+            sorted_buckets = bucket[order]
+            starts = np.flatnonzero(np.r_[True, sorted_buckets[1:] != sorted_buckets[:-1]])
+            first = np.repeat(order[starts], np.diff(np.r_[starts, len(order)]))
+            mask = first != order
+            pairs.append(np.stack([first[mask], order[mask]], axis=1))
+        return np.unique(np.concatenate(pairs), axis=0)
+
+    def groups(self, papers):
+        """
+        Kelompokkan papers duplikat
+
+        Returns:
+            List of list index paper (urut kemunculan pertama)
+        """
+        n_docs = len(papers)
+        union = _UnionFind(n_docs)
+
+        # DOI sama = paper sama
+        seen_doi = {}
+        for i, paper in enumerate(papers):
+            doi = normalize_doi(paper.get('doi'))
+            if doi:
+                if doi in seen_doi:
+                    union.union(seen_doi[doi], i)
+                else:
+                    seen_doi[doi] = i
+
+        # Judul placeholder / kosong tidak dicocokkan lewat judul
+        titles = [normalize_title(paper.get('title')) for paper in papers]
+        titled = [i for i, title in enumerate(titles) if not is_placeholder(title)]
+        years = [_year(paper) for paper in papers]
+
+        if len(titled) > 1:
+            signatures = self.signatures([titles[i] for i in titled])
+            pairs = self.candidate_pairs(signatures)
+            # Estimasi Jaccard dari signature menyaring kandidat sebelum
+            # verifikasi persis (margin jauh di atas galat estimasi MinHash)
+            estimate = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+            pairs = pairs[estimate >= self.threshold - _ESTIMATE_MARGIN]
+
+            shingle_sets = {}
+            for a, b in pairs.tolist():
+                a, b = titled[a], titled[b]
+                if years[a] is not None and years[b] is not None and abs(years[a] - years[b]) > self.max_year_gap:
+                    continue
+                # Verifikasi Jaccard persis hanya untuk kandidat
+                for i in (a, b):
+                    if i not in shingle_sets:
+                        shingle_sets[i] = _shingles(titles[i], self.shingle_size)
+                sa, sb = shingle_sets[a], shingle_sets[b]
+                if len(sa & sb) >= self.threshold * len(sa | sb):
+                    union.union(a, b)
+
+        groups = {}
+        for i in range(n_docs):
+            groups.setdefault(union.find(i), []).append(i)
+        return sorted(groups.values(), key=lambda g: g[0])
+
+
+def merge_papers(records):
+    """
+    Gabungkan record duplikat menjadi satu paper
+
+    Args:
+        records: List of paper dictionaries (record pertama = dasar)
+
+    Returns:
+        Paper dictionary hasil merge
+    """
+    merged = dict(records[0])
+    if len(records) == 1:
+        return merged
+
+    for record in records[1:]:
+        for field, value in record.items():
+            if is_placeholder(merged.get(field)) and not is_placeholder(value):
+                merged[field] = value
+
+    abstracts = [r.get('abstract') for r in records if not is_placeholder(r.get('abstract'))]
+    if abstracts:
+        merged['abstract'] = max(abstracts, key=len)
+
+    for field in ('citations', 'readers'):
+        counts = [int(r[field]) for r in records if str(r.get(field, '')).isdigit()]
+        if counts:
+            merged[field] = str(max(counts))
+
+    sources = []
+    for record in records:
+        for source in record.get('sources') or [record.get('source')]:
+            if source and source not in sources:
+                sources.append(source)
+    if sources:
+        merged['source'] = ' + '.join(sources)
+        merged['sources'] = sources
+    return merged
+
+
+def deduplicate_papers(papers, threshold=0.8, **params):
+    """
+    Hapus paper duplikat (judul mirip atau DOI sama) dan gabungkan record-nya.
+    Urutan mengikuti kemunculan pertama setiap paper.
+
+    Args:
+        papers: List of paper dictionaries dari satu atau beberapa source
+        threshold: Jaccard minimum shingle judul
+        **params: Parameter tambahan MinHashDeduplicator
+
+    Returns:
+        List of paper dictionaries tanpa duplikat
+    """
+    if len(papers) < 2:
+        return list(papers)
+    groups = MinHashDeduplicator(threshold=threshold, **params).groups(papers)
+    return [merge_papers([papers[i] for i in group]) for group in groups]
@@ -0,0 +1,360 @@
+"""
+Incremental Index Updates
+Tambah / hapus papers pada ContentBasedFilter (mode exact) tanpa fit ulang.
+
+State dibuat saat update pertama (satu pass analyzer atas teks yang ada):
+    tf       - term frequency (sublinear_tf) per kolom vocabulary, struktur
+               CSR sama dengan matriks TF-IDF
+    df       - document frequency per kolom vocabulary
+    term_df  - document frequency semua term yang muncul di corpus, termasuk
+               term yang dipangkas max_features / max_df saat fit
+    n_docs   - jumlah dokumen corpus
+
+Aturan update:
+- Term yang belum pernah muncul di corpus ditambahkan sebagai kolom baru di
+  akhir vocabulary (paper lama pasti tidak mengandungnya). Term yang dulu
+  dipangkas tetap di luar vocabulary sampai fit penuh berikutnya.
+- Baris baru ditulis ke buffer CSR yang tumbuh (kapasitas digandakan), dengan
+  IDF yang sedang dipakai ("served"); df dan IDF sebenarnya selalu diperbarui.
+- Reweighting lazy: drift = ||idf_true - idf_served|| / ||idf_served||.
+  Jika drift > idf_drift_threshold, seluruh matriks dinormalisasi ulang
+  dengan IDF baru (default di thread background), lalu ditukar.
+
+Setiap perubahan menerbitkan satu IndexState baru (vectorizer, matriks,
+papers, teks, versi) dengan satu assignment cbf.state. Reader yang mengambil
+state / snapshot sekali melihat satu versi yang utuh, tidak pernah matriks
+baru dengan papers lama. Buffer CSR hanya ditambah di luar baris yang sudah
+terbit, atau diganti dengan array baru (remove / reweight), sehingga matriks
+state lama tidak berubah. Inverted index / ANN index (dicocokkan dengan
+identitas matriks) dibangun ulang saat dipakai.
+"""
+
+import threading
+from collections import Counter
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.base import clone
+from sklearn.preprocessing import normalize
+
+
+def _grow(buffer, size):
+    """Buffer dengan kapasitas >= size (kapasitas digandakan, isi disalin)"""
+    if len(buffer) >= size:
+        return buffer
+    grown = np.empty(max(size, 2 * len(buffer)), dtype=buffer.dtype)
+    grown[:len(buffer)] = buffer
+    return grown
+
+
+class IncrementalTfidf:
+    """
+    State df / tf untuk ContentBasedFilter.add_papers dan remove_papers
+    """
+
+    # Percobaan reweight di background sebelum dilakukan di bawah lock
+    MAX_REWEIGHT_RETRIES = 3
+
+    def __init__(self, cbf):
+        if cbf.vectorizer_mode != 'exact':
+            raise ValueError("Incremental updates require vectorizer_mode='exact'")
+        self.cbf = cbf
+        vectorizer = cbf.vectorizer
+        self.analyze = vectorizer.build_analyzer()
+        self.sublinear_tf = vectorizer.sublinear_tf
+        self.smooth_idf = vectorizer.smooth_idf
+
+        self.vocabulary = dict(vectorizer.vocabulary_)
+        self.terms = [None] * len(self.vocabulary)
+        for term, column in self.vocabulary.items():
+            self.terms[column] = term
+        self.served_idf = np.array(vectorizer.idf_, dtype=np.float64)
+        self.df = np.zeros(len(self.terms), dtype=np.int64)
+        self.term_df = Counter()
+        self.n_docs = 0
+
+        # Buffer CSR: tf dan TF-IDF berbagi indices / indptr
+        self.n_rows = 0
+        self.nnz = 0
+        self.indptr = np.zeros(1, dtype=np.int32)
+        self.indices = np.empty(0, dtype=np.int32)
+        self.tf_data = np.empty(0, dtype=np.float64)
+        self.data = np.empty(0, dtype=np.float64)
+
+        self.version = 0
+        self.reweights = 0
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self._append_rows([self._count(text) for text in cbf.paper_texts])
+        # Nilai TF-IDF hasil fit dipertahankan (hanya urutan kolom per baris
+        # yang disamakan dengan buffer); dihitung ulang jika struktur berbeda
+        fitted = sp.csr_matrix(cbf.tfidf_matrix).sorted_indices()
+        if fitted.shape == (self.n_rows, len(self.terms)) and fitted.nnz == self.nnz \
+                and np.array_equal(fitted.indices, self.indices[:self.nnz]) \
+                and np.array_equal(fitted.indptr, self.indptr[:self.n_rows + 1]):
+            self.data[:self.nnz] = fitted.data
+        self._publish(papers=list(cbf.papers), texts=list(cbf.paper_texts))
+
+    def _count(self, text, extend=False):
+        """
+        Term count satu dokumen dan update term_df.
+        extend=True: term yang belum pernah muncul menjadi kolom baru.
+        """
+        counts = Counter(self.analyze(text))
+        if extend:
+            for term in counts:
+                if term not in self.vocabulary and not self.term_df[term]:
+                    self.vocabulary[term] = len(self.terms)
+                    self.terms.append(term)
+        self.term_df.update(counts.keys())
+        return counts
+
+    def _idf(self, df, n_docs):
+        """IDF dengan rumus TfidfTransformer"""
+        df = df.astype(np.float64)
+        if self.smooth_idf:
+            return np.log((1 + n_docs) / (1 + df)) + 1
+        return np.log(n_docs / np.maximum(df, 1)) + 1
+
+    def true_idf(self):
+        """IDF dari df dan n_docs saat ini"""
+        return self._idf(self.df, self.n_docs)
+
+    def drift(self):
+        """Perubahan relatif IDF sebenarnya terhadap IDF yang dipakai matriks"""
+        norm = np.linalg.norm(self.served_idf)
+        if not norm:
+            return 0.0
+        return float(np.linalg.norm(self.true_idf() - self.served_idf) / norm)
+
+    def _append_rows(self, rows):
+        """
+        Tulis baris baru (tf + TF-IDF dengan IDF served) ke buffer CSR
+
+        Args:
+            rows: List of Counter term -> count
+        """
+        n_terms = len(self.terms)
+        n_old_terms = len(self.df)
+        lengths = []
+        columns = []
+        counts = []
+        for row in rows:
+            entries = sorted((self.vocabulary[t], c) for t, c in row.items() if t in self.vocabulary)
+            lengths.append(len(entries))
+            for column, count in entries:
+                columns.append(column)
+                counts.append(count)
+
+        columns = np.asarray(columns, dtype=np.int32)
+        tf = np.asarray(counts, dtype=np.float64)
+        if self.sublinear_tf:
+            np.log(tf, out=tf)
+            tf += 1
+
+        self.df = np.concatenate([self.df, np.zeros(n_terms - n_old_terms, dtype=np.int64)])
+        self.df += np.bincount(columns, minlength=n_terms)
+        self.n_docs += len(rows)
+        if n_terms > n_old_terms:
+            # Kolom baru langsung memakai IDF sebenarnya
+            self.served_idf = np.concatenate([self.served_idf, self.true_idf()[n_old_terms:]])
+
+        indptr = np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+        block = sp.csr_matrix((tf * self.served_idf[columns], columns, indptr), shape=(len(rows), n_terms))
+        block = normalize(block, copy=False)
+
+        size = self.nnz + len(columns)
+        self.indices = _grow(self.indices, size)
+        self.tf_data = _grow(self.tf_data, size)
+        self.data = _grow(self.data, size)
+        self.indptr = _grow(self.indptr, self.n_rows + len(rows) + 1)
+        self.indices[self.nnz:size] = columns
+        self.tf_data[self.nnz:size] = tf
+        self.data[self.nnz:size] = block.data
+        self.indptr[self.n_rows + 1:self.n_rows + len(rows) + 1] = indptr[1:] + self.nnz
+        self.n_rows += len(rows)
+        self.nnz = size
+
+    def _matrix(self):
+        """Matriks TF-IDF CSR di atas buffer (tanpa salinan)"""
+        return sp.csr_matrix(
+            (self.data[:self.nnz], self.indices[:self.nnz], self.indptr[:self.n_rows + 1]),
+            shape=(self.n_rows, len(self.terms)),
+            copy=False
+        )
+
+    def _publish(self, papers=None, texts=None, vocabulary_changed=True):
+        """
+        Terbitkan IndexState baru ke ContentBasedFilter dalam satu assignment
+        (dipanggil dengan lock)
+        """
+        cbf = self.cbf
+        state = cbf.state
+        vectorizer = state.vectorizer
+        if vocabulary_changed:
+            vectorizer = clone(vectorizer)
+            vectorizer.vocabulary_ = dict(self.vocabulary)
+            vectorizer.idf_ = self.served_idf.copy()
+        cbf.state = state._replace(
+            vectorizer=vectorizer,
+            tfidf_matrix=self._matrix(),
+            papers=state.papers if papers is None else papers,
+            paper_texts=state.paper_texts if texts is None else texts,
+            version=state.version + 1
+        )
+        self.version += 1
+
+    def add(self, papers, texts):
+        """
+        Tambahkan papers (teks sudah di-preprocess)
+
+        Returns:
+            List index baris untuk papers baru
+        """
+        with self._lock:
+            n_terms = len(self.terms)
+            start = self.n_rows
+            self._append_rows([self._count(text, extend=True) for text in texts])
+            new_terms = self.terms[n_terms:]
+            if new_terms:
+                self.cbf.engine.warm(new_terms)
+            self._publish(
+                papers=list(self.cbf.papers) + list(papers),
+                texts=list(self.cbf.paper_texts) + list(texts),
+                vocabulary_changed=bool(new_terms)
+            )
+        self.maybe_reweight()
+        return list(range(start, start + len(papers)))
+
+    def remove(self, rows):
+        """
+        Hapus papers berdasarkan index baris; baris sesudahnya bergeser
+
+        Returns:
+            Jumlah papers yang dihapus
+        """
+        with self._lock:
+            keep = np.ones(self.n_rows, dtype=bool)
+            rows = [r for r in set(int(r) for r in rows) if 0 <= r < self.n_rows]
+            if not rows:
+                return 0
+            keep[rows] = False
+
+            texts = self.cbf.paper_texts
+            for row in rows:
+                terms = set(self.analyze(texts[row]))
+                self.term_df.subtract(terms)
+                for term in terms:
+                    if self.term_df[term] <= 0:
+                        del self.term_df[term]
+
+            lengths = np.diff(self.indptr[:self.n_rows + 1])
+            entries = np.repeat(keep, lengths)
+            indices = self.indices[:self.nnz]
+            self.df -= np.bincount(indices[~entries], minlength=len(self.terms))
+            self.n_docs -= len(rows)
+
+            # Buffer baru (bukan in-place): matriks lama tetap utuh untuk reader
+            self.indices = indices[entries]
+            self.tf_data = self.tf_data[:self.nnz][entries]
+            self.data = self.data[:self.nnz][entries]
+            self.indptr = np.concatenate([[0], np.cumsum(lengths[keep])]).astype(np.int32)
+            self.n_rows = int(keep.sum())
+            self.nnz = len(self.indices)
+
+            kept = np.flatnonzero(keep).tolist()
+            self._publish(
+                papers=[self.cbf.papers[i] for i in kept],
+                texts=[texts[i] for i in kept],
+                vocabulary_changed=False
+            )
+        self.maybe_reweight()
+        return len(rows)
+
+    def _reweighted_data(self, tf_data, indices, indptr, idf, shape):
+        """TF-IDF ter-normalisasi L2 dari tf dan IDF baru"""
+        matrix = sp.csr_matrix((tf_data * idf[indices], indices, indptr), shape=shape)
+        return normalize(matrix, copy=False).data
+
+    def _install(self, data, idf):
+        """Pasang hasil reweight (dipanggil dengan lock)"""
+        self.data = data
+        self.served_idf = idf
+        self.reweights += 1
+        self._publish()
+
+    def reweight(self):
+        """
+        Normalisasi ulang seluruh matriks dengan IDF sebenarnya.
+        Dihitung di luar lock; jika ada update di tengah jalan, diulang
+        (setelah MAX_REWEIGHT_RETRIES dihitung di bawah lock).
+        """
+        for _ in range(self.MAX_REWEIGHT_RETRIES):
+            with self._lock:
+                version = self.version
+                nnz, n_rows = self.nnz, self.n_rows
+                tf_data = self.tf_data[:nnz].copy()
+                indices = self.indices[:nnz].copy()
+                indptr = self.indptr[:n_rows + 1].copy()
+                idf = self.true_idf()
+                shape = (n_rows, len(self.terms))
+            data = self._reweighted_data(tf_data, indices, indptr, idf, shape)
+            with self._lock:
+                if self.version == version:
+                    self._install(data, idf)
+                    return
+
+        with self._lock:
+            idf = self.true_idf()
+            data = self._reweighted_data(self.tf_data[:self.nnz], self.indices[:self.nnz],
+                                         self.indptr[:self.n_rows + 1], idf, (self.n_rows, len(self.terms)))
+            self._install(data, idf)
+
+    def maybe_reweight(self):
+        """
+        Reweight jika drift melewati cbf.idf_drift_threshold
+        (background jika cbf.background_reweight)
+
+        Returns:
+            True jika reweight dijalankan / dijadwalkan
+        """
+        threshold = self.cbf.idf_drift_threshold
+        if threshold is None or self.drift() <= threshold:
+            return False
+        if not self.cbf.background_reweight:
+            self.reweight()
+            return True
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            self._thread = threading.Thread(target=self._background_reweight, daemon=True)
+            self._thread.start()
+        return True
+
+    def _background_reweight(self):
+        try:
+            self.reweight()
+            print(f"[DEBUG] Background IDF reweight done: {self.n_rows} papers")
+        except Exception as e:
+            print(f"[ERROR] Background IDF reweight failed: {e}")
+
+    def wait(self, timeout=None):
+        """Tunggu reweight background yang sedang berjalan"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self):
+        """Statistik state incremental"""
+        thread = self._thread
+        return {
+            'papers': self.n_rows,
+            'vocabulary': len(self.terms),
+            'known_terms': len(self.term_df),
+            'nnz': self.nnz,
+            'idf_drift': round(self.drift(), 6),
+            'reweights': self.reweights,
+            'reweight_pending': thread is not None and thread.is_alive(),
+            'version': self.version
+        }
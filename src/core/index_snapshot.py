@@ -0,0 +1,283 @@
+"""
+Index Snapshot
+Simpan ContentBasedFilter yang sudah di-fit ke disk dan muat kembali tanpa
+preprocessing maupun fit ulang.
+
+Isi direktori snapshot:
+    metadata.json          - format, versi, shape, dtype, parameter vectorizer
+    data.npy               - nilai TF-IDF (float32 default)
+    indices.npy            - index kolom CSR
+    indptr.npy             - pointer baris CSR
+    terms.json + idf.npy   - vocabulary (urut kolom) dan IDF (mode exact)
+    df.npy                 - document frequency per kolom hash (mode hashing)
+    lsa_*.npy              - komponen SVD dan embedding papers (LSAFilter)
+    papers.jsonl           - metadata paper, satu JSON per baris
+    texts.jsonl            - teks ter-preprocess per paper
+    *.offsets.npy          - offset byte setiap baris file .jsonl
+
+Array dimuat dengan np.load(mmap_mode='r'): halaman file dibagi antar proses
+lewat page cache OS, dan restore hanya membuka file (O(1) terhadap jumlah
+paper). Papers dan teks dibaca per baris saat diakses (JsonLinesView).
+
+Setiap save menulis direktori baru ("<path>.<id>"), lalu path - sebuah
+symlink ke direktori tersebut - diganti secara atomik. Loader baru selalu
+melihat snapshot lengkap (lama atau baru), dan filter yang sudah dimuat
+tetap membaca file lama: semua file dibuka / di-mmap saat load, sehingga
+inode-nya tetap valid setelah direktori lama dihapus. Tanpa dukungan
+symlink, direktori lama dipindah dulu lalu direktori baru di-rename ke path.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import time
+import uuid
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .content_based_filter import ContentBasedFilter
+from .lsa import LSAFilter
+from .query_cache import json_value
+from .streaming_vectorizer import StreamingTfidfVectorizer
+
+SNAPSHOT_FORMAT = 'cbf-snapshot'
+SNAPSHOT_VERSION = 1
+
+# Parameter TfidfVectorizer yang disimpan (stop_words diambil dari analyzer)
+VECTORIZER_PARAMS = ('max_features', 'ngram_range', 'min_df', 'max_df', 'sublinear_tf',
+                     'token_pattern', 'norm', 'use_idf', 'smooth_idf')
+
+
+def _write_jsonl(path, records):
+    """
+    Tulis records sebagai JSON lines + offset byte tiap baris. Tipe numpy
+    dikonversi seperti query cache (json_value); tipe lain yang tidak
+    dikenal menggagalkan save (bukan disimpan sebagai str()).
+
+    Raises:
+        TypeError: Record berisi nilai yang tidak bisa diserialisasi
+    """
+    offsets = [0]
+    with open(path, 'wb') as f:
+        for record in records:
+            line = json.dumps(record, ensure_ascii=False, default=json_value).encode('utf-8') + b'\n'
+            f.write(line)
+            offsets.append(offsets[-1] + len(line))
+    np.save(f"{path[:-len('.jsonl')]}.offsets.npy", np.asarray(offsets, dtype=np.int64))
+
+
+class JsonLinesView:
+    """
+    Sequence read-only di atas file JSON lines; record di-parse saat diakses.
+    File dan offset-nya di-mmap saat dibuat, sehingga view tetap membaca
+    versi yang sama walaupun snapshot ditimpa / dihapus sesudahnya.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.offsets = np.load(f"{path[:-len('.jsonl')]}.offsets.npy", mmap_mode='r')
+        with open(path, 'rb') as f:
+            self._buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] else b''
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError('record index out of range')
+        return json.loads(self._buffer[int(self.offsets[i]):int(self.offsets[i + 1])])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def _publish(version_dir, path):
+    """
+    Jadikan version_dir snapshot di path, lalu hapus versi sebelumnya.
+    path = symlink relatif ke version_dir, diganti atomik (os.replace).
+    Tanpa dukungan symlink, atau jika path masih direktori biasa, direktori
+    lama dipindah ke samping dulu (path sesaat tidak ada).
+    """
+    link = f"{version_dir}.link"
+    try:
+        os.symlink(os.path.basename(version_dir), link, target_is_directory=True)
+    except (OSError, NotImplementedError):
+        link = None
+
+    previous = None
+    if os.path.islink(path):
+        previous = os.path.realpath(path)
+    elif os.path.exists(path):
+        previous = f"{version_dir}.old"
+        os.rename(path, previous)
+
+    if link is not None:
+        os.replace(link, path)
+    else:
+        os.rename(version_dir, path)
+    if previous is not None:
+        # Filter yang sudah dimuat memegang file lama lewat mmap / file terbuka
+        shutil.rmtree(previous, ignore_errors=True)
+
+
+def save_snapshot(cbf, path, dtype=np.float32):
+    """
+    Simpan ContentBasedFilter yang sudah di-fit ke direktori path.
+    Ditulis ke direktori versi baru lalu dipublikasikan atomik (lihat
+    _publish): loader lain tidak pernah melihat snapshot setengah jadi, dan
+    filter yang sudah dimuat dari snapshot lama tetap bisa dipakai.
+
+    Args:
+        cbf: ContentBasedFilter yang sudah di-fit
+        path: Direktori snapshot (ditimpa jika sudah ada)
+        dtype: Tipe nilai TF-IDF yang disimpan (default float32)
+
+    Returns:
+        Dictionary metadata snapshot
+    """
+    if cbf.tfidf_matrix is None or cbf.vectorizer is None:
+        raise ValueError('ContentBasedFilter is not fitted')
+
+    matrix = sp.csr_matrix(cbf.tfidf_matrix)
+    if not matrix.has_sorted_indices:
+        matrix = matrix.sorted_indices()
+    path = path.rstrip(os.sep)
+    tmp_path = f"{path}.{uuid.uuid4().hex[:12]}"
+    os.makedirs(tmp_path)
+
+    metadata = {
+        'format': SNAPSHOT_FORMAT,
+        'version': SNAPSHOT_VERSION,
+        'created_at': time.time(),
+        'vectorizer_mode': cbf.vectorizer_mode,
+        'shape': list(matrix.shape),
+        'nnz': int(matrix.nnz),
+        'dtype': np.dtype(dtype).name
+    }
+    np.save(os.path.join(tmp_path, 'data.npy'), matrix.data.astype(dtype))
+    np.save(os.path.join(tmp_path, 'indices.npy'), matrix.indices)
+    np.save(os.path.join(tmp_path, 'indptr.npy'), matrix.indptr)
+
+    vectorizer = cbf.vectorizer
+    if isinstance(vectorizer, StreamingTfidfVectorizer):
+        metadata['vectorizer'] = {'n_features': vectorizer.n_features, 'n_docs': vectorizer.n_docs,
+                                  'sublinear_tf': vectorizer.sublinear_tf}
+        np.save(os.path.join(tmp_path, 'df.npy'), vectorizer.df)
+    else:
+        params = vectorizer.get_params()
+        metadata['vectorizer'] = {name: params[name] for name in VECTORIZER_PARAMS}
+        terms = [None] * len(vectorizer.vocabulary_)
+        for term, column in vectorizer.vocabulary_.items():
+            terms[column] = term
+        with open(os.path.join(tmp_path, 'terms.json'), 'w', encoding='utf-8') as f:
+            json.dump(terms, f, ensure_ascii=False)
+        np.save(os.path.join(tmp_path, 'idf.npy'), vectorizer.idf_)
+
+    if isinstance(cbf, LSAFilter) and cbf.embeddings is not None:
+        metadata['lsa'] = {'n_components': cbf.components.shape[0], 'n_iter': cbf.n_iter,
+                           'random_state': cbf.random_state,
+                           'explained_variance': cbf.explained_variance}
+        np.save(os.path.join(tmp_path, 'lsa_components.npy'), cbf.components)
+        np.save(os.path.join(tmp_path, 'lsa_embeddings.npy'), cbf.embeddings)
+
+    try:
+        _write_jsonl(os.path.join(tmp_path, 'papers.jsonl'), cbf.papers)
+        _write_jsonl(os.path.join(tmp_path, 'texts.jsonl'), cbf.paper_texts)
+        with open(os.path.join(tmp_path, 'metadata.json'), 'w', encoding='utf-8') as f:
+            json.dump(metadata, f, indent=2)
+    except Exception:
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        raise
+
+    _publish(tmp_path, path)
+    return metadata
+
+
+def load_snapshot(path, mmap_mode='r', **params):
+    """
+    Muat ContentBasedFilter dari snapshot (tanpa preprocessing / fit)
+
+    Args:
+        path: Direktori snapshot
+        mmap_mode: Mode np.load untuk array CSR ('r' = memory-mapped
+            read-only, None = baca ke memori)
+        **params: Parameter tambahan untuk ContentBasedFilter
+            (misalnya search_backend)
+
+    Returns:
+        ContentBasedFilter (atau LSAFilter jika snapshot berisi embedding
+        LSA) yang siap dipakai untuk ranking
+    """
+    while True:
+        # Semua file dibaca dari satu versi, walaupun path diganti saat load
+        resolved = os.path.realpath(path)
+        try:
+            return _load_version(resolved, mmap_mode, dict(params))
+        except FileNotFoundError:
+            if os.path.realpath(path) == resolved:
+                raise
+
+
+def _load_version(path, mmap_mode, params):
+    with open(os.path.join(path, 'metadata.json'), 'r', encoding='utf-8') as f:
+        metadata = json.load(f)
+    if metadata.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"Not a ContentBasedFilter snapshot: {path}")
+    if metadata.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Unsupported snapshot version {metadata.get('version')} (expected {SNAPSHOT_VERSION})"
+        )
+
+    settings = metadata['vectorizer']
+    if metadata['vectorizer_mode'] == 'hashing':
+        params.setdefault('n_hash_features', settings['n_features'])
+    lsa = metadata.get('lsa')
+    if lsa is not None:
+        params.setdefault('n_components', lsa['n_components'])
+        params.setdefault('n_iter', lsa['n_iter'])
+        params.setdefault('random_state', lsa['random_state'])
+        cbf = LSAFilter(vectorizer_mode=metadata['vectorizer_mode'], **params)
+    else:
+        cbf = ContentBasedFilter(vectorizer_mode=metadata['vectorizer_mode'], **params)
+
+    def array(name):
+        return np.load(os.path.join(path, name), mmap_mode=mmap_mode)
+
+    if lsa is not None:
+        # Embedding tidak di-fit ulang: dimuat dari snapshot
+        cbf.components = np.load(os.path.join(path, 'lsa_components.npy'))
+        cbf.embeddings = array('lsa_embeddings.npy')
+        cbf.explained_variance = lsa['explained_variance']
+
+    cbf.tfidf_matrix = sp.csr_matrix(
+        (array('data.npy'), array('indices.npy'), array('indptr.npy')),
+        shape=tuple(metadata['shape']),
+        copy=False
+    )
+
+    if metadata['vectorizer_mode'] == 'hashing':
+        vectorizer = cbf._create_streaming_vectorizer()
+        vectorizer.sublinear_tf = settings['sublinear_tf']
+        # df diubah oleh partial_fit, jadi dimuat ke memori
+        vectorizer.df = np.load(os.path.join(path, 'df.npy'))
+        vectorizer.n_docs = settings['n_docs']
+    else:
+        settings = dict(settings, ngram_range=tuple(settings['ngram_range']))
+        vectorizer = TfidfVectorizer(stop_words=cbf.analyzer.stop_words_list, **settings)
+        with open(os.path.join(path, 'terms.json'), 'r', encoding='utf-8') as f:
+            vectorizer.vocabulary_ = {term: i for i, term in enumerate(json.load(f))}
+        vectorizer.idf_ = np.load(os.path.join(path, 'idf.npy'))
+        cbf.engine.warm(vectorizer.vocabulary_)
+
+    cbf.vectorizer = vectorizer
+    cbf.papers = JsonLinesView(os.path.join(path, 'papers.jsonl'))
+    cbf.paper_texts = JsonLinesView(os.path.join(path, 'texts.jsonl'))
+    return cbf
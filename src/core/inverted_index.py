@@ -0,0 +1,131 @@
+"""
+Inverted Index Query Engine
+Backend top-k untuk ContentBasedFilter yang hanya menyentuh dokumen kandidat.
+
+Untuk setiap term disimpan postings (doc id + bobot TF-IDF, dari matriks
+CSC) beserta bobot maksimumnya. Query dijawab dengan traversal MaxScore:
+
+1. Upper bound tiap term query = bobot query x bobot maksimum term
+2. Threshold awal (skor ke-k) dihitung dari postings term dengan
+   upper bound terbesar
+3. Term dengan total upper bound < threshold adalah "non-essential":
+   dokumen yang hanya muncul di term tersebut tidak mungkin masuk top-k
+4. Kandidat = gabungan postings term essential; skor kandidat dihitung
+   persis dengan baris CSR yang sama seperti ranking berbasis matriks
+
+Hasilnya identik dengan dot product penuh + top_k_indices, tetapi biayanya
+mengikuti panjang postings term query, bukan jumlah dokumen corpus.
+"""
+
+import numpy as np
+
+from .ranking import dot_scores
+
+# Margin relatif untuk perbandingan upper bound vs threshold (error floating point)
+BOUND_EPSILON = 1e-9
+
+
+class InvertedIndex:
+    """
+    Postings per term dari matriks TF-IDF (CSR) dengan bound skor maksimum
+    """
+
+    def __init__(self, matrix):
+        self.matrix = matrix.tocsr()
+        self.n_docs, self.n_terms = self.matrix.shape
+
+        csc = self.matrix.tocsc()
+        csc.sort_indices()
+        self.indptr = csc.indptr
+        self.doc_ids = csc.indices
+        self.weights = csc.data
+
+        # Bobot maksimum per term (0 untuk term tanpa postings)
+        self.max_weights = np.zeros(self.n_terms, dtype=np.float64)
+        lengths = np.diff(self.indptr)
+        non_empty = np.flatnonzero(lengths)
+        if len(non_empty):
+            self.max_weights[non_empty] = np.maximum.reduceat(self.weights, self.indptr[non_empty])
+
+    def postings(self, term):
+        """Doc ids yang mengandung term (terurut)"""
+        return self.doc_ids[self.indptr[term]:self.indptr[term + 1]]
+
+    def postings_length(self, term):
+        return int(self.indptr[term + 1] - self.indptr[term])
+
+    def _exact_scores(self, doc_ids, query_vector):
+        """Skor persis untuk kandidat (aritmetika sama dengan dot_scores penuh)"""
+        return dot_scores(query_vector, self.matrix[doc_ids])
+
+    def search(self, query_vector, k):
+        """
+        Top-k dokumen untuk query
+
+        Args:
+            query_vector: Sparse row vector query (1 x n_terms), ter-normalisasi L2
+            k: Jumlah hasil
+
+        Returns:
+            (doc_ids, scores) numpy arrays, urut skor menurun
+            (skor sama diurutkan berdasarkan doc id)
+        """
+        k = min(k, self.n_docs)
+        if k <= 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+        query_vector = query_vector.tocsr()
+        terms = query_vector.indices
+        query_weights = query_vector.data
+        mask = (query_weights > 0) & (self.max_weights[terms] > 0)
+        terms = terms[mask]
+        upper_bounds = query_weights[mask] * self.max_weights[terms]
+
+        # Urutkan term berdasarkan upper bound menurun
+        order = np.argsort(-upper_bounds, kind='stable')
+        terms = terms[order]
+        upper_bounds = upper_bounds[order]
+
+        # Threshold awal dari postings term dengan upper bound terbesar
+        threshold = 0.0
+        seed = np.empty(0, dtype=np.intp)
+        for term in terms:
+            seed = np.union1d(seed, self.postings(term))
+            if len(seed) >= k:
+                seed_scores = self._exact_scores(seed, query_vector)
+                threshold = np.partition(seed_scores, len(seed_scores) - k)[len(seed_scores) - k]
+                break
+
+        # Term non-essential: suffix dengan total upper bound < threshold
+        essential = len(terms)
+        if threshold > 0:
+            remaining = 0.0
+            limit = threshold * (1 - BOUND_EPSILON)
+            for i in range(len(terms) - 1, -1, -1):
+                if remaining + upper_bounds[i] >= limit:
+                    break
+                remaining += upper_bounds[i]
+                essential = i
+
+        # Kandidat dari term essential, skor dihitung persis
+        if essential:
+            candidates = np.unique(np.concatenate([self.postings(t) for t in terms[:essential]]))
+        else:
+            candidates = np.empty(0, dtype=np.intp)
+        scores = self._exact_scores(candidates, query_vector) if len(candidates) else np.empty(0)
+
+        if len(candidates) < k:
+            # Sisa hasil: dokumen tanpa term query (skor 0), urut doc id
+            rest = np.setdiff1d(np.arange(min(k + len(candidates), self.n_docs)), candidates, assume_unique=True)
+            candidates = np.concatenate([candidates, rest[:k - len(candidates)]])
+            scores = np.concatenate([scores, np.zeros(len(candidates) - len(scores))])
+
+        top = np.lexsort((candidates, -scores))[:k]
+        return candidates[top], scores[top]
+
+    def search_scored(self, query_vector, k):
+        """
+        Top-k sebagai list of (doc_id, score)
+        """
+        doc_ids, scores = self.search(query_vector, k)
+        return list(zip(doc_ids.tolist(), scores.tolist()))
@@ -0,0 +1,193 @@
+"""
+Latent Semantic Analysis (LSA) Ranking Module
+Alternatif ranking di ruang laten: TruncatedSVD di-fit sekali pada matriks
+TF-IDF corpus, lalu setiap paper disimpan sebagai embedding dense float32.
+
+    embedding(d) = normalize(tfidf(d) @ V_k^T)       (V_k = komponen SVD)
+    embedding(q) = normalize(tfidf(q) @ V_k^T)
+    score(q, d)  = embedding(d) . embedding(q)
+
+Term yang sering muncul bersama (misalnya sinonim dalam satu bidang) jatuh
+ke dimensi laten yang sama, sehingga paper bisa cocok dengan query walaupun
+tidak berbagi kata. Query cukup satu perkalian matriks-vektor kecil
+(n_papers x n_components), latensi tetap dan hanya memakai CPU.
+"""
+
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+from .content_based_filter import ContentBasedFilter
+from .ranking import top_k_scored
+
+
+class LSAFilter(ContentBasedFilter):
+    """
+    Ranking dengan embedding LSA (TruncatedSVD atas matriks TF-IDF)
+    """
+
+    def __init__(self, n_components=128, n_iter=5, random_state=42, **kwargs):
+        super().__init__(**kwargs)
+        self.n_components = n_components
+        self.n_iter = n_iter
+        self.random_state = random_state
+
+        self.components = None  # (n_components x n_features), float32
+        self.embeddings = None  # (n_papers x n_components), float32, L2
+        self.explained_variance = 0.0
+
+    @classmethod
+    def from_filter(cls, cbf, **params):
+        """
+        Bangun LSAFilter dari ContentBasedFilter yang sudah di-fit
+        (vectorizer dan matriks TF-IDF dipakai ulang, tanpa fit ulang)
+        """
+        lsa = cls(**params)
+        lsa.vectorizer = cbf.vectorizer
+        lsa.papers = cbf.papers
+        lsa.paper_texts = cbf.paper_texts
+        lsa.tfidf_matrix = cbf.tfidf_matrix
+        return lsa.fit_embeddings()
+
+    def fit(self, papers):
+        """Fit TF-IDF lalu SVD untuk papers"""
+        super().fit(papers)
+        return self.fit_embeddings()
+
+    def fit_embeddings(self):
+        """
+        Fit TruncatedSVD pada matriks TF-IDF dan hitung embedding papers.
+        Corpus terlalu kecil untuk SVD (< 2 dokumen / term) memakai
+        ranking TF-IDF biasa.
+        """
+        self.components = None
+        self.embeddings = None
+        if self.tfidf_matrix is None:
+            return self
+
+        n_docs, n_features = self.tfidf_matrix.shape
+        n_components = min(self.n_components, n_docs - 1, n_features - 1)
+        if n_components < 1:
+            print("[WARNING] Corpus too small for LSA, using TF-IDF scores")
+            return self
+
+        svd = TruncatedSVD(n_components=n_components, n_iter=self.n_iter,
+                           random_state=self.random_state)
+        embeddings = svd.fit_transform(self.tfidf_matrix)
+        self.components = svd.components_.astype(np.float32)
+        self.embeddings = normalize(embeddings).astype(np.float32)
+        self.explained_variance = float(svd.explained_variance_ratio_.sum())
+        print(f"[DEBUG] LSA fitted: {self.embeddings.shape}, "
+              f"explained variance {self.explained_variance:.3f}")
+        return self
+
+    def add_papers(self, papers):
+        """
+        Tambahkan papers: matriks TF-IDF diperbarui tanpa fit ulang
+        (ContentBasedFilter.add_papers), lalu komponen SVD dan embedding
+        dihitung ulang dari matriks baru (sama dengan from_filter)
+
+        Returns:
+            List index baris untuk papers baru
+        """
+        fitted = self.tfidf_matrix is not None
+        rows = super().add_papers(papers)
+        if fitted and rows:
+            self.fit_embeddings()
+        return rows
+
+    def remove_papers(self, rows):
+        """
+        Hapus papers berdasarkan index baris lalu hitung ulang embedding
+
+        Returns:
+            Jumlah papers yang dihapus
+        """
+        removed = super().remove_papers(rows)
+        if removed:
+            self.fit_embeddings()
+        return removed
+
+    def reweight(self):
+        """Normalisasi ulang matriks TF-IDF lalu hitung ulang embedding"""
+        super().reweight()
+        return self.fit_embeddings()
+
+    def embed(self, vectors):
+        """
+        Embedding ter-normalisasi untuk vektor TF-IDF
+
+        Args:
+            vectors: Sparse matrix (n x n_features)
+
+        Returns:
+            numpy array float32 (n x n_components)
+        """
+        return normalize(np.asarray(vectors @ self.components.T)).astype(np.float32)
+
+    def query_scores(self, query):
+        """
+        Skor cosine query terhadap semua papers di ruang laten
+
+        Returns:
+            numpy array skor (n_papers,), atau None jika belum di-fit
+        """
+        if self.embeddings is None:
+            return super().query_scores(query)
+        if len(self.papers) == 0:
+            return None
+        query_embedding = self.embed(self.transform_query(query))[0]
+        return (self.embeddings @ query_embedding).astype(np.float64)
+
+    def batch_query_scores(self, queries):
+        """
+        Skor LSA banyak query sekaligus: (papers x k) @ (k x queries).
+        Perkalian matriks float32 bisa berbeda ~1e-7 dari query_scores.
+
+        Returns:
+            numpy array skor (n_queries x n_papers), atau None
+        """
+        if self.embeddings is None:
+            return super().batch_query_scores(queries)
+        if len(self.papers) == 0:
+            return None
+        query_embeddings = self.embed(self.transform_queries(queries))
+        return (self.embeddings @ query_embeddings.T).T.astype(np.float64)
+
+    def get_inverted_index(self):
+        # Skor laten dense, inverted index tidak berlaku
+        return None if self.embeddings is not None else super().get_inverted_index()
+
+    def calculate_similarity_to_query(self, query, top_k=None):
+        """
+        Hitung similarity LSA antara query dengan semua papers
+
+        Returns:
+            List of (paper_index, score) sorted by score descending
+        """
+        scores = self.query_scores(query)
+        if scores is None:
+            return []
+        return top_k_scored(scores, top_k)
+
+    def get_similar_papers(self, paper_index, top_n=5):
+        """
+        Papers yang paling dekat dengan paper tertentu di ruang laten
+
+        Returns:
+            List of (paper_index, score)
+        """
+        if self.embeddings is None:
+            return super().get_similar_papers(paper_index, top_n)
+        if paper_index >= len(self.papers):
+            return []
+
+        scores = (self.embeddings @ self.embeddings[paper_index]).astype(np.float64)
+        scores[paper_index] = -np.inf
+        return top_k_scored(scores, min(top_n, len(scores) - 1))
+
+    def memory_bytes(self):
+        """Memori komponen SVD + embedding papers"""
+        if self.embeddings is None:
+            return 0
+        return self.components.nbytes + self.embeddings.nbytes
@@ -0,0 +1,199 @@
+"""
+Similar Papers Graph
+Top-k tetangga (cosine similarity) setiap paper, dihitung sekali saat index
+dibangun dan disimpan sebagai adjacency CSR yang ringkas.
+
+- Build: skor dihitung per blok baris (blok x N), tidak pernah N x N sekaligus
+- Lookup: tetangga paper = potongan array sepanjang k, O(k)
+- Add: paper baru dihitung terhadap semua paper; untuk paper lama hanya
+  daftar yang berubah (ada paper baru dengan skor masuk top-k) yang di-merge
+
+Urutan tetangga sama dengan ContentBasedFilter.get_similar_papers: skor
+menurun, skor sama diurutkan berdasarkan index paper.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _select_top(scores, ids, k):
+    """
+    Top-k per baris dari matriks skor (baris x kandidat).
+    Kolom kandidat harus urut id menaik, sehingga skor sama diurutkan
+    berdasarkan id (argsort stabil).
+
+    Returns:
+        (ids, scores) shape (baris, k)
+    """
+    n_rows, n_cols = scores.shape
+    if k >= n_cols:
+        order = np.argsort(-scores, axis=1, kind='stable')
+        return np.take_along_axis(ids, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+    # Threshold = skor ke-k tiap baris; skor sama di batas diambil dari id terkecil
+    threshold = -np.partition(-scores, k - 1, axis=1)[:, k - 1:k]
+    above = scores > threshold
+    ties = scores == threshold
+    need = k - above.sum(axis=1, keepdims=True)
+    mask = above | (ties & (np.cumsum(ties, axis=1) <= need))
+
+    cols = np.nonzero(mask)[1].reshape(n_rows, k)
+    top_ids = np.take_along_axis(ids, cols, axis=1)
+    top_scores = np.take_along_axis(scores, cols, axis=1)
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return np.take_along_axis(top_ids, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+class NeighborGraph:
+    """
+    Graph top-k similar papers dari matriks TF-IDF (ter-normalisasi L2)
+    """
+
+    def __init__(self, matrix, k=20, block_size=512):
+        self.k = k
+        self.block_size = block_size
+        self.matrix = sp.csr_matrix(matrix)
+        self.ids = np.empty((0, 0), dtype=np.intp)
+        self.scores = np.empty((0, 0), dtype=np.float64)
+        self._build()
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def width(self):
+        """Jumlah tetangga per paper (k, atau N - 1 untuk corpus kecil)"""
+        return min(self.k, max(len(self) - 1, 0))
+
+    def _block_scores(self, start, stop):
+        """Skor baris start:stop terhadap semua paper, shape (blok, N)"""
+        scores = (self.matrix @ self.matrix[start:stop].T).toarray().T
+        scores[np.arange(stop - start), np.arange(start, stop)] = -np.inf
+        return scores
+
+    def _build(self):
+        n_docs = len(self)
+        width = self.width
+        self.ids = np.empty((n_docs, width), dtype=np.intp)
+        self.scores = np.empty((n_docs, width), dtype=np.float64)
+        if width == 0:
+            return
+
+        all_ids = np.arange(n_docs)
+        for start in range(0, n_docs, self.block_size):
+            stop = min(start + self.block_size, n_docs)
+            scores = self._block_scores(start, stop)
+            ids = np.broadcast_to(all_ids, scores.shape)
+            self.ids[start:stop], self.scores[start:stop] = _select_top(scores, ids, width)
+
+    def add(self, vectors):
+        """
+        Tambahkan paper baru (vektor dengan vocabulary yang sama)
+
+        Args:
+            vectors: Sparse matrix (n_new x n_features)
+
+        Returns:
+            numpy array index paper lama yang daftar tetangganya berubah
+        """
+        vectors = sp.csr_matrix(vectors)
+        n_old = len(self)
+        n_new = vectors.shape[0]
+        if n_new == 0:
+            return np.empty(0, dtype=np.intp)
+
+        if vectors.shape[1] > self.matrix.shape[1]:
+            # Vocabulary bertambah (add_papers): paper lama tidak punya term baru
+            self.matrix = sp.csr_matrix((self.matrix.data, self.matrix.indices, self.matrix.indptr),
+                                        shape=(n_old, vectors.shape[1]))
+
+        old_width = self.width
+        self.matrix = sp.vstack([self.matrix, vectors], format='csr')
+        width = self.width
+        new_ids = np.arange(n_old, n_old + n_new)
+
+        # Paper lama: skor terhadap paper baru saja (n_old x n_new, sparse)
+        cross = (self.matrix[:n_old] @ vectors.T).toarray() if n_old else np.empty((0, n_new))
+        if old_width < width:
+            affected = np.arange(n_old)
+        elif old_width == 0:
+            affected = np.empty(0, dtype=np.intp)
+        else:
+            # Paper baru punya id lebih besar: hanya masuk jika skornya > skor ke-k
+            affected = np.flatnonzero((cross > self.scores[:, -1:]).any(axis=1))
+
+        ids = np.empty((n_old + n_new, width), dtype=np.intp)
+        scores = np.empty((n_old + n_new, width), dtype=np.float64)
+        ids[:n_old, :old_width] = self.ids
+        scores[:n_old, :old_width] = self.scores
+        if len(affected):
+            merged_ids = np.hstack([self.ids[affected], np.broadcast_to(new_ids, (len(affected), n_new))])
+            merged_scores = np.hstack([self.scores[affected], cross[affected]])
+            # Urutkan kandidat per baris berdasarkan id agar tie-breaking konsisten
+            order = np.argsort(merged_ids, axis=1, kind='stable')
+            ids[affected], scores[affected] = _select_top(
+                np.take_along_axis(merged_scores, order, axis=1),
+                np.take_along_axis(merged_ids, order, axis=1),
+                width
+            )
+
+        # Paper baru: skor terhadap semua paper
+        all_ids = np.arange(n_old + n_new)
+        for start in range(n_old, n_old + n_new, self.block_size):
+            stop = min(start + self.block_size, n_old + n_new)
+            block = self._block_scores(start, stop)
+            ids[start:stop], scores[start:stop] = _select_top(
+                block, np.broadcast_to(all_ids, block.shape), width
+            )
+
+        self.ids = ids
+        self.scores = scores
+        return affected
+
+    def neighbors(self, row, n=None):
+        """
+        Tetangga terdekat sebuah paper, O(k)
+
+        Returns:
+            List of (paper_index, similarity_score), atau None jika n > k
+            (caller harus menghitung ulang secara exact)
+        """
+        n = self.width if n is None else min(n, max(len(self) - 1, 0))
+        if n > self.width:
+            return None
+        return list(zip(self.ids[row, :n].tolist(), self.scores[row, :n].tolist()))
+
+    @property
+    def adjacency(self):
+        """Graph sebagai CSR (N x N), nilai = skor similarity"""
+        n_docs, width = self.ids.shape
+        return sp.csr_matrix(
+            (self.scores.ravel(), self.ids.ravel(), np.arange(n_docs + 1) * width),
+            shape=(n_docs, n_docs)
+        )
+
+    def pair_scores(self, rows):
+        """
+        Matriks similarity antar paper terpilih (len(rows) x len(rows)).
+        Pasangan yang ada di graph diambil dari graph, sisanya dihitung
+        dengan dot product baris terpilih saja.
+
+        Returns:
+            numpy array 2D
+        """
+        rows = list(rows)
+        result = np.full((len(rows), len(rows)), np.nan)
+        position = {row: i for i, row in enumerate(rows)}
+        for i, row in enumerate(rows):
+            result[i, i] = 1.0 if self.matrix[row].nnz else 0.0
+            for neighbor, score in zip(self.ids[row].tolist(), self.scores[row].tolist()):
+                j = position.get(neighbor)
+                if j is not None:
+                    result[i, j] = score
+
+        missing = np.isnan(result)
+        if missing.any():
+            vectors = self.matrix[rows]
+            exact = (vectors @ vectors.T).toarray()
+            result[missing] = exact[missing]
+        return result
@@ -0,0 +1,442 @@
+"""
+Paper Index Module
+Menyimpan hasil fit ContentBasedFilter (vectorizer, matriks TF-IDF CSR,
+dan metadata paper) agar bisa dipakai ulang oleh endpoint lanjutan
+(/api/recommendations, /api/similar-papers, /api/cbf-details)
+tanpa harus fit ulang TF-IDF di setiap request.
+
+Setiap index diberi result_set_id yang dikirim ke browser bersama hasil
+pencarian. Setiap paper di index diberi doc_id, sehingga request berikutnya
+cukup mengirim result_set_id + doc_id, bukan seluruh daftar paper beserta
+abstraknya. doc_id tidak pernah berubah: setelah remove_papers baris matriks
+bergeser, tetapi doc_id dipetakan ke baris lewat peta doc_id -> baris, dan
+doc_id yang dihapus tidak dipakai ulang.
+
+Index disimpan di server dalam store terbatas (LRU + TTL).
+
+Graph similar papers dibangun saat pertama kali dibutuhkan. Index bisa
+bertambah tanpa fit ulang (add_papers): graph yang sudah ada hanya
+menghitung baris baru. Setelah remove_papers atau reweight IDF, graph
+dibangun ulang saat dipakai.
+
+Update berjalan bersamaan dengan request lain: setiap request memakai
+snapshot() sehingga semua bacaannya berasal dari satu versi index.
+"""
+
+import copy
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from .bm25 import BM25Filter
+from .content_based_filter import ContentBasedFilter, RANKERS
+from .lsa import LSAFilter
+from .neighbor_graph import NeighborGraph
+
+
+def paper_key(paper):
+    """Kunci pencocokan paper (judul lowercase) untuk mencari baris di index"""
+    return (paper.get('title', '') or '').strip().lower()
+
+
+class PaperIndex:
+    """
+    Index TF-IDF yang sudah di-fit untuk satu result set
+    """
+
+    # Jumlah similar papers yang disimpan per paper di graph
+    NEIGHBOR_K = 20
+
+    def __init__(self, papers, result_set_id=None):
+        self.result_set_id = result_set_id or uuid.uuid4().hex
+        self.created_at = time.time()
+        self.last_access = self.created_at
+        self.cbf = ContentBasedFilter()
+        # Salinan milik index. doc_id diberikan sekali dan tidak pernah berubah
+        # (remove_papers tidak menggeser doc_id paper lain); baris matriks
+        # dicari lewat peta doc_id -> baris
+        self.cbf.fit([dict(p, doc_id=i) for i, p in enumerate(papers)])
+        self._next_doc_id = len(papers)
+
+        # Struktur turunan state cbf, dicocokkan dengan identitas papers /
+        # matriks dan dipakai bersama oleh snapshot():
+        #   'lookup' - (papers, doc_id -> baris, judul -> baris)
+        #   'graph'  - (matriks, NeighborGraph) top-k similar papers per paper,
+        #              dibangun saat similar() pertama kali dipanggil (O(N^2),
+        #              tidak ikut menambah latensi /api/search)
+        #   'bm25' / 'lsa' - ranker yang dibangun saat pertama kali diminta
+        self._derived = {}
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+
+    @property
+    def papers(self):
+        return self.cbf.papers
+
+    @property
+    def vectorizer(self):
+        return self.cbf.vectorizer
+
+    @property
+    def tfidf_matrix(self):
+        return self.cbf.tfidf_matrix
+
+    def snapshot(self):
+        """
+        View read-only atas versi index saat ini: semua method view membaca
+        state cbf yang sama walaupun add_papers / remove_papers berjalan
+        bersamaan. Dipakai sekali per request.
+
+        Returns:
+            PaperIndex (jangan di-update)
+        """
+        view = copy.copy(self)
+        view.cbf = self.cbf.snapshot()
+        return view
+
+    def _cached(self, name, source, build):
+        """Struktur turunan untuk source (papers / matriks) saat ini"""
+        with self._lock:
+            cached = self._derived.get(name)
+            if cached is None or cached[0] is not source:
+                cached = self._derived[name] = (source, build())
+            return cached[1]
+
+    def _lookup(self):
+        """(doc_id -> baris, judul -> baris) untuk papers saat ini"""
+        def build():
+            by_doc_id = {}
+            by_title = {}
+            for row, paper in enumerate(papers):
+                by_doc_id[paper['doc_id']] = row
+                by_title.setdefault(paper_key(paper), row)
+            return by_doc_id, by_title
+
+        papers = self.cbf.papers
+        return self._cached('lookup', papers, build)
+
+    @property
+    def graph(self):
+        """Graph similar papers (dibangun saat pertama dipakai / jika matriks sudah berubah)"""
+        matrix = self.cbf.tfidf_matrix
+        return self._cached(
+            'graph', matrix,
+            lambda: NeighborGraph(matrix, k=self.NEIGHBOR_K) if matrix is not None else None
+        )
+
+    @property
+    def is_fitted(self):
+        return self.cbf.tfidf_matrix is not None
+
+    def __len__(self):
+        return len(self.cbf.papers)
+
+    def row_of(self, doc_id):
+        """
+        Baris matriks untuk doc_id
+
+        Returns:
+            Index baris, atau None jika doc_id tidak valid / sudah dihapus
+        """
+        try:
+            doc_id = int(doc_id)
+        except (TypeError, ValueError):
+            return None
+        return self._lookup()[0].get(doc_id)
+
+    def locate(self, paper):
+        """
+        Cari baris matriks untuk sebuah paper (berdasarkan doc_id, lalu judul)
+
+        Returns:
+            Index baris, atau None jika paper tidak ada di index
+        """
+        by_doc_id, by_title = self._lookup()
+        doc_id = paper.get('doc_id')
+        if isinstance(doc_id, int) and doc_id in by_doc_id:
+            return by_doc_id[doc_id]
+        return by_title.get(paper_key(paper))
+
+    def find_papers(self, doc_ids):
+        """
+        Ambil paper yang tersimpan berdasarkan doc_id
+
+        Returns:
+            (papers, missing) - missing = doc_id yang tidak valid / sudah dihapus
+        """
+        papers = []
+        missing = []
+        for doc_id in doc_ids or []:
+            row = self.row_of(doc_id)
+            if row is None:
+                missing.append(doc_id)
+            else:
+                papers.append(self.cbf.papers[row])
+        return papers, missing
+
+    def get_papers(self, doc_ids):
+        """
+        Ambil paper yang tersimpan berdasarkan doc_id (id tidak valid dilewati)
+
+        Returns:
+            List of paper dictionaries
+        """
+        return self.find_papers(doc_ids)[0]
+
+    def get_ranker(self, ranker='tfidf'):
+        """
+        Filter untuk ranking query ('tfidf', 'bm25' atau 'lsa')
+
+        Returns:
+            ContentBasedFilter, BM25Filter atau LSAFilter yang sudah di-fit
+        """
+        if ranker not in RANKERS:
+            raise ValueError(f"Unknown ranker: {ranker}")
+        cbf = self.cbf
+        if ranker == 'tfidf':
+            return cbf
+        if ranker == 'lsa':
+            # SVD atas matriks TF-IDF index, tanpa fit ulang TF-IDF
+            return self._cached('lsa', cbf.tfidf_matrix, lambda: LSAFilter.from_filter(cbf))
+        # Fit pada paper yang sama (doc_id ikut tersimpan di paper BM25)
+        return self._cached('bm25', cbf.papers, lambda: BM25Filter().fit(cbf.papers))
+
+    def rank(self, query, top_k=None, ranker='tfidf'):
+        """
+        Rank papers di index terhadap query.
+        Skor relevansi juga dicatat di paper yang tersimpan, supaya endpoint
+        lanjutan yang hanya mengirim doc_id tetap mendapat relevance_score.
+
+        Args:
+            query: Search query
+            top_k: Jumlah papers teratas (None = semua)
+            ranker: 'tfidf' (cosine similarity), 'bm25' (BM25F) atau 'lsa'
+
+        Returns:
+            List of papers dengan 'relevance_score' dan 'relevance_rank'
+        """
+        papers = self.cbf.papers
+        by_doc_id = self._lookup()[0]
+        ranked = self.get_ranker(ranker).rank_papers_by_relevance(query, top_k)
+        for paper in ranked:
+            stored = papers[by_doc_id[paper['doc_id']]]
+            stored['relevance_score'] = paper['relevance_score']
+            stored['relevance_rank'] = paper['relevance_rank']
+        return ranked
+
+    def similar(self, row, top_n=5):
+        """
+        Similar papers untuk baris index: dari graph (O(k)) jika top_n <= k,
+        selain itu dihitung exact
+
+        Returns:
+            List of (paper_index, similarity_score)
+        """
+        graph = self.graph
+        if graph is not None:
+            neighbors = graph.neighbors(row, top_n)
+            if neighbors is not None:
+                return neighbors
+        return self.cbf.get_similar_papers(row, top_n)
+
+    def pair_scores(self, rows):
+        """
+        Matriks similarity antar baris terpilih: dari graph jika sudah
+        dibangun, selain itu dot product baris terpilih saja (graph tidak
+        dibangun hanya untuk ini)
+
+        Returns:
+            numpy array 2D (len(rows) x len(rows))
+        """
+        matrix = self.cbf.tfidf_matrix
+        with self._lock:
+            cached = self._derived.get('graph')
+        if cached is not None and cached[0] is matrix and cached[1] is not None:
+            return cached[1].pair_scores(rows)
+        vectors = matrix[list(rows)]
+        return (vectors @ vectors.T).toarray()
+
+    def add_papers(self, papers):
+        """
+        Tambahkan papers ke index tanpa fit ulang.
+        Paper yang judulnya sudah ada di index dilewati.
+
+        Args:
+            papers: List of paper dictionaries
+
+        Returns:
+            List doc_id untuk papers yang ditambahkan
+        """
+        with self._update_lock:
+            by_title = self._lookup()[1]
+            new_papers = []
+            keys = set()
+            for paper in papers:
+                key = paper_key(paper)
+                if key and (key in by_title or key in keys):
+                    continue
+                keys.add(key)
+                new_papers.append(paper)
+            if not new_papers:
+                return []
+
+            doc_ids = list(range(self._next_doc_id, self._next_doc_id + len(new_papers)))
+            self._next_doc_id += len(new_papers)
+            reweights = self._reweights()
+            before = self.cbf.state
+            self.cbf.add_papers([dict(p, doc_id=d) for p, d in zip(new_papers, doc_ids)])
+            after = self.cbf.state
+
+            # Baris lama tidak berubah (tidak ada reweight IDF di antaranya):
+            # salin graph lalu hitung baris baru saja; graph lama tetap utuh
+            # untuk snapshot yang masih memakainya
+            with self._lock:
+                cached = self._derived.get('graph')
+                if cached is not None and cached[1] is not None and cached[0] is before.tfidf_matrix \
+                        and self._reweights() == reweights:
+                    graph = copy.copy(cached[1])
+                    graph.add(after.tfidf_matrix[before.tfidf_matrix.shape[0]:])
+                    self._derived['graph'] = (after.tfidf_matrix, graph)
+            return doc_ids
+
+    def _reweights(self):
+        """Jumlah reweight IDF yang sudah diterbitkan cbf"""
+        stats = self.cbf.update_stats()
+        return stats['reweights'] if stats is not None else 0
+
+    def remove_papers(self, doc_ids):
+        """
+        Hapus papers dari index. doc_id paper lain tidak berubah; doc_id
+        yang dihapus tidak berlaku lagi (tidak dipakai ulang).
+
+        Returns:
+            Jumlah papers yang dihapus
+        """
+        with self._update_lock:
+            rows = {row for row in (self.row_of(d) for d in doc_ids or []) if row is not None}
+            if not rows:
+                return 0
+            return self.cbf.remove_papers(sorted(rows))
+
+    def locate_all(self, papers):
+        """
+        Cari baris matriks untuk sekumpulan paper
+
+        Returns:
+            List index baris, atau None jika ada paper yang tidak ditemukan
+        """
+        rows = []
+        for paper in papers:
+            row = self.locate(paper)
+            if row is None:
+                return None
+            rows.append(row)
+        return rows
+
+    def subset(self, rows, papers=None):
+        """
+        Buat ContentBasedFilter "view" untuk sebagian baris index.
+        Vectorizer dipakai bersama, baris matriks diambil tanpa fit ulang.
+
+        Args:
+            rows: List index baris
+            papers: Paper yang menggantikan metadata index (opsional)
+
+        Returns:
+            ContentBasedFilter yang sudah siap dipakai
+        """
+        state = self.cbf.state
+        view = ContentBasedFilter()
+        view.state = state._replace(
+            papers=list(papers) if papers is not None else [state.papers[r] for r in rows],
+            paper_texts=[state.paper_texts[r] for r in rows],
+            tfidf_matrix=state.tfidf_matrix[rows] if state.tfidf_matrix is not None else None
+        )
+        return view
+
+
+class IndexRegistry:
+    """
+    Store PaperIndex berdasarkan result_set_id.
+    Dibatasi jumlah index (LRU) dan umur sejak terakhir diakses (TTL).
+    """
+
+    def __init__(self, max_indexes=64, ttl_seconds=1800):
+        self.max_indexes = max_indexes
+        self.ttl_seconds = ttl_seconds
+        self._indexes = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _purge_expired(self, now):
+        """Buang index yang sudah melewati TTL (dipanggil dengan lock)"""
+        expired = [
+            rid for rid, index in self._indexes.items()
+            if now - index.last_access > self.ttl_seconds
+        ]
+        for rid in expired:
+            del self._indexes[rid]
+
+    def register(self, index):
+        with self._lock:
+            now = time.time()
+            index.last_access = now
+            self._purge_expired(now)
+            self._indexes[index.result_set_id] = index
+            self._indexes.move_to_end(index.result_set_id)
+            while len(self._indexes) > self.max_indexes:
+                self._indexes.popitem(last=False)
+        return index
+
+    def get(self, result_set_id):
+        if not result_set_id:
+            return None
+        with self._lock:
+            index = self._indexes.get(result_set_id)
+            if index is None:
+                return None
+            now = time.time()
+            if now - index.last_access > self.ttl_seconds:
+                del self._indexes[result_set_id]
+                return None
+            index.last_access = now
+            self._indexes.move_to_end(result_set_id)
+            return index
+
+    def remove(self, result_set_id):
+        with self._lock:
+            return self._indexes.pop(result_set_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._indexes.clear()
+
+    def __len__(self):
+        return len(self._indexes)
+
+
+# Registry global untuk dipakai app.py
+_registry = IndexRegistry()
+
+
+def build_paper_index(papers):
+    """
+    Fit index TF-IDF untuk papers dan daftarkan ke registry
+
+    Args:
+        papers: List of paper dictionaries
+
+    Returns:
+        PaperIndex yang sudah di-fit
+    """
+    return _registry.register(PaperIndex(papers))
+
+
+def get_paper_index(result_set_id):
+    """
+    Ambil PaperIndex berdasarkan result_set_id
+
+    Returns:
+        PaperIndex, atau None jika tidak ada / sudah dibuang
+    """
+    return _registry.get(result_set_id)
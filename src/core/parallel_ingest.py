@@ -0,0 +1,244 @@
+"""
+Parallel Ingest
+Preprocessing dan penghitungan term untuk fit TF-IDF dengan beberapa proses.
+
+1. Papers dibagi menjadi shard berurutan; setiap worker (ProcessPoolExecutor)
+   melakukan preprocessing dan menghitung term shard-nya dengan analyzer
+   yang sama dengan TfidfVectorizer
+2. Vocabulary shard digabung sesuai urutan kemunculan pertama, kolom blok
+   count dipetakan ulang lalu ditumpuk
+3. Kolom diurutkan alfabetis dan dipangkas (max_df / min_df / max_features)
+   dengan langkah yang sama persis dengan CountVectorizer
+4. IDF dan bobot dihitung dengan TfidfTransformer milik vectorizer
+
+Matriks count, vocabulary, IDF dan matriks TF-IDF identik dengan
+TfidfVectorizer.fit_transform serial (termasuk urutan data di CSR).
+
+Langkah 2-3 meniru method privat CountVectorizer (_count_vocab,
+_sort_features, _limit_features) dan fit diselesaikan dengan mengisi
+vocabulary_ / idf_ langsung. Karena itu fit paralel hanya dipakai untuk
+versi scikit-learn yang parity-nya sudah dijalankan (SKLEARN_TESTED, saat
+ini hanya 1.9 - lihat tests/test_parallel_ingest.py); versi lain memakai
+fit serial. Perluas rentangnya hanya setelah tests tersebut lulus pada
+versi baru.
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from numbers import Integral
+
+import numpy as np
+import scipy.sparse as sp
+import sklearn
+from sklearn.feature_extraction.text import CountVectorizer, TfidfTransformer, TfidfVectorizer
+
+from .content_based_filter import ContentBasedFilter
+
+# Rentang versi scikit-learn (major, minor) yang parity-nya dengan fit serial
+# sudah diuji (tests/test_parallel_ingest.py dijalankan dengan 1.9.1)
+SKLEARN_TESTED = ((1, 9), (1, 9))
+
+
+def sklearn_supported(version=None):
+    """
+    Cek apakah fit paralel aman untuk versi scikit-learn ini: versi di dalam
+    SKLEARN_TESTED dan atribut yang ditiru / diisi masih ada
+
+    Args:
+        version: String versi (default: sklearn.__version__)
+
+    Returns:
+        True jika fit paralel boleh dipakai
+    """
+    match = re.match(r'(\d+)\.(\d+)', version or sklearn.__version__)
+    if match is None:
+        return False
+    low, high = SKLEARN_TESTED
+    if not low <= (int(match.group(1)), int(match.group(2))) <= high:
+        return False
+    idf = getattr(TfidfVectorizer, 'idf_', None)
+    return (
+        all(hasattr(CountVectorizer, name) for name in ('_count_vocab', '_sort_features', '_limit_features'))
+        and isinstance(idf, property) and idf.fset is not None
+    )
+
+
+def _count_shard(papers):
+    """
+    Worker: preprocessing + hitung term untuk satu shard
+
+    Returns:
+        (processed, terms, counts): hasil preprocess_text per paper, term
+        sesuai urutan kemunculan pertama, dan matriks count CSR
+        (kolom = posisi term di terms)
+    """
+    cbf = ContentBasedFilter()
+    processed = []
+    texts = []
+    for paper in papers:
+        title = paper.get('title', '') or ''
+        abstract = paper.get('abstract', paper.get('snippet', '')) or ''
+        result = cbf.preprocess_text(f"{title} {title} {abstract}")
+        processed.append(result)
+        texts.append(result if result else title.lower())
+
+    analyze = CountVectorizer(
+        stop_words=cbf.analyzer.stop_words_list,
+        ngram_range=(1, 2),
+        token_pattern=r'(?u)\b[a-zA-Z]{3,}\b'
+    ).build_analyzer()
+
+    vocabulary = {}
+    indices = []
+    values = []
+    indptr = [0]
+    for text in texts:
+        counter = {}
+        for feature in analyze(text):
+            idx = vocabulary.setdefault(feature, len(vocabulary))
+            counter[idx] = counter.get(idx, 0) + 1
+        indices.extend(counter.keys())
+        values.extend(counter.values())
+        indptr.append(len(indices))
+
+    counts = sp.csr_matrix(
+        (np.asarray(values, dtype=np.float64), np.asarray(indices, dtype=np.int32),
+         np.asarray(indptr, dtype=np.int32)),
+        shape=(len(texts), len(vocabulary))
+    )
+    return processed, list(vocabulary), counts
+
+
+def _shards(papers, n_shards):
+    size = -(-len(papers) // n_shards)
+    return [papers[i:i + size] for i in range(0, len(papers), size)]
+
+
+def merge_counts(blocks):
+    """
+    Gabungkan blok count shard menjadi satu matriks dengan vocabulary alfabetis
+    (hasil sama dengan CountVectorizer._count_vocab + _sort_features)
+
+    Args:
+        blocks: List of (terms, counts) per shard, urut sesuai papers
+
+    Returns:
+        (vocabulary dict term -> kolom, matriks count CSR)
+    """
+    # Id global = urutan kemunculan pertama di seluruh corpus
+    vocabulary = {}
+    stacked = []
+    for terms, counts in blocks:
+        columns = np.array([vocabulary.setdefault(t, len(vocabulary)) for t in terms], dtype=np.int32)
+        stacked.append((counts.data, columns[counts.indices], counts.indptr))
+    if not vocabulary:
+        raise ValueError('empty vocabulary; perhaps the documents only contain stop words')
+
+    data = np.concatenate([block[0] for block in stacked])
+    indices = np.concatenate([block[1] for block in stacked]).astype(np.int32)
+    offsets = np.cumsum([0] + [block[2][-1] for block in stacked[:-1]])
+    indptr = np.concatenate([[0]] + [block[2][1:] + offset for block, offset in zip(stacked, offsets)])
+    matrix = sp.csr_matrix((data, indices, indptr.astype(np.int32)),
+                           shape=(len(indptr) - 1, len(vocabulary)))
+    matrix.sort_indices()
+
+    # Urutkan kolom alfabetis tanpa mengubah urutan data per baris
+    map_index = np.empty(len(vocabulary), dtype=matrix.indices.dtype)
+    for new_val, (term, old_val) in enumerate(sorted(vocabulary.items())):
+        vocabulary[term] = new_val
+        map_index[old_val] = new_val
+    matrix.indices = map_index.take(matrix.indices, mode='clip')
+    return vocabulary, matrix
+
+
+def limit_features(counts, vocabulary, max_df, min_df, max_features):
+    """
+    Pangkas term terlalu umum / jarang dan batasi max_features
+    (langkah yang sama dengan CountVectorizer._limit_features)
+
+    Returns:
+        (vocabulary baru, matriks count dengan kolom yang tersisa)
+    """
+    n_docs = counts.shape[0]
+    high = max_df if isinstance(max_df, Integral) else max_df * n_docs
+    low = min_df if isinstance(min_df, Integral) else min_df * n_docs
+    if high < low:
+        raise ValueError('max_df corresponds to < documents than min_df')
+
+    dfs = np.bincount(counts.indices, minlength=counts.shape[1])
+    mask = (dfs <= high) & (dfs >= low)
+    if max_features is not None and mask.sum() > max_features:
+        tfs = np.asarray(counts.sum(axis=0)).ravel()
+        mask_inds = (-tfs[mask]).argsort()[:max_features]
+        new_mask = np.zeros(len(dfs), dtype=bool)
+        new_mask[np.where(mask)[0][mask_inds]] = True
+        mask = new_mask
+
+    kept = np.where(mask)[0]
+    if len(kept) == 0:
+        raise ValueError('After pruning, no terms remain. Try a lower min_df or a higher max_df.')
+    new_indices = np.cumsum(mask) - 1
+    vocabulary = {term: new_indices[i] for term, i in vocabulary.items() if mask[i]}
+    return vocabulary, counts[:, kept]
+
+
+def parallel_count(papers, n_workers=None, cache=None):
+    """
+    Preprocessing + hitung term untuk semua papers secara paralel
+
+    Args:
+        papers: List of paper dictionaries
+        n_workers: Jumlah proses (default: jumlah CPU)
+        cache: PreprocessCache proses utama yang diisi hasil worker (opsional)
+
+    Returns:
+        (texts, vocabulary, counts): teks per paper, vocabulary alfabetis,
+        dan matriks count sebelum pruning
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    # Shard lebih banyak dari worker agar beban tetap merata
+    shards = _shards(papers, min(len(papers), n_workers * 4))
+
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(_count_shard, shards))
+
+    texts = []
+    for shard, (processed, _, _) in zip(shards, results):
+        for paper, result in zip(shard, processed):
+            title = paper.get('title', '') or ''
+            texts.append(result if result else title.lower())
+            # Worker punya cache sendiri; simpan hasilnya di cache proses utama
+            if result and cache is not None:
+                abstract = paper.get('abstract', paper.get('snippet', '')) or ''
+                cache.put(f"{title} {title} {abstract}", result)
+
+    vocabulary, counts = merge_counts([(terms, counts) for _, terms, counts in results])
+    return texts, vocabulary, counts
+
+
+def fit_from_counts(vectorizer, vocabulary, counts):
+    """
+    Selesaikan fit TfidfVectorizer dari matriks count hasil parallel_count
+
+    Args:
+        vectorizer: TfidfVectorizer (belum di-fit, parameter sudah diatur)
+        vocabulary: Vocabulary alfabetis dari parallel_count
+        counts: Matriks count dari parallel_count
+
+    Returns:
+        Matriks TF-IDF (sama dengan vectorizer.fit_transform(texts))
+    """
+    vocabulary, counts = limit_features(
+        counts, vocabulary, vectorizer.max_df, vectorizer.min_df, vectorizer.max_features
+    )
+    transformer = TfidfTransformer(
+        norm=vectorizer.norm,
+        use_idf=vectorizer.use_idf,
+        smooth_idf=vectorizer.smooth_idf,
+        sublinear_tf=vectorizer.sublinear_tf
+    ).fit(counts)
+
+    vectorizer.vocabulary_ = vocabulary
+    vectorizer.idf_ = transformer.idf_
+    return transformer.transform(counts, copy=False)
@@ -0,0 +1,164 @@
+"""
+Preprocessing Cache Module
+Cache hasil preprocess_text berdasarkan hash konten teks mentah.
+
+Judul dan abstrak yang sama diproses berulang kali (fit, rekomendasi,
+pencarian dengan hasil yang tumpang tindih). Dengan cache ini teks yang
+sudah pernah diproses tidak perlu melewati regex, tokenisasi, stopword
+dan lemmatisasi lagi.
+
+Cache dibatasi jumlah entri (LRU) dan bisa disimpan ke / dimuat dari disk.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+# Naikkan jika pipeline preprocessing berubah, supaya cache lama di disk tidak terpakai
+PREPROCESS_VERSION = 1
+
+
+def text_hash(text):
+    """Hash konten teks mentah (blake2b 128-bit)"""
+    return hashlib.blake2b(str(text).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class PreprocessCache:
+    """
+    Cache LRU: hash teks mentah -> string token hasil preprocessing
+    """
+
+    def __init__(self, max_entries=50000, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def get(self, text):
+        """
+        Ambil hasil preprocessing dari cache
+
+        Returns:
+            String hasil preprocessing, atau None jika belum ada
+        """
+        key = text_hash(text)
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, text, processed):
+        """Simpan hasil preprocessing untuk teks mentah"""
+        key = text_hash(text)
+        with self._lock:
+            self._entries[key] = processed
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, text, compute):
+        """
+        Ambil dari cache, atau hitung dengan compute(text) lalu simpan
+
+        Args:
+            text: Teks mentah
+            compute: Fungsi preprocessing
+
+        Returns:
+            String hasil preprocessing
+        """
+        processed = self.get(text)
+        if processed is None:
+            processed = compute(text)
+            self.put(text, processed)
+        return processed
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Statistik cache: hits, misses, hit_rate, size"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+            'size': len(self._entries),
+            'max_entries': self.max_entries
+        }
+
+    def save(self, path=None):
+        """Simpan isi cache ke file JSON"""
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            data = {
+                'version': PREPROCESS_VERSION,
+                'entries': list(self._entries.items())
+            }
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """Muat isi cache dari file JSON (diabaikan jika versi berbeda)"""
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Preprocess cache load failed: {e}")
+            return
+
+        if data.get('version') != PREPROCESS_VERSION:
+            print("[DEBUG] Preprocess cache version mismatch, ignoring file")
+            return
+
+        with self._lock:
+            for key, value in data.get('entries', [])[-self.max_entries:]:
+                self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+# Cache global, dipakai bersama oleh semua ContentBasedFilter
+_default_cache = PreprocessCache()
+
+
+def get_preprocess_cache():
+    """Ambil cache preprocessing global"""
+    return _default_cache
+
+
+def configure_preprocess_cache(max_entries=50000, path=None):
+    """
+    Ganti cache preprocessing global (misalnya untuk mengaktifkan persistensi disk)
+
+    Args:
+        max_entries: Jumlah maksimum entri
+        path: File JSON untuk load/save (opsional)
+
+    Returns:
+        PreprocessCache yang baru
+    """
+    global _default_cache
+    _default_cache = PreprocessCache(max_entries=max_entries, path=path)
+    return _default_cache
@@ -0,0 +1,239 @@
+"""
+Query Result Cache
+Cache hasil /api/search (scraping + ranking) untuk query yang diulang.
+
+Kunci cache terdiri dari:
+- query setelah normalisasi preprocess_text ("Machine Learning" dan
+  "machine-learning" menjadi entri yang sama)
+- source, filters, max_results, use_cbf, ranker dan candidate_pool
+- fingerprint pipeline (versi preprocessing, ranker + generasi cache),
+  sehingga invalidate() membuat semua entri lama tidak terpakai
+
+Setiap entri juga menyimpan versi index hasil pencarian (result_set_id +
+index_version). Entri hanya dipakai jika index tersebut masih tersimpan
+dengan versi yang sama; setelah add_papers / remove_papers / reweight pada
+result set itu, entrinya otomatis tidak dipakai lagi (tanpa invalidate()).
+
+Entri disimpan sebagai JSON terserialisasi: ukurannya dihitung persis untuk
+batas memori, dan hasil yang dikembalikan selalu salinan baru. Tipe numpy
+dikonversi eksplisit ke tipe JSON; tipe lain yang tidak dikenal tidak
+di-cache (bukan disimpan sebagai str()).
+Cache dibatasi jumlah entri, total byte (LRU) dan umur entri (TTL).
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from .content_based_filter import RANKERS, ContentBasedFilter
+from .paper_index import get_paper_index
+from .preprocess_cache import PREPROCESS_VERSION, text_hash
+
+
+def normalize_query(query):
+    """
+    Normalisasi query untuk kunci cache (preprocess_text, fallback lowercase)
+    """
+    normalized = ContentBasedFilter().preprocess_text(query or '')
+    return normalized if normalized else ' '.join((query or '').lower().split())
+
+
+def json_value(value):
+    """
+    Konversi tipe numpy ke tipe JSON (default untuk json.dumps)
+
+    Raises:
+        TypeError: Tipe lain yang tidak bisa diserialisasi
+    """
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def index_tag(index):
+    """
+    Versi index hasil pencarian untuk entri cache
+
+    Returns:
+        (result_set_id, index_version), atau None tanpa index
+    """
+    if index is None:
+        return None
+    return index.result_set_id, index.cbf.index_version
+
+
+class QueryResultCache:
+    """
+    Cache LRU + TTL: kunci query -> response JSON /api/search
+    """
+
+    def __init__(self, max_entries=1000, max_bytes=64 * 1024 * 1024, ttl_seconds=600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+        self.stale = 0
+        self._entries = OrderedDict()  # key -> (created_at, payload, index_tag)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def fingerprint(self):
+        """Fingerprint versi pipeline; berubah setiap invalidate()"""
+        return text_hash(f"{PREPROCESS_VERSION}:{','.join(RANKERS)}:{self.generation}")
+
+    def make_key(self, query, source, filters=None, max_results=None, use_cbf=True, ranker='tfidf',
+                 candidate_pool=None):
+        """Kunci cache untuk satu request pencarian"""
+        return text_hash(json.dumps([
+            normalize_query(query),
+            source,
+            filters or {},
+            max_results,
+            bool(use_cbf),
+            ranker,
+            candidate_pool or max_results,
+            self.fingerprint()
+        ], sort_keys=True, default=json_value))
+
+    def _remove(self, key):
+        """Hapus entri (dipanggil dengan lock)"""
+        _, payload, _ = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    @staticmethod
+    def _is_current(tag):
+        """Index entri masih tersimpan dengan versi yang sama"""
+        if tag is None:
+            return True
+        index = get_paper_index(tag[0])
+        return index is not None and index_tag(index) == tag
+
+    def get(self, key):
+        """
+        Ambil response dari cache
+
+        Returns:
+            Dictionary response, atau None jika tidak ada / kedaluwarsa
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry[0] > self.ttl_seconds:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is not None and not self._is_current(entry[2]):
+                # Index result set sudah dibuang atau berubah sejak entri disimpan
+                self._remove(key)
+                self.stale += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[1]
+        return json.loads(payload)
+
+    def put(self, key, response, index=None):
+        """
+        Simpan response (diabaikan jika lebih besar dari max_bytes atau
+        berisi tipe yang tidak bisa diserialisasi ke JSON)
+
+        Args:
+            key: Kunci dari make_key
+            response: Dictionary response
+            index: PaperIndex result set response (entri ikut versinya)
+        """
+        try:
+            payload = json.dumps(response, ensure_ascii=False, default=json_value)
+        except (TypeError, ValueError) as e:
+            print(f"[WARNING] Query cache: response not cached ({e})")
+            return
+        if len(payload) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.time(), payload, index_tag(index))
+            self._bytes += len(payload)
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def discard(self, key):
+        """Hapus satu entri (misalnya jika index hasilnya sudah dibuang)"""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate(self):
+        """
+        Buang semua entri dan ganti fingerprint index.
+        Dipanggil ketika index / pipeline ranking berubah.
+        """
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._bytes = 0
+            self.invalidations += 1
+
+    def stats(self):
+        """Statistik cache: hits, misses, hit_rate, size, bytes"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 4) if total else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'stale': self.stale,
+                'size': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'fingerprint': self.fingerprint()
+            }
+
+
+# Cache global untuk /api/search
+_query_cache = QueryResultCache()
+
+
+def get_query_cache():
+    """Ambil cache hasil query global"""
+    return _query_cache
+
+
+def configure_query_cache(max_entries=1000, max_bytes=64 * 1024 * 1024, ttl_seconds=600):
+    """
+    Ganti cache hasil query global
+
+    Args:
+        max_entries: Jumlah maksimum entri
+        max_bytes: Batas total ukuran response yang disimpan
+        ttl_seconds: Umur maksimum entri
+
+    Returns:
+        QueryResultCache yang baru
+    """
+    global _query_cache
+    _query_cache = QueryResultCache(max_entries=max_entries, max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+    return _query_cache
+
+
+def invalidate_query_cache():
+    """Invalidasi cache hasil query global (index berubah)"""
+    _query_cache.invalidate()
@@ -0,0 +1,148 @@
+"""
+Ranking Core
+Perhitungan skor dan pemilihan top-k untuk Content-Based Filtering.
+
+Output TfidfVectorizer sudah dinormalisasi L2, sehingga cosine similarity
+cukup dihitung dengan dot product sparse (tanpa normalisasi ulang seperti
+pada sklearn cosine_similarity). Top-k dipilih dengan np.argpartition
+(O(n)) lalu hanya k hasil yang diurutkan, dan hanya k hasil itu yang
+diubah menjadi objek Python.
+"""
+
+import numpy as np
+
+
+def dot_scores(query_vector, matrix):
+    """
+    Cosine similarity untuk vektor yang sudah dinormalisasi L2
+
+    Args:
+        query_vector: Sparse row vector (1 x n_features)
+        matrix: Sparse matrix dokumen (n_docs x n_features)
+
+    Returns:
+        numpy array skor (n_docs,)
+    """
+    scores = matrix @ query_vector.T
+    if hasattr(scores, 'toarray'):
+        scores = scores.toarray()
+    return np.asarray(scores, dtype=np.float64).ravel()
+
+
+def top_k_indices(scores, k=None):
+    """
+    Index dengan skor tertinggi, urut menurun.
+    Skor yang sama diurutkan berdasarkan index (sama dengan sort stabil).
+
+    Args:
+        scores: numpy array skor
+        k: Jumlah hasil (None = semua)
+
+    Returns:
+        numpy array index
+    """
+    scores = np.asarray(scores)
+    n = scores.shape[0]
+
+    if k is None or k >= n:
+        return np.lexsort((np.arange(n), -scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    candidates = np.argpartition(-scores, k - 1)[:k]
+    threshold = scores[candidates].min()
+
+    # Pilih ulang kandidat di batas threshold agar tie-breaking deterministik
+    above = np.flatnonzero(scores > threshold)
+    ties = np.flatnonzero(scores == threshold)[:k - len(above)]
+    candidates = np.concatenate([above, ties])
+
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
+
+
+def top_k_scored(scores, k=None):
+    """
+    Top-k sebagai list of (index, score), hanya k hasil yang dibuat objek Python
+
+    Returns:
+        List of (paper_index, similarity_score) sorted by score descending
+    """
+    indices = top_k_indices(scores, k)
+    return list(zip(indices.tolist(), scores[indices].tolist()))
+
+
+def sparse_row_top_k(matrix, k):
+    """
+    Top-k kolom (bobot terbesar) untuk setiap baris matriks CSR, langsung
+    dari array data/indices tanpa membuat baris dense.
+    Bobot sama diurutkan berdasarkan index kolom.
+
+    Args:
+        matrix: Sparse CSR matrix
+        k: Jumlah kolom per baris
+
+    Returns:
+        List (per baris) of (column_indices, weights) numpy arrays
+    """
+    matrix = matrix.tocsr()
+    if matrix.shape[0] == 0:
+        return []
+    indptr, indices, data = matrix.indptr, matrix.indices, matrix.data
+    lengths = np.diff(indptr)
+    row_ids = np.repeat(np.arange(matrix.shape[0]), lengths)
+
+    # Satu sort untuk semua baris: (baris, bobot menurun, kolom)
+    order = np.lexsort((indices, -data, row_ids))
+    keep = order[np.arange(len(order)) - indptr[row_ids] < k]
+
+    bounds = np.cumsum(np.minimum(lengths, k))[:-1]
+    return list(zip(np.split(indices[keep], bounds), np.split(data[keep], bounds)))
+
+
+def top_k_rows(scores, k=None, block_elements=2 ** 22):
+    """
+    Top-k per baris untuk matriks skor (n_queries x n_docs), dense atau
+    sparse. Hasil per baris sama dengan top_k_indices pada baris tersebut
+    (skor menurun, skor sama diurutkan berdasarkan index). Matriks sparse
+    diproses per blok baris yang dibuat dense (maksimal block_elements
+    elemen), sehingga dokumen berskor 0 ikut terurut seperti pada
+    pencarian satu query.
+
+    Returns:
+        List (per baris) of (indices, scores) numpy arrays
+    """
+    n_rows, n_docs = scores.shape
+    if k is not None and k <= 0:
+        return [(np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64))] * n_rows
+    if k is not None and k >= n_docs:
+        k = None
+
+    block = max(1, block_elements // max(n_docs, 1))
+    results = []
+    for start in range(0, n_rows, block):
+        chunk = scores[start:start + block]
+        chunk = chunk.toarray() if hasattr(chunk, 'toarray') else chunk
+        chunk = np.asarray(chunk, dtype=np.float64)
+        if k is None:
+            for row in chunk:
+                indices = top_k_indices(row)
+                results.append((indices, row[indices]))
+        else:
+            results.extend(_dense_top_k_rows(chunk, k))
+    return results
+
+
+def _dense_top_k_rows(scores, k):
+    """Top-k per baris matriks dense (vectorized, skor sama berdasarkan index)"""
+    n_rows = scores.shape[0]
+    # Threshold = skor ke-k tiap baris; skor sama di batas diambil dari index terkecil
+    threshold = -np.partition(-scores, k - 1, axis=1)[:, k - 1:k]
+    above = scores > threshold
+    ties = scores == threshold
+    need = k - above.sum(axis=1, keepdims=True)
+    mask = above | (ties & (np.cumsum(ties, axis=1) <= need))
+
+    cols = np.nonzero(mask)[1].reshape(n_rows, k)
+    values = np.take_along_axis(scores, cols, axis=1)
+    order = np.argsort(-values, axis=1, kind='stable')
+    return list(zip(np.take_along_axis(cols, order, axis=1), np.take_along_axis(values, order, axis=1)))
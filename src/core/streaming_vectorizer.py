@@ -0,0 +1,85 @@
+"""
+Streaming TF-IDF Vectorizer
+Feature hashing + tabel document frequency untuk indexing bertahap.
+
+Tidak ada vocabulary dict: setiap term (unigram/bigram) di-hash ke salah
+satu n_features kolom (HashingVectorizer, alternate_sign=False). Document
+frequency per kolom diakumulasi dengan partial_fit per chunk, lalu chunk
+di-transform dengan IDF dari tabel tersebut. Memori tetap:
+    df (int64) + idf (float64) = 16 byte x n_features, ditambah satu chunk.
+
+Bobot mengikuti TfidfVectorizer (sublinear_tf, smooth_idf, norm='l2'):
+    tf  = 1 + log(count)
+    idf = log((1 + n_docs) / (1 + df)) + 1
+Tanpa tabrakan hash, hasilnya sama dengan TfidfVectorizer dengan
+vocabulary penuh (tanpa max_features / max_df), hanya kolomnya berbeda.
+"""
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class StreamingTfidfVectorizer:
+    """
+    TF-IDF berbasis hashing dengan partial_fit/transform per chunk
+    """
+
+    def __init__(self, stop_words=None, n_features=2 ** 20, ngram_range=(1, 2),
+                 sublinear_tf=True, token_pattern=r'(?u)\b[a-zA-Z]{3,}\b'):
+        self.n_features = n_features
+        self.sublinear_tf = sublinear_tf
+        self.hasher = HashingVectorizer(
+            n_features=n_features,
+            stop_words=stop_words,
+            ngram_range=ngram_range,
+            token_pattern=token_pattern,
+            alternate_sign=False,
+            norm=None
+        )
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+        self._idf = None
+
+    def _counts(self, texts):
+        counts = self.hasher.transform(texts)
+        counts.sum_duplicates()
+        return counts
+
+    def partial_fit(self, texts):
+        """
+        Akumulasi document frequency dari satu chunk teks (sudah di-preprocess)
+        """
+        counts = self._counts(texts)
+        self.df += np.bincount(counts.indices, minlength=self.n_features)
+        self.n_docs += counts.shape[0]
+        self._idf = None
+        return self
+
+    @property
+    def idf_(self):
+        """IDF per kolom hash (dihitung ulang setelah partial_fit)"""
+        if self._idf is None:
+            self._idf = np.log((1 + self.n_docs) / (1 + self.df)) + 1
+        return self._idf
+
+    def transform(self, texts):
+        """
+        TF-IDF (L2) untuk satu chunk teks
+
+        Returns:
+            Sparse CSR matrix (len(texts) x n_features)
+        """
+        matrix = self._counts(texts).astype(np.float64)
+        if self.sublinear_tf:
+            np.log(matrix.data, out=matrix.data)
+            matrix.data += 1
+        matrix.data *= self.idf_[matrix.indices]
+        return normalize(matrix, norm='l2', copy=False)
+
+    def fit_transform(self, texts):
+        return self.partial_fit(texts).transform(texts)
+
+    def memory_bytes(self):
+        """Memori tetap tabel df + idf"""
+        return self.df.nbytes + self.n_features * np.dtype(np.float64).itemsize
@@ -0,0 +1,246 @@
+"""
+Text Preprocessing Engine
+Versi cepat dari pipeline preprocess_text dengan hasil yang identik.
+
+Setelah regex, teks hanya berisi [a-z] dan spasi, sehingga tokenizer Punkt
+(word_tokenize) tidak menambah apa-apa selain memecah beberapa kontraksi
+(misalnya 'cannot' -> 'can', 'not'). Engine ini:
+1. Memakai regex yang sudah di-compile
+2. Mengambil token dengan satu findall [a-z]+ (setara dengan replace + split)
+3. Memecah kontraksi dengan tabel kecil (meniru word_tokenize)
+4. Mengambil lemma dari tabel dict (LRU) alih-alih memanggil
+   WordNetLemmatizer untuk setiap token
+
+TextAnalyzer membungkus stopwords, lemmatizer dan engine menjadi satu objek
+immutable yang dibangun sekali per proses dan dipakai bersama semua filter.
+"""
+
+import re
+import threading
+from collections import OrderedDict
+
+from nltk.stem import PorterStemmer
+from nltk.tokenize import word_tokenize
+
+URL_RE = re.compile(r'http\S+|www\S+|https\S+')
+EMAIL_RE = re.compile(r'\S+@\S+')
+TOKEN_RE = re.compile(r'[a-z]+')
+
+# Kontraksi yang dipecah word_tokenize pada teks tanpa tanda baca
+# (CONTRACTIONS2 milik NLTKWordTokenizer)
+WORD_TOKENIZE_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
+MIN_TOKEN_LENGTH = 3
+
+
+def _word_tokenize_available():
+    """Cek apakah word_tokenize bisa dipakai (data punkt tersedia)"""
+    try:
+        word_tokenize('cannot')
+        return True
+    except Exception:
+        return False
+
+
+def reference_preprocess(text, stop_words, lemmatizer):
+    """
+    Pipeline preprocessing asli (regex + word_tokenize + WordNetLemmatizer).
+    Dipakai sebagai acuan untuk uji kesamaan hasil dengan PreprocessEngine.
+    """
+    if not text:
+        return ""
+
+    text = str(text).lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+
+    try:
+        tokens = word_tokenize(text)
+    except:
+        tokens = text.split()
+
+    tokens = [t for t in tokens if t not in stop_words and len(t) >= 3]
+
+    try:
+        tokens = [lemmatizer.lemmatize(t) for t in tokens]
+    except:
+        pass
+
+    tokens = [t for t in tokens if t not in stop_words and len(t) >= 3]
+
+    return ' '.join(tokens)
+
+
+class LemmaTable:
+    """
+    Tabel lemma berbasis dict dengan batas ukuran (LRU).
+    Lemma yang belum ada dihitung sekali dengan lemmatizer lalu disimpan;
+    entri yang dipakai dipindah ke akhir, entri terlama dibuang saat penuh.
+    """
+
+    def __init__(self, lemmatizer, max_entries=100000):
+        self.lemmatizer = lemmatizer
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._table = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _compute(self, token):
+        """
+        Lemma satu token
+
+        Returns:
+            (lemma, boleh disimpan di tabel)
+        """
+        try:
+            return self.lemmatizer.lemmatize(token), True
+        except LookupError:
+            # Data WordNet tidak tersedia: token tidak diubah (sama seperti
+            # pipeline asli) dan disimpan agar tidak dicoba ulang per token
+            return token, True
+        except Exception:
+            # Error lain: token tidak diubah untuk kali ini saja
+            with self._lock:
+                self.errors += 1
+            return token, False
+
+    def lookup(self, token):
+        """Ambil lemma untuk satu token"""
+        with self._lock:
+            lemma = self._table.get(token)
+            if lemma is not None:
+                self._table.move_to_end(token)
+                self.hits += 1
+                return lemma
+            self.misses += 1
+
+        lemma, cacheable = self._compute(token)
+        if cacheable:
+            with self._lock:
+                self._table[token] = lemma
+                self._table.move_to_end(token)
+                if len(self._table) > self.max_entries:
+                    self._table.popitem(last=False)
+        return lemma
+
+    def warm(self, tokens):
+        """Isi tabel dengan lemma untuk sekumpulan token (misalnya vocabulary)"""
+        for token in tokens:
+            if token not in self._table:
+                self.lookup(token)
+        return self
+
+    def __len__(self):
+        return len(self._table)
+
+    def stats(self):
+        with self._lock:
+            hits, misses, errors, size = self.hits, self.misses, self.errors, len(self._table)
+        total = hits + misses
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+            'errors': errors,
+            'size': size,
+            'max_entries': self.max_entries
+        }
+
+
+class PreprocessEngine:
+    """
+    Engine preprocessing: regex ter-compile, split biasa, dan tabel lemma.
+    Menghasilkan string yang sama dengan reference_preprocess.
+    """
+
+    def __init__(self, stop_words, lemmatizer, lemma_table=None):
+        self.stop_words = stop_words
+        self.lemma_table = lemma_table or LemmaTable(lemmatizer)
+        self.split_contractions = _word_tokenize_available()
+
+    def tokenize(self, text):
+        """
+        Lowercase, buang URL/email, lalu ambil token huruf [a-z]+
+
+        Returns:
+            List of tokens (sebelum stopword removal)
+        """
+        text = EMAIL_RE.sub('', URL_RE.sub('', str(text).lower()))
+        tokens = TOKEN_RE.findall(text)
+
+        if self.split_contractions:
+            split = []
+            for t in tokens:
+                parts = WORD_TOKENIZE_SPLITS.get(t)
+                if parts:
+                    split.extend(parts)
+                else:
+                    split.append(t)
+            tokens = split
+        return tokens
+
+    def process(self, text):
+        """
+        Preprocess teks menjadi string token (lihat ContentBasedFilter.preprocess_text)
+        """
+        if not text:
+            return ""
+
+        stop_words = self.stop_words
+        lookup = self.lemma_table.lookup
+        result = []
+        for t in self.tokenize(text):
+            if len(t) < MIN_TOKEN_LENGTH or t in stop_words:
+                continue
+            lemma = lookup(t)
+            if len(lemma) >= MIN_TOKEN_LENGTH and lemma not in stop_words:
+                result.append(lemma)
+        return ' '.join(result)
+
+    def warm(self, vocabulary):
+        """Isi tabel lemma dari vocabulary (misalnya feature names vectorizer)"""
+        tokens = set()
+        for term in vocabulary:
+            tokens.update(term.split())
+        self.lemma_table.warm(sorted(tokens))
+        return self
+
+
+class TextAnalyzer:
+    """
+    Komponen preprocessing bersama: stopwords (frozenset), list stopwords untuk
+    TfidfVectorizer, lemmatizer, tabel lemma, dan engine preprocessing.
+    Immutable setelah dibuat, aman dipakai bersama oleh banyak thread.
+    """
+
+    __slots__ = ('stop_words', 'stop_words_list', 'lemmatizer', 'stemmer', 'engine')
+
+    def __init__(self, stop_words, lemmatizer):
+        stop_words = frozenset(stop_words)
+        object.__setattr__(self, 'stop_words', stop_words)
+        # Dibuat sekali; TfidfVectorizer hanya membaca list ini
+        object.__setattr__(self, 'stop_words_list', sorted(stop_words))
+        object.__setattr__(self, 'lemmatizer', lemmatizer)
+        object.__setattr__(self, 'stemmer', PorterStemmer())
+        object.__setattr__(self, 'engine', PreprocessEngine(stop_words, lemmatizer))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('TextAnalyzer is read-only')
+
+    def __delattr__(self, name):
+        raise AttributeError('TextAnalyzer is read-only')
+
+    def process(self, text):
+        """Preprocess teks dengan engine analyzer"""
+        return self.engine.process(text)
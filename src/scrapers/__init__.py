@@ -2,9 +2,26 @@
 from .scholar_scraper import scrape_papers_with_abstracts
 from .mendeley_scraper import scrape_mendeley_papers
 from .semantic_scholar import search_semantic_scholar
+from .fanout import search_sources
+from .http_client import (HttpClient, UpstreamError, DeadlineExceeded, FetchDeadline, get_http_client,
+                          configure_http_client)
+from .rate_limiter import RateLimiter, RetryPolicy
+from .response_cache import ResponseCache, get_response_cache, configure_response_cache
 
 __all__ = [
     'scrape_papers_with_abstracts',
     'scrape_mendeley_papers', 
-    'search_semantic_scholar'
+    'search_semantic_scholar',
+    'search_sources',
+    'HttpClient',
+    'get_http_client',
+    'configure_http_client',
+    'UpstreamError',
+    'DeadlineExceeded',
+    'FetchDeadline',
+    'RateLimiter',
+    'RetryPolicy',
+    'ResponseCache',
+    'get_response_cache',
+    'configure_response_cache'
 ]
@@ -0,0 +1,252 @@
+"""
+Source Fan-Out
+Query semua source yang dipilih sekaligus (thread pool bersama) dengan
+timeout per source, sehingga latensi /api/search mendekati source paling
+lambat, bukan jumlah latensi semua source.
+
+- 'both'    : Semantic Scholar + Mendeley (max_results // 2 masing-masing)
+- 'scholar' : Google Scholar, dengan Semantic Scholar sebagai fallback yang
+              baru dijalankan jika Google Scholar gagal, kosong, atau sisa
+              waktunya tinggal sepanjang timeout fallback
+- 'semantic' / 'mendeley' : satu source
+
+Timeout per source dihitung sejak fetch mulai berjalan, bukan sejak masuk
+antrean thread pool. Setiap fetch berjalan di dalam FetchDeadline: timeout
+request HTTP, retry dan backoff dibatasi sisa waktunya, dan fetch yang
+melewati timeout / tidak diperlukan lagi dibatalkan sehingga thread-nya
+segera kembali ke pool (pencarian berikutnya tidak ikut tertahan).
+Hasil dicatat saat tiba; papers digabung mengikuti urutan source di plan,
+sehingga hasil tetap deterministik.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .http_client import FetchDeadline, deadline_scope
+from .mendeley_scraper import scrape_mendeley_papers
+from .scholar_scraper import scrape_papers_with_abstracts
+from .semantic_scholar import search_semantic_scholar
+
+# Fungsi pencarian per source: fetch(query, max_results, filters) -> list papers
+SOURCE_FETCHERS = {
+    'semantic': search_semantic_scholar,
+    'mendeley': scrape_mendeley_papers,
+    'scholar': scrape_papers_with_abstracts
+}
+
+SOURCE_LABELS = {
+    'semantic': 'Semantic Scholar',
+    'mendeley': 'Mendeley',
+    'scholar': 'Google Scholar'
+}
+
+# Timeout default per source (detik); scraping Selenium jauh lebih lambat dari API
+SOURCE_TIMEOUTS = {
+    'semantic': 35,
+    'mendeley': 45,
+    'scholar': 120
+}
+
+# Source yang bisa mengirim hasil per halaman saat tiba (callback on_page)
+STREAMING_SOURCES = {'semantic'}
+
+MAX_WORKERS = 8
+
+# Interval cek fetch yang masih antre di thread pool (deadline belum mulai)
+QUEUE_POLL_INTERVAL = 0.1
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor():
+    """Thread pool bersama (fetch yang dibatalkan berhenti di request berikutnya)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix='source-fetch')
+        return _executor
+
+
+def plan_sources(source, max_results):
+    """
+    Daftar source untuk pilihan source dari UI
+
+    Returns:
+        List of (nama source, max_results, fallback)
+    """
+    if source == 'both':
+        return [('semantic', max_results // 2, False), ('mendeley', max_results // 2, False)]
+    if source == 'scholar':
+        return [('scholar', max_results, False), ('semantic', max_results, True)]
+    if source in ('semantic', 'mendeley'):
+        return [(source, max_results, False)]
+    return []
+
+
+def _fetch(fetch, name, query, max_results, filters, on_page=None):
+    started = time.perf_counter()
+    if on_page is not None and name in STREAMING_SOURCES:
+        papers = fetch(query, max_results, filters, on_page=on_page) or []
+    else:
+        papers = fetch(query, max_results, filters) or []
+    for paper in papers:
+        paper['source'] = SOURCE_LABELS[name]
+    return papers, time.perf_counter() - started
+
+
+class _SourceFetch:
+    """
+    Satu fetch source di thread pool. Deadline dihitung sejak fetch mulai
+    berjalan (bukan sejak masuk antrean), dan cancel() menghentikan fetch
+    yang sedang berjalan di request HTTP berikutnya (FetchDeadline).
+    """
+
+    def __init__(self, position, name, limit, fallback, timeout):
+        self.position = position
+        self.name = name
+        self.limit = limit
+        self.fallback = fallback
+        self.timeout = timeout
+        self.future = None
+        self.deadline = None
+        self.expires_at = None   # time.perf_counter() saat deadline lewat
+        self.cancelled = False
+
+    def submit(self, executor, fetch, query, filters, on_page):
+        self.future = executor.submit(self._run, fetch, query, filters, on_page)
+        return self.future
+
+    def _run(self, fetch, query, filters, on_page):
+        self.deadline = FetchDeadline(self.timeout)
+        self.expires_at = time.perf_counter() + self.timeout
+        if self.cancelled:
+            self.deadline.cancel()
+        with deadline_scope(self.deadline):
+            self.deadline.check(SOURCE_LABELS[self.name])
+            return _fetch(fetch, self.name, query, self.limit, filters, on_page)
+
+    def cancel(self):
+        """Batalkan fetch: dibuang dari antrean, atau dihentikan jika sedang berjalan"""
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+        deadline = self.deadline
+        if deadline is not None:
+            deadline.cancel()
+
+
+def search_sources(query, source, max_results=20, filters=None, timeouts=None, fetchers=None,
+                   on_page=None):
+    """
+    Cari papers di semua source yang dipilih secara bersamaan
+
+    Fallback (Semantic Scholar untuk 'scholar') hanya dijalankan jika
+    source utama gagal, kosong, atau sisa waktunya tinggal sepanjang
+    timeout fallback, sehingga pencarian yang berhasil tidak memakai kuota
+    API fallback.
+
+    Args:
+        query: Search query
+        source: 'semantic', 'mendeley', 'scholar' atau 'both'
+        max_results: Jumlah maksimum papers
+        filters: Filter pencarian (year_start, year_end, ...)
+        timeouts: Override timeout per source (detik, sejak fetch mulai)
+        fetchers: Override fungsi pencarian per source
+        on_page: Callback(papers) per halaman hasil saat tiba (source di
+            STREAMING_SOURCES), dipanggil dari thread source
+
+    Returns:
+        (papers, report) - report per source: status ('ok', 'error',
+        'timeout', 'skipped'), jumlah papers dan waktu (ms)
+    """
+    timeouts = dict(SOURCE_TIMEOUTS, **(timeouts or {}))
+    fetchers = dict(SOURCE_FETCHERS, **(fetchers or {}))
+    plan = plan_sources(source, max_results)
+    executor = _get_executor()
+
+    tasks = [
+        _SourceFetch(position, name, limit, fallback, timeouts[name])
+        for position, (name, limit, fallback) in enumerate(plan)
+    ]
+    primaries = [task for task in tasks if not task.fallback]
+    fallbacks = [task for task in tasks if task.fallback]
+
+    def start(task):
+        task.submit(executor, fetchers[task.name], query, filters, on_page)
+        pending[task.future] = task
+
+    results = {}
+    report = {}
+    pending = {}
+    for task in primaries:
+        start(task)
+
+    while True:
+        now = time.perf_counter()
+        for future, task in list(pending.items()):
+            if task.expires_at is not None and task.expires_at <= now:
+                del pending[future]
+                task.cancel()
+                report[task.name] = {'status': 'timeout', 'papers': 0,
+                                     'elapsed_ms': round(task.timeout * 1000, 1)}
+                print(f"[WARNING] {SOURCE_LABELS[task.name]} timed out after {task.timeout}s")
+
+        running = [task for task in primaries if task.future in pending]
+        if not running and any(results.get(task.position) for task in primaries):
+            # Source utama sudah memberi hasil: fallback tidak diperlukan
+            for future, task in list(pending.items()):
+                del pending[future]
+                task.cancel()
+            break
+
+        # Fallback: source utama selesai tanpa hasil, atau mendekati deadline-nya
+        wake_at = []
+        for task in fallbacks:
+            if task.future is not None:
+                continue
+            due = [p.expires_at - task.timeout for p in running if p.expires_at is not None]
+            if not running or any(at <= now for at in due):
+                print(f"[DEBUG] Starting {SOURCE_LABELS[task.name]} fallback")
+                start(task)
+            else:
+                wake_at.extend(due)
+        if not pending:
+            break
+
+        # Tunggu hasil berikutnya, deadline berikutnya, atau fetch yang masih antre
+        wake_at.extend(task.expires_at for task in pending.values() if task.expires_at is not None)
+        timeout = max(min(wake_at) - now, 0) if wake_at else None
+        if any(task.expires_at is None for task in pending.values()):
+            timeout = QUEUE_POLL_INTERVAL if timeout is None else min(timeout, QUEUE_POLL_INTERVAL)
+        done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            task = pending.pop(future)
+            try:
+                papers, elapsed = future.result()
+            except Exception as e:
+                elapsed = time.perf_counter() - (task.expires_at - task.timeout) if task.expires_at else 0.0
+                report[task.name] = {'status': 'error', 'papers': 0, 'error': str(e),
+                                     'elapsed_ms': round(elapsed * 1000, 1)}
+                print(f"[ERROR] {SOURCE_LABELS[task.name]} failed: {e}")
+                continue
+            results[task.position] = papers
+            report[task.name] = {'status': 'ok', 'papers': len(papers), 'elapsed_ms': round(elapsed * 1000, 1)}
+            print(f"[DEBUG] Found {len(papers)} papers from {SOURCE_LABELS[task.name]}"
+                  f"{' (fallback)' if task.fallback else ''} in {elapsed:.2f}s")
+
+    for task in tasks:
+        report.setdefault(task.name, {'status': 'skipped', 'papers': 0, 'elapsed_ms': 0.0})
+    report = {task.name: report[task.name] for task in tasks}
+
+    papers = []
+    for task in primaries:
+        papers.extend(results.get(task.position, []))
+    if not papers:
+        # Semua source utama kosong / gagal: pakai fallback
+        for task in fallbacks:
+            if results.get(task.position):
+                print(f"[DEBUG] Using {SOURCE_LABELS[task.name]} fallback results")
+                papers.extend(results[task.position])
+    return papers, report
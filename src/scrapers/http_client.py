@@ -0,0 +1,353 @@
+"""
+HTTP Client
+Satu lapisan HTTP bersama untuk semua scraper (Semantic Scholar, Mendeley,
+PDF Google Scholar), menggantikan requests.get langsung yang membuka
+koneksi baru (DNS + TCP + TLS) di setiap request.
+
+- Satu connection pool per host (urllib3), koneksi keep-alive dipakai ulang
+- Ukuran pool bisa diatur (pool_connections = jumlah host yang disimpan,
+  pool_maxsize = koneksi per host, cukup untuk fan-out paralel)
+- Response di-compress (Accept-Encoding: gzip, deflate)
+- Session per thread (cookie tidak dibagi antar thread), tetapi semua
+  session memakai adapter yang sama sehingga pool koneksi tetap bersama
+- Statistik per host: request, koneksi baru dan koneksi yang dipakai ulang
+- Rate limit per host + retry dengan backoff (lihat rate_limiter)
+- Deadline per fetch (deadline_scope): timeout, retry, backoff dan antrean
+  rate limit tidak melewati sisa waktu fetch, dan fetch yang dibatalkan
+  berhenti di request berikutnya (lihat fanout)
+"""
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .rate_limiter import HOST_LIMITS, RateLimiter, RetryPolicy, parse_retry_after
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive'
+}
+
+
+class UpstreamError(Exception):
+    """API upstream tetap menolak (429 / 5xx) setelah semua retry"""
+
+    def __init__(self, host, status_code, retry_after=None):
+        self.host = host
+        self.status_code = status_code
+        self.retry_after = retry_after
+        message = f"{host} returned status {status_code}"
+        if retry_after:
+            message += f" (retry after {retry_after:.0f}s)"
+        super().__init__(message)
+
+
+class DeadlineExceeded(requests.Timeout):
+    """Deadline fetch sudah lewat atau fetch dibatalkan (lihat FetchDeadline)"""
+
+
+class FetchDeadline:
+    """
+    Batas waktu dan pembatalan untuk semua request dalam satu fetch source.
+    Dipasang dengan deadline_scope; berlaku juga di thread lain yang
+    menjalankan request dengan context yang disalin (contextvars).
+
+    Args:
+        seconds: Sisa waktu fetch (detik, dihitung sejak fetch mulai)
+    """
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Batalkan fetch: request berikutnya langsung gagal"""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def remaining(self):
+        """Sisa waktu (detik), 0 jika sudah lewat / dibatalkan"""
+        if self._cancelled.is_set():
+            return 0.0
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def check(self, host=''):
+        """
+        Returns:
+            Sisa waktu (detik)
+
+        Raises:
+            DeadlineExceeded: Deadline sudah lewat atau fetch dibatalkan
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            reason = 'cancelled' if self.cancelled else f"deadline of {self.seconds}s exceeded"
+            raise DeadlineExceeded(f"{host or 'fetch'}: {reason}")
+        return remaining
+
+
+_deadline = contextvars.ContextVar('fetch_deadline', default=None)
+
+
+def current_deadline():
+    """FetchDeadline yang berlaku di context ini (None = tanpa batas)"""
+    return _deadline.get()
+
+
+@contextmanager
+def deadline_scope(deadline):
+    """Pasang FetchDeadline untuk semua request di dalam blok ini"""
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+def _clamp_timeout(timeout, remaining):
+    """Timeout request (angka atau (connect, read)) dibatasi sisa waktu fetch"""
+    if timeout is None:
+        return remaining
+    if isinstance(timeout, tuple):
+        return tuple(remaining if t is None else min(t, remaining) for t in timeout)
+    return min(timeout, remaining)
+
+
+class _TrackingAdapter(HTTPAdapter):
+    """HTTPAdapter yang mencatat connection pool setiap host"""
+
+    def __init__(self, **kwargs):
+        self.pools = {}    # id(pool) -> (host, pool) untuk pool yang masih aktif
+        self.retired = {}  # host -> [requests, connections] dari pool yang sudah di-evict
+        self._pools_lock = threading.Lock()
+        super().__init__(**kwargs)
+
+    def _track(self, pool):
+        with self._pools_lock:
+            if id(pool) not in self.pools:
+                # Pool yang ditutup PoolManager (LRU) diringkas jadi angka
+                for key, (host, old_pool) in list(self.pools.items()):
+                    if old_pool.pool is None:
+                        counts = self.retired.setdefault(host, [0, 0])
+                        counts[0] += old_pool.num_requests
+                        counts[1] += old_pool.num_connections
+                        del self.pools[key]
+                self.pools[id(pool)] = (pool.host, pool)
+        return pool
+
+    def counts(self):
+        """Jumlah request dan koneksi baru per host"""
+        with self._pools_lock:
+            counts = {host: list(values) for host, values in self.retired.items()}
+            for host, pool in self.pools.values():
+                entry = counts.setdefault(host, [0, 0])
+                entry[0] += pool.num_requests
+                entry[1] += pool.num_connections
+        return counts
+
+    def get_connection_with_tls_context(self, request, verify, proxies=None, cert=None):
+        return self._track(super().get_connection_with_tls_context(request, verify, proxies=proxies, cert=cert))
+
+    def get_connection(self, url, proxies=None):
+        return self._track(super().get_connection(url, proxies=proxies))
+
+
+class HttpClient:
+    """
+    HTTP client dengan connection pool per host dan keep-alive
+
+    Args:
+        pool_connections: Jumlah host yang pool-nya disimpan
+        pool_maxsize: Koneksi maksimum yang disimpan per host
+        timeout: Timeout default per request (detik)
+        headers: Header tambahan untuk semua request
+        rate_limiter: RateLimiter per host (default: HOST_LIMITS)
+        retry: RetryPolicy untuk 429 / 5xx / error koneksi
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=16, timeout=30, headers=None,
+                 rate_limiter=None, retry=None):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.headers = dict(DEFAULT_HEADERS, **(headers or {}))
+        self.adapter = _TrackingAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.retry = retry or RetryPolicy()
+        self.errors = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """requests.Session untuk thread ini (adapter / pool bersama)"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            session.mount('http://', self.adapter)
+            session.mount('https://', self.adapter)
+            self._local.session = session
+        return session
+
+    def request(self, method, url, **kwargs):
+        """
+        Kirim request lewat session bersama. Setiap percobaan menunggu
+        token rate limiter host; GET / HEAD yang kena 429, 5xx atau error
+        koneksi di-retry dengan backoff (Retry-After dihormati). Di dalam
+        deadline_scope, timeout dan semua penantian dibatasi sisa waktu fetch.
+
+        Args:
+            method: HTTP method
+            url: URL tujuan
+            **kwargs: Argumen requests (params, headers, timeout, stream, ...)
+
+        Returns:
+            requests.Response (status 429 / 5xx jika retry habis)
+
+        Raises:
+            DeadlineExceeded: Deadline fetch lewat / fetch dibatalkan
+        """
+        timeout = kwargs.pop('timeout', self.timeout)
+        host = urlsplit(url).hostname or ''
+        limiter = self.rate_limiter
+        retries = self.retry.max_retries if method.upper() in ('GET', 'HEAD') else 0
+        deadline = current_deadline()
+
+        for attempt in range(retries + 1):
+            if deadline is None:
+                kwargs['timeout'] = timeout
+                limiter.acquire(host)
+            else:
+                try:
+                    limiter.acquire(host, max_wait=deadline.check(host))
+                except TimeoutError as e:
+                    raise DeadlineExceeded(str(e)) from e
+                kwargs['timeout'] = _clamp_timeout(timeout, deadline.check(host))
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                limiter.on_connection_error(host)
+                if attempt == retries:
+                    limiter.on_failure(host)
+                    with self._lock:
+                        self.errors += 1
+                    raise
+                print(f"[WARNING] {host}: {type(e).__name__}, retry {attempt + 1}/{retries}")
+                self._backoff(host, self.retry.backoff(attempt), deadline)
+                continue
+            except requests.RequestException:
+                with self._lock:
+                    self.errors += 1
+                raise
+
+            if response.status_code not in self.retry.statuses:
+                limiter.on_success(host)
+                return response
+
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            if retry_after is not None and retry_after > self.retry.max_retry_after:
+                # Terlalu lama untuk ditunggu dalam satu request: jangan pause host
+                limiter.on_error_status(host, response.status_code)
+                limiter.on_failure(host)
+                return response
+            limiter.on_error_status(host, response.status_code, retry_after)
+            if attempt == retries:
+                limiter.on_failure(host)
+                return response
+
+            print(f"[WARNING] {host} returned {response.status_code}, retry {attempt + 1}/{retries}"
+                  f"{f' after {retry_after:.1f}s' if retry_after else ''}")
+            response.close()
+            # Retry-After: host di-pause, token berikutnya menunggu sampai waktunya
+            self._backoff(host, 0.0 if retry_after is not None else self.retry.backoff(attempt), deadline)
+
+    def _backoff(self, host, seconds, deadline):
+        """Tidur sebelum retry; gagal langsung jika backoff melewati deadline fetch"""
+        if deadline is not None and seconds >= deadline.check(host):
+            self.rate_limiter.on_failure(host)
+            with self._lock:
+                self.errors += 1
+            raise DeadlineExceeded(f"{host}: retry backoff exceeds fetch deadline")
+        self.rate_limiter.backoff(host, seconds)
+
+    def get(self, url, **kwargs):
+        """GET lewat session bersama (lihat request)"""
+        return self.request('GET', url, **kwargs)
+
+    def stats(self):
+        """
+        Statistik koneksi: request, koneksi baru dan koneksi yang dipakai
+        ulang, total dan per host
+
+        Returns:
+            Dictionary statistik
+        """
+        hosts = {
+            host: {'requests': n_requests, 'connections': connections,
+                   'reused': max(n_requests - connections, 0)}
+            for host, (n_requests, connections) in self.adapter.counts().items()
+        }
+
+        total_requests = sum(entry['requests'] for entry in hosts.values())
+        total_reused = sum(entry['reused'] for entry in hosts.values())
+        return {
+            'requests': total_requests,
+            'connections': sum(entry['connections'] for entry in hosts.values()),
+            'reused': total_reused,
+            'reuse_rate': round(total_reused / total_requests, 4) if total_requests else 0.0,
+            'errors': self.errors,
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'hosts': hosts,
+            'rate_limits': self.rate_limiter.stats()
+        }
+
+    def close(self):
+        """Tutup semua koneksi (pool bersama di adapter)"""
+        self.adapter.close()
+
+
+# Client global untuk semua scraper
+_http_client = HttpClient()
+
+
+def get_http_client():
+    """Ambil HTTP client global"""
+    return _http_client
+
+
+def configure_http_client(pool_connections=10, pool_maxsize=16, timeout=30, headers=None,
+                          rate_limits=None, max_retries=3):
+    """
+    Ganti HTTP client global (koneksi client lama ditutup)
+
+    Args:
+        pool_connections: Jumlah host yang pool-nya disimpan
+        pool_maxsize: Koneksi maksimum per host
+        timeout: Timeout default per request (detik)
+        headers: Header tambahan untuk semua request
+        rate_limits: Dictionary host -> (request per detik, burst)
+        max_retries: Retry maksimum untuk 429 / 5xx / error koneksi
+
+    Returns:
+        HttpClient yang baru
+    """
+    global _http_client
+    old_client = _http_client
+    limits = dict(HOST_LIMITS, **(rate_limits or {}))
+    _http_client = HttpClient(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                              timeout=timeout, headers=headers, rate_limiter=RateLimiter(limits),
+                              retry=RetryPolicy(max_retries=max_retries))
+    old_client.close()
+    return _http_client
@@ -2,10 +2,13 @@
 Mendeley Scraper - Menggunakan Mendeley Catalog API (Public)
 API ini tidak memerlukan OAuth untuk pencarian catalog publik
 """
-import requests
 import re
 import time
 
+from .http_client import UpstreamError
+from .rate_limiter import RETRY_STATUSES
+from .response_cache import cached_get_json
+
 # Mendeley Public Catalog Search API
 MENDELEY_CATALOG_SEARCH_URL = "https://api.mendeley.com/catalog"
 
@@ -13,6 +16,10 @@ def scrape_mendeley_papers(query, max_results=20, filters=None):
     """
     Scrape papers dari Mendeley Catalog API
     API ini publik dan tidak memerlukan autentikasi untuk pencarian dasar
+
+    Raises:
+        UpstreamError: API menolak request (rate limit / server error)
+            setelah retry, agar tidak terlihat seperti "tidak ada hasil"
     """
     papers = []
     
@@ -46,19 +53,20 @@ def scrape_mendeley_papers(query, max_results=20, filters=None):
         }
         
         # Try the Catalog API first
-        response = requests.get(
+        status_code, data = cached_get_json(
             MENDELEY_CATALOG_SEARCH_URL,
             params=params,
             headers=headers,
             timeout=30
         )
         
-        if response.status_code == 200:
-            data = response.json()
+        if status_code in RETRY_STATUSES:
+            raise UpstreamError('api.mendeley.com', status_code)
+        if status_code == 200:
             papers = parse_mendeley_api_response(data, max_results)
             print(f"[DEBUG] Found {len(papers)} papers from Mendeley API")
         else:
-            print(f"[DEBUG] Mendeley API returned status {response.status_code}")
+            print(f"[DEBUG] Mendeley API returned status {status_code}")
             # Fallback to web scraping approach
             papers = scrape_mendeley_web(query, max_results, filters)
         
@@ -74,6 +82,8 @@ def scrape_mendeley_papers(query, max_results=20, filters=None):
         
         return papers[:max_results]
     
+    except UpstreamError:
+        raise
     except Exception as e:
         print(f"[ERROR] Mendeley search error: {e}")
         # Try web scraping as fallback
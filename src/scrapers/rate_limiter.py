@@ -0,0 +1,274 @@
+"""
+Rate Limiter & Retry
+Pembatas request per host upstream untuk HTTP client scraper, dipakai
+bersama oleh semua worker thread (fan-out source, halaman Semantic Scholar).
+
+- Token bucket per host: rate request/detik dengan burst. Token dipesan
+  di bawah lock lalu thread tidur di luar lock, sehingga thread dilayani
+  bergiliran tanpa busy-wait
+- Adaptif (AIMD): response 429 menurunkan rate host (x0.5, minimal
+  min_rate, paling sering sekali per detik karena 429 dari request yang
+  bersamaan datang berurutan), response sukses menaikkan rate secara
+  linear terhadap waktu sampai rate yang dikonfigurasi. Throughput
+  mendekati kuota upstream tanpa terus-menerus kena 429
+- Retry-After (detik atau tanggal HTTP) menghentikan semua request ke host
+  tersebut sampai waktunya lewat
+- Retry dengan exponential backoff + full jitter untuk 429, 5xx dan error
+  koneksi (hanya GET / HEAD)
+- Statistik per host: waktu tertahan (throttled), retry, 429, 5xx, gagal
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+# Batas default per host: (request per detik, burst)
+HOST_LIMITS = {
+    'api.semanticscholar.org': (10.0, 10),
+    'api.mendeley.com': (10.0, 10)
+}
+DEFAULT_LIMIT = (20.0, 20)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def parse_retry_after(value, now=None):
+    """
+    Nilai header Retry-After dalam detik
+
+    Returns:
+        Detik (float >= 0), atau None jika header kosong / tidak valid
+    """
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when is None:
+        return None
+    now = time.time() if now is None else now
+    return max(when.timestamp() - now, 0.0)
+
+
+class TokenBucket:
+    """
+    Token bucket adaptif untuk satu host
+
+    Args:
+        rate: Request per detik maksimum
+        burst: Jumlah request yang boleh langsung dikirim
+        min_rate: Rate terendah setelah diturunkan karena 429
+        increase: Kenaikan rate per detik tanpa 429 (fraksi dari rate maksimum)
+    """
+
+    DECREASE_COOLDOWN = 1.0
+
+    def __init__(self, rate, burst, min_rate=0.5, increase=0.05):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.burst = burst
+        self.min_rate = min(min_rate, self.max_rate)
+        self.increase = increase
+        self.tokens = float(burst)
+        self.paused_until = 0.0
+        self._last = time.monotonic()
+        self._last_decrease = float('-inf')
+        self._last_increase = self._last
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        # Token tidak bertambah selama host di-pause (Retry-After)
+        start = max(self._last, self.paused_until)
+        if now > start:
+            self.tokens = min(self.burst, self.tokens + (now - start) * self.rate)
+        self._last = max(now, self._last)
+
+    def reserve(self):
+        """
+        Pesan satu token
+
+        Returns:
+            Detik yang harus ditunggu sebelum request dikirim
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.tokens -= 1
+            wait = max(self.paused_until - now, 0.0)
+            if self.tokens < 0:
+                wait += -self.tokens / self.rate
+            return wait
+
+    def release(self):
+        """Kembalikan token yang dipesan tetapi tidak dipakai"""
+        with self._lock:
+            self.tokens = min(self.burst, self.tokens + 1)
+
+    def pause(self, seconds):
+        """Tahan semua request sampai seconds detik lagi (Retry-After)"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.paused_until = max(self.paused_until, now + seconds)
+            self.tokens = min(self.tokens, 0.0)
+
+    def slow_down(self):
+        """Response 429: turunkan rate (multiplicative decrease)"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.DECREASE_COOLDOWN:
+                return
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * 0.5)
+            self._last_decrease = now
+            self._last_increase = now
+
+    def speed_up(self):
+        """Response sukses: naikkan rate (additive increase, per detik)"""
+        with self._lock:
+            now = time.monotonic()
+            if self.rate < self.max_rate:
+                self._refill(now)
+                elapsed = now - self._last_increase
+                self.rate = min(self.max_rate, self.rate + self.max_rate * self.increase * elapsed)
+            self._last_increase = now
+
+
+class RetryPolicy:
+    """
+    Aturan retry request upstream
+
+    Args:
+        max_retries: Jumlah retry maksimum setelah request pertama
+        backoff_base: Backoff retry pertama (detik), dikali 2 setiap retry
+        backoff_max: Backoff maksimum (detik)
+        max_retry_after: Retry-After yang lebih lama dari ini tidak ditunggu
+        statuses: Status HTTP yang di-retry
+    """
+
+    def __init__(self, max_retries=3, backoff_base=0.5, backoff_max=30.0, max_retry_after=60.0,
+                 statuses=None):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_retry_after = max_retry_after
+        self.statuses = set(RETRY_STATUSES if statuses is None else statuses)
+
+    def backoff(self, attempt):
+        """Exponential backoff dengan full jitter untuk retry ke-attempt (0 = pertama)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+
+class RateLimiter:
+    """
+    Token bucket per host + statistik throttling
+
+    Args:
+        limits: Dictionary host -> (rate, burst), default HOST_LIMITS
+        default: (rate, burst) untuk host lain
+        min_rate: Rate terendah setelah diturunkan karena 429
+    """
+
+    def __init__(self, limits=None, default=DEFAULT_LIMIT, min_rate=0.5):
+        self.limits = dict(HOST_LIMITS if limits is None else limits)
+        self.default = default
+        self.min_rate = min_rate
+        self._buckets = {}
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host):
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                rate, burst = self.limits.get(host, self.default)
+                bucket = self._buckets[host] = TokenBucket(rate, burst, min_rate=self.min_rate)
+                self._stats[host] = {
+                    'requests': 0, 'throttled_seconds': 0.0, 'backoff_seconds': 0.0,
+                    'retries': 0, 'throttled_responses': 0, 'server_errors': 0,
+                    'connection_errors': 0, 'failures': 0
+                }
+            return bucket
+
+    def _record(self, host, **increments):
+        with self._lock:
+            entry = self._stats[host]
+            for name, value in increments.items():
+                entry[name] += value
+
+    def acquire(self, host, max_wait=None):
+        """
+        Tunggu sampai request ke host boleh dikirim
+
+        Args:
+            host: Host tujuan
+            max_wait: Penantian maksimum (detik); jika lebih lama, token
+                dikembalikan dan request tidak dikirim
+
+        Returns:
+            Detik yang ditunggu
+
+        Raises:
+            TimeoutError: Penantian melebihi max_wait
+        """
+        bucket = self._bucket(host)
+        wait = bucket.reserve()
+        if max_wait is not None and wait > max_wait:
+            bucket.release()
+            raise TimeoutError(f"{host}: rate limit wait {wait:.1f}s exceeds {max_wait:.1f}s")
+        if wait > 0:
+            time.sleep(wait)
+        self._record(host, requests=1, throttled_seconds=wait)
+        return wait
+
+    def on_success(self, host):
+        self._bucket(host).speed_up()
+
+    def on_error_status(self, host, status_code, retry_after=None):
+        """Catat 429 / 5xx: 429 menurunkan rate, Retry-After menahan host"""
+        bucket = self._bucket(host)
+        if status_code == 429:
+            bucket.slow_down()
+            self._record(host, throttled_responses=1)
+        else:
+            self._record(host, server_errors=1)
+        if retry_after:
+            bucket.pause(retry_after)
+
+    def on_connection_error(self, host):
+        self._record(host, connection_errors=1)
+
+    def backoff(self, host, seconds):
+        """Tidur sebelum retry (hanya thread ini, host lain tidak tertahan)"""
+        if seconds > 0:
+            time.sleep(seconds)
+        self._record(host, retries=1, backoff_seconds=seconds)
+
+    def on_failure(self, host):
+        """Retry habis: request dikembalikan / dilempar ke pemanggil"""
+        self._record(host, failures=1)
+
+    def stats(self):
+        """
+        Statistik per host: rate saat ini, request, waktu tertahan, retry,
+        429, 5xx dan kegagalan setelah retry habis
+
+        Returns:
+            Dictionary host -> statistik
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+            stats = {host: dict(entry) for host, entry in self._stats.items()}
+        for host, entry in stats.items():
+            entry['rate'] = round(buckets[host].rate, 3)
+            entry['max_rate'] = buckets[host].max_rate
+            entry['throttled_seconds'] = round(entry['throttled_seconds'], 3)
+            entry['backoff_seconds'] = round(entry['backoff_seconds'], 3)
+        return stats
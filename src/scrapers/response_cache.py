@@ -0,0 +1,310 @@
+"""
+Scraper Response Cache
+Cache SQLite untuk response JSON API scraper (Semantic Scholar search dan
+Mendeley catalog), sehingga pencarian yang diulang - termasuk run_testing.py
+dan restart server - tidak mengakses jaringan lagi.
+
+- Kunci: endpoint + parameter ter-kanonikalisasi (query lowercase tanpa
+  spasi ganda, fields diurutkan, semua nilai string). Parameter limit tidak
+  masuk kunci: response dengan limit 100 juga melayani limit 20 (scraper
+  memotong hasil ke max_results), sehingga pencarian yang tumpang tindih
+  memakai entri yang sama
+- Payload JSON dikompresi zlib
+- TTL: entri segar dipakai langsung; entri kedaluwarsa yang masih di dalam
+  jendela stale dikembalikan langsung sambil di-refresh di background
+  (stale-while-revalidate), dan juga dipakai jika API gagal (error
+  koneksi, 429 / 5xx setelah retry)
+- Hanya response status 200 yang disimpan
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+import requests
+
+from .http_client import get_http_client
+from .rate_limiter import RETRY_STATUSES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    params TEXT NOT NULL,
+    limit_value INTEGER,
+    created_at REAL NOT NULL,
+    raw_size INTEGER NOT NULL,
+    payload BLOB NOT NULL
+)
+"""
+
+
+def canonical_params(params, limit_param='limit'):
+    """
+    Parameter request dalam bentuk kanonik untuk kunci cache
+
+    Returns:
+        (dictionary parameter tanpa limit, nilai limit atau None)
+    """
+    canonical = {}
+    limit = None
+    for name, value in (params or {}).items():
+        if value is None or value == '':
+            continue
+        if name == limit_param:
+            limit = int(value)
+        elif name == 'query':
+            canonical[name] = ' '.join(str(value).lower().split())
+        elif name == 'fields':
+            canonical[name] = ','.join(sorted(f.strip() for f in str(value).split(',') if f.strip()))
+        else:
+            canonical[name] = str(value)
+    return canonical, limit
+
+
+class ResponseCache:
+    """
+    Cache response JSON di SQLite dengan TTL dan stale-while-revalidate
+
+    Args:
+        path: File SQLite (':memory:' = hanya selama proses berjalan)
+        ttl_seconds: Umur entri yang dianggap segar (0 = cache nonaktif)
+        stale_seconds: Jendela setelah TTL di mana entri lama masih dipakai
+        stale_while_revalidate: Kembalikan entri stale lalu refresh di background
+        compress_level: Level kompresi zlib (1-9)
+    """
+
+    def __init__(self, path=':memory:', ttl_seconds=86400, stale_seconds=7 * 86400,
+                 stale_while_revalidate=True, compress_level=6):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self.stale_while_revalidate = stale_while_revalidate
+        self.compress_level = compress_level
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.errors = 0
+        self._inflight = set()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ':memory:':
+            self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    @property
+    def enabled(self):
+        return self.ttl_seconds > 0
+
+    def make_key(self, url, params, limit_param='limit'):
+        """
+        Kunci cache untuk satu request
+
+        Returns:
+            (key, parameter kanonik sebagai JSON, limit)
+        """
+        canonical, limit = canonical_params(params, limit_param)
+        encoded = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+        key = hashlib.sha1(f"{url}\n{encoded}".encode('utf-8')).hexdigest()
+        return key, encoded, limit
+
+    def _lookup(self, key):
+        with self._lock:
+            return self._conn.execute(
+                'SELECT created_at, limit_value, payload FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+    def _store(self, key, url, encoded_params, limit, data):
+        raw = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        payload = zlib.compress(raw, self.compress_level)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, url, encoded_params, limit, time.time(), len(raw), payload)
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def _decode(payload):
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def _fetch(self, key, url, encoded_params, limit, params, headers, timeout):
+        response = get_http_client().get(url, params=params, headers=headers, timeout=timeout)
+        if response.status_code != 200:
+            return response.status_code, None
+        data = response.json()
+        self._store(key, url, encoded_params, limit, data)
+        return 200, data
+
+    def _record(self, **increments):
+        """Tambah counter statistik (dipanggil dari banyak thread)"""
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def _revalidate(self, key, url, encoded_params, limit, params, headers, timeout):
+        """Refresh entri stale di background (satu refresh per kunci)"""
+        with self._lock:
+            if key in self._inflight:
+                return
+            self._inflight.add(key)
+            self.revalidations += 1
+
+        def refresh():
+            try:
+                self._fetch(key, url, encoded_params, limit, params, headers, timeout)
+            except Exception as e:
+                print(f"[WARNING] Response cache refresh failed: {e}")
+            finally:
+                with self._lock:
+                    self._inflight.discard(key)
+
+        threading.Thread(target=refresh, name='response-cache-refresh', daemon=True).start()
+
+    def get_json(self, url, params=None, headers=None, timeout=30, limit_param='limit'):
+        """
+        GET JSON lewat cache
+
+        Args:
+            url: Endpoint API
+            params: Query parameters
+            headers: Header request
+            timeout: Timeout request (detik)
+            limit_param: Nama parameter jumlah hasil (entri dengan limit
+                lebih besar melayani limit yang lebih kecil)
+
+        Returns:
+            (status_code, data) - data None jika status bukan 200
+        """
+        if not self.enabled:
+            response = get_http_client().get(url, params=params, headers=headers, timeout=timeout)
+            return response.status_code, (response.json() if response.status_code == 200 else None)
+
+        key, encoded_params, limit = self.make_key(url, params, limit_param)
+        row = self._lookup(key)
+        age = None
+        if row is not None:
+            created_at, cached_limit, payload = row
+            age = time.time() - created_at
+            covers = limit is None or cached_limit is None or cached_limit >= limit
+            if covers and age <= self.ttl_seconds:
+                self._record(hits=1)
+                return 200, self._decode(payload)
+            if covers and self.stale_while_revalidate and age <= self.ttl_seconds + self.stale_seconds:
+                self._record(stale_hits=1)
+                # Refresh dengan limit entri lama agar cakupannya tidak menyusut
+                refresh_params = dict(params or {})
+                if cached_limit is not None and limit_param in refresh_params:
+                    refresh_params[limit_param] = cached_limit
+                self._revalidate(key, url, encoded_params, cached_limit, refresh_params, headers, timeout)
+                return 200, self._decode(payload)
+
+        self._record(misses=1)
+        usable = age is not None and age <= self.ttl_seconds + self.stale_seconds
+        try:
+            status_code, data = self._fetch(key, url, encoded_params, limit, params, headers, timeout)
+        except requests.RequestException as e:
+            # API gagal: entri lama di dalam jendela stale lebih baik dari kosong
+            if usable:
+                self._record(errors=1)
+                print(f"[WARNING] Request failed ({e}), using cached response")
+                return 200, self._decode(row[2])
+            raise
+        if status_code in RETRY_STATUSES and usable:
+            self._record(errors=1)
+            print(f"[WARNING] API returned status {status_code}, using cached response")
+            return 200, self._decode(row[2])
+        return status_code, data
+
+    def purge(self):
+        """
+        Hapus entri yang sudah melewati TTL + jendela stale
+
+        Returns:
+            Jumlah entri yang dihapus
+        """
+        cutoff = time.time() - self.ttl_seconds - self.stale_seconds
+        with self._lock:
+            deleted = self._conn.execute('DELETE FROM responses WHERE created_at < ?', (cutoff,)).rowcount
+            self._conn.commit()
+        return deleted
+
+    def clear(self):
+        """Hapus semua entri"""
+        with self._lock:
+            self._conn.execute('DELETE FROM responses')
+            self._conn.commit()
+
+    def stats(self):
+        """Statistik cache: hits, stale_hits, misses, size, bytes, compression"""
+        with self._lock:
+            size, raw_bytes, stored_bytes = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(LENGTH(payload)), 0) FROM responses'
+            ).fetchone()
+            hits, stale_hits, misses = self.hits, self.stale_hits, self.misses
+            revalidations, errors = self.revalidations, self.errors
+        total = hits + stale_hits + misses
+        return {
+            'hits': hits,
+            'stale_hits': stale_hits,
+            'misses': misses,
+            'hit_rate': round((hits + stale_hits) / total, 4) if total else 0.0,
+            'revalidations': revalidations,
+            'errors': errors,
+            'size': size,
+            'bytes': stored_bytes,
+            'raw_bytes': raw_bytes,
+            'compression_ratio': round(stored_bytes / raw_bytes, 4) if raw_bytes else 0.0,
+            'ttl_seconds': self.ttl_seconds,
+            'stale_seconds': self.stale_seconds,
+            'path': self.path
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# Cache global untuk scraper (in-memory sampai configure_response_cache dipanggil)
+_response_cache = ResponseCache()
+
+
+def get_response_cache():
+    """Ambil response cache global"""
+    return _response_cache
+
+
+def configure_response_cache(path=':memory:', ttl_seconds=86400, stale_seconds=7 * 86400,
+                             stale_while_revalidate=True, compress_level=6):
+    """
+    Ganti response cache global (entri yang sudah terlalu lama dibuang)
+
+    Args:
+        path: File SQLite, misalnya 'cache/responses.sqlite'
+        ttl_seconds: Umur entri segar (0 = nonaktif)
+        stale_seconds: Jendela stale setelah TTL
+        stale_while_revalidate: Kembalikan entri stale lalu refresh di background
+        compress_level: Level kompresi zlib
+
+    Returns:
+        ResponseCache yang baru
+    """
+    global _response_cache
+    old_cache = _response_cache
+    _response_cache = ResponseCache(path=path, ttl_seconds=ttl_seconds, stale_seconds=stale_seconds,
+                                    stale_while_revalidate=stale_while_revalidate,
+                                    compress_level=compress_level)
+    old_cache.close()
+    _response_cache.purge()
+    return _response_cache
+
+
+def cached_get_json(url, params=None, headers=None, timeout=30, limit_param='limit'):
+    """GET JSON lewat response cache global (lihat ResponseCache.get_json)"""
+    return _response_cache.get_json(url, params=params, headers=headers, timeout=timeout,
+                                    limit_param=limit_param)
@@ -6,9 +6,10 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from bs4 import BeautifulSoup
 import time
-import requests
 import re
 
+from .http_client import current_deadline, get_http_client
+
 def setup_driver():
     """Setup Chrome driver dengan options yang diperlukan"""
     options = Options()
@@ -76,14 +77,22 @@ def setup_driver():
         raise Exception(f"Failed to setup ChromeDriver: {e}")
 
 def scrape_papers_with_abstracts(query, max_results=20, filters=None):
-    """Scrape papers dari Google Scholar dengan abstract dan filters"""
+    """
+    Scrape papers dari Google Scholar dengan abstract dan filters.
+    Di dalam deadline fetch (fanout), load halaman dibatasi sisa waktu dan
+    halaman berikutnya tidak dibuka setelah deadline lewat / fetch dibatalkan.
+    """
     driver = setup_driver()
     papers = []
+    deadline = current_deadline()
     
     if filters is None:
         filters = {}
     
     try:
+        if deadline is not None:
+            driver.set_page_load_timeout(max(deadline.remaining(), 1))
+        
         # Build search query with filters
         search_query = build_search_query(query, filters)
         
@@ -106,6 +115,8 @@ def scrape_papers_with_abstracts(query, max_results=20, filters=None):
         # Parse results
         page = 1
         while len(papers) < max_results and page <= 3:  # Max 3 pages
+            if deadline is not None and deadline.remaining() <= 0:
+                break
             html = driver.page_source
             soup = BeautifulSoup(html, "html.parser")
             
@@ -313,11 +324,13 @@ def get_enhanced_abstract(current_abstract, pdf_link):
     
     try:
         # Try to fetch PDF content (limited attempt)
-        response = requests.get(pdf_link, timeout=10, stream=True)
-        if response.status_code == 200 and 'pdf' in response.headers.get('content-type', '').lower():
-            # For now, return current abstract
-            # Could implement PDF text extraction here if needed
-            return current_abstract
+        # stream=True: hanya header yang dibaca, response ditutup agar
+        # koneksi kembali ke pool
+        with get_http_client().get(pdf_link, timeout=10, stream=True) as response:
+            if response.status_code == 200 and 'pdf' in response.headers.get('content-type', '').lower():
+                # For now, return current abstract
+                # Could implement PDF text extraction here if needed
+                return current_abstract
     
     except Exception as e:
         pass
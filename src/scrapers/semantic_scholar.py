@@ -4,22 +4,157 @@ API gratis dan lebih reliable dibanding Google Scholar scraping
 Tidak ada rate limiting yang ketat dan tidak memerlukan API key untuk basic usage
 """
 
-import requests
+import contextvars
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .http_client import UpstreamError
+from .rate_limiter import RETRY_STATUSES
+from .response_cache import cached_get_json
 
 SEMANTIC_SCHOLAR_API = "https://api.semanticscholar.org/graph/v1/paper/search"
+SEARCH_FIELDS = 'title,authors,abstract,year,citationCount,url,openAccessPdf,venue,externalIds'
+
+PAGE_SIZE = 100             # API max limit per request
+MAX_SEARCH_RESULTS = 1000   # API: offset + limit <= 1000
+MAX_PAGE_WORKERS = 4        # Halaman yang diambil bersamaan
+
+REQUEST_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+
+def build_search_params(query, filters):
+    """Parameter API pencarian (tanpa offset / limit)"""
+    params = {
+        'query': query,
+        'fields': SEARCH_FIELDS
+    }
+    
+    # Add year filter
+    if filters.get('year'):
+        year_value = filters['year']
+        if '-' in str(year_value):
+            years = year_value.split('-')
+            params['year'] = f"{years[0]}-{years[1]}"
+        else:
+            params['year'] = year_value
+    
+    return params
+
+
+def fetch_semantic_scholar_page(query, offset, limit, filters):
+    """
+    Ambil satu halaman hasil pencarian
+    
+    Returns:
+        (papers, total) - total hasil menurut API; papers None jika API gagal
+
+    Raises:
+        UpstreamError: API tetap mengembalikan 429 / 5xx setelah retry
+    """
+    params = build_search_params(query, filters)
+    params['limit'] = limit
+    if offset:
+        params['offset'] = offset
+    
+    status_code, data = cached_get_json(
+        SEMANTIC_SCHOLAR_API,
+        params=params,
+        headers=REQUEST_HEADERS,
+        timeout=30
+    )
+    
+    if status_code in RETRY_STATUSES:
+        raise UpstreamError('api.semanticscholar.org', status_code)
+    if status_code != 200:
+        print(f"[DEBUG] Semantic Scholar API returned status {status_code} (offset {offset})")
+        return None, None
+    return parse_semantic_scholar_response(data, limit), data.get('total')
+
+
+def iter_semantic_scholar_pages(query, max_results=20, filters=None, max_workers=None):
+    """
+    Ambil hasil pencarian per halaman (offset) secara bersamaan
+    
+    Args:
+        query: Search query
+        max_results: Jumlah hasil (maksimum 1000)
+        filters: Optional filters (year, etc)
+        max_workers: Halaman maksimum yang diambil bersamaan (default MAX_PAGE_WORKERS)
+    
+    Yields:
+        (offset, papers) sesuai urutan halaman tiba; halaman yang gagal dilewati
 
-def search_semantic_scholar(query, max_results=20, filters=None):
+    Raises:
+        UpstreamError: Semua halaman ditolak API (429 / 5xx)
+    """
+    filters = filters or {}
+    n_results = min(max_results, MAX_SEARCH_RESULTS)
+    pages = [(offset, min(PAGE_SIZE, n_results - offset)) for offset in range(0, n_results, PAGE_SIZE)]
+    
+    if len(pages) == 1:
+        papers, _ = fetch_semantic_scholar_page(query, 0, pages[0][1], filters)
+        if papers is not None:
+            yield 0, papers
+        return
+    
+    max_workers = min(max_workers or MAX_PAGE_WORKERS, len(pages))
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='s2-page') as executor:
+        # Context disalin per halaman: deadline fetch (deadline_scope) ikut berlaku
+        pending = {
+            executor.submit(contextvars.copy_context().run, fetch_semantic_scholar_page,
+                            query, offset, limit, filters): offset
+            for offset, limit in pages
+        }
+        succeeded = False
+        upstream_error = None
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                offset = pending.pop(future)
+                try:
+                    papers, total = future.result()
+                except UpstreamError as e:
+                    print(f"[WARNING] Semantic Scholar page at offset {offset} failed: {e}")
+                    upstream_error = e
+                    continue
+                except Exception as e:
+                    print(f"[WARNING] Semantic Scholar page at offset {offset} failed: {e}")
+                    continue
+                if papers is None:
+                    continue
+                succeeded = True
+                if total is not None:
+                    # Halaman di luar total hasil tidak perlu diambil
+                    for other in [f for f, o in pending.items() if o >= total]:
+                        if other.cancel():
+                            del pending[other]
+                yield offset, papers
+        if not succeeded and upstream_error is not None:
+            raise upstream_error
+
+
+def search_semantic_scholar(query, max_results=20, filters=None, on_page=None):
     """
     Search papers menggunakan Semantic Scholar API
     
+    Lebih dari 100 hasil diambil per halaman (offset) secara bersamaan,
+    paper yang sama di beberapa halaman (paperId) hanya dipakai sekali.
+    
     Args:
         query: Search query
-        max_results: Maximum results to return
+        max_results: Maximum results to return (maksimum 1000)
         filters: Optional filters (year, etc)
+        on_page: Callback(papers) untuk setiap halaman saat tiba (paper
+            baru saja), misalnya preprocessing sebelum ranking
     
     Returns:
         List of paper dictionaries
+
+    Raises:
+        UpstreamError: API menolak request (rate limit / server error)
+            setelah retry, agar tidak terlihat seperti "tidak ada hasil"
     """
     if filters is None:
         filters = {}
@@ -29,40 +164,28 @@ def search_semantic_scholar(query, max_results=20, filters=None):
     try:
         print(f"[DEBUG] Semantic Scholar search: {query}")
         
-        # Build API request
-        params = {
-            'query': query,
-            'limit': min(max_results, 100),  # API max is 100
-            'fields': 'title,authors,abstract,year,citationCount,url,openAccessPdf,venue'
-        }
+        pages = {}
+        seen_ids = set()
+        for offset, page in iter_semantic_scholar_pages(query, max_results, filters):
+            pages[offset] = page
+            if on_page is not None:
+                new_papers = [p for p in page if not p['paper_id'] or p['paper_id'] not in seen_ids]
+                seen_ids.update(p['paper_id'] for p in new_papers)
+                on_page(new_papers)
         
-        # Add year filter
-        if filters.get('year'):
-            year_value = filters['year']
-            if '-' in str(year_value):
-                years = year_value.split('-')
-                params['year'] = f"{years[0]}-{years[1]}"
-            else:
-                params['year'] = year_value
+        # Gabung sesuai urutan offset (hasil deterministik), duplikat dibuang
+        seen_ids = set()
+        for offset in sorted(pages):
+            for paper in pages[offset]:
+                if paper['paper_id']:
+                    if paper['paper_id'] in seen_ids:
+                        continue
+                    seen_ids.add(paper['paper_id'])
+                papers.append(paper)
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        
-        response = requests.get(
-            SEMANTIC_SCHOLAR_API,
-            params=params,
-            headers=headers,
-            timeout=30
-        )
-        
-        if response.status_code == 200:
-            data = response.json()
-            papers = parse_semantic_scholar_response(data, max_results)
-            print(f"[DEBUG] Found {len(papers)} papers from Semantic Scholar")
-        else:
-            print(f"[DEBUG] Semantic Scholar API returned status {response.status_code}")
-            # Return empty list, fallback will be handled by caller
+        if pages:
+            print(f"[DEBUG] Found {len(papers)} papers from Semantic Scholar ({len(pages)} pages)")
+        # Empty list on failure, fallback will be handled by caller
         
         # Apply post-filters
         if filters.get('minCitations'):
@@ -77,6 +200,8 @@ def search_semantic_scholar(query, max_results=20, filters=None):
         
         return papers[:max_results]
     
+    except UpstreamError:
+        raise
     except Exception as e:
         print(f"[ERROR] Semantic Scholar search error: {e}")
         return []
@@ -112,7 +237,9 @@ def parse_semantic_scholar_response(data, max_results):
                 'scholar_url': item.get('url', ''),
                 'pdf_link': pdf_url,
                 'source': 'Semantic Scholar',
-                'venue': item.get('venue', '')
+                'venue': item.get('venue', ''),
+                'doi': (item.get('externalIds') or {}).get('DOI', '') or '',
+                'paper_id': item.get('paperId', '') or ''
             }
             
             papers.append(paper)
@@ -32,12 +32,14 @@ function updateFromCheckboxes() {
             const abstract = card.querySelector('.paper-abstract')?.textContent || '';
             const relevanceSpan = card.querySelector('.relevance-score span');
             const relevance = relevanceSpan ? parseFloat(relevanceSpan.textContent) : 0;
+            const docId = cb.dataset.docId !== undefined && cb.dataset.docId !== '' ? parseInt(cb.dataset.docId) : undefined;
 
             selectedPapersForCBF.push({
                 title: title,
                 authors: authors,
                 abstract: abstract,
                 relevance_score: relevance,
+                doc_id: docId,
                 index: idx
             });
         }
@@ -99,10 +101,7 @@ async function showCBFCalculation() {
         const response = await fetch('/api/cbf-details', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({
-                papers: selectedPapersForCBF,
-                query: currentQueryForCBF
-            })
+            body: JSON.stringify(buildCBFRequestBody())
         });
 
         const data = await response.json();
@@ -118,6 +117,17 @@ async function showCBFCalculation() {
     }
 }
 
+// Request body untuk /api/cbf-details: cukup doc_id jika result set tersimpan di server
+function buildCBFRequestBody() {
+    const resultSetId = typeof currentResultSetId !== 'undefined' ? currentResultSetId : null;
+    const docIds = selectedPapersForCBF.map(p => p.doc_id);
+
+    if (resultSetId && docIds.every(id => id !== undefined)) {
+        return { result_set_id: resultSetId, doc_ids: docIds, query: currentQueryForCBF };
+    }
+    return { papers: selectedPapersForCBF, query: currentQueryForCBF };
+}
+
 // Display CBF calculation results
 function displayCBFCalculation(details) {
     const panelContent = document.getElementById('cbfPanelContent');
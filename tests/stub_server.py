@@ -0,0 +1,79 @@
+"""
+Server HTTP lokal pengganti API scraper untuk uji (tanpa jaringan)
+"""
+
+import gzip
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+
+def start_stub_server(respond, delay=0.0):
+    """
+    Server HTTP/1.1 keep-alive dengan gzip
+
+    Args:
+        respond: Fungsi (path, params) -> body JSON (bytes), atau
+            (status, body, headers) untuk response selain 200
+        delay: Latensi buatan per request (detik)
+
+    Returns:
+        (server, base_url) - server.requests menghitung request yang masuk
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            with lock:
+                server.requests += 1
+            if delay:
+                time.sleep(delay)
+            parts = urlsplit(self.path)
+            body = respond(parts.path, dict(parse_qsl(parts.query)))
+            status, extra_headers = 200, {}
+            if isinstance(body, tuple):
+                status, body, extra_headers = body
+            if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                extra_headers = dict(extra_headers, **{'Content-Encoding': 'gzip'})
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            for name, value in extra_headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    lock = threading.Lock()
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    server.requests = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def stub_semantic_scholar(path, params):
+    """Response palsu Semantic Scholar search: hasil deterministik per query"""
+    query = ' '.join(params.get('query', '').lower().split())
+    seed = zlib.crc32(query.encode())
+    offset = int(params.get('offset', 0))
+    limit = int(params.get('limit', 10))
+    data = [{
+        'paperId': f"{seed}-{i}",
+        'title': f"{query.title()} study {i}",
+        'abstract': f"We study {query} with method {i % 7} on dataset {i % 5}.",
+        'year': 2015 + i % 10,
+        'citationCount': (i * 37) % 500,
+        'authors': [{'name': f"Author {i % 13}"}],
+        'url': f"https://example.org/{i}",
+        'venue': 'Stub Journal',
+        'externalIds': {'DOI': f"10.1234/{seed}.{i}"}
+    } for i in range(offset, offset + limit)]
+    return json.dumps({'total': 1000, 'offset': offset, 'data': data}).encode()
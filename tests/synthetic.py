@@ -0,0 +1,53 @@
+"""
+Corpus sintetis untuk uji (tanpa file testing_results maupun jaringan)
+"""
+
+import random
+import string
+
+
+def make_words(n_words, seed=0):
+    """Kosakata acak deterministik (huruf kecil, 4-9 karakter)"""
+    rng = random.Random(seed)
+    words = set()
+    while len(words) < n_words:
+        words.add(''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))))
+    return sorted(words)
+
+
+def build_corpus(n_docs, n_words=800, seed=42):
+    """
+    Papers dengan judul dan abstrak acak dari satu kosakata (sebagian
+    term jarang, sebagian umum)
+
+    Returns:
+        List of paper dictionaries dengan 'title' dan 'abstract'
+    """
+    rng = random.Random(seed)
+    words = make_words(n_words, seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(words))]
+    return [{
+        'title': ' '.join(rng.choices(words, weights, k=rng.randint(5, 10))),
+        'abstract': ' '.join(rng.choices(words, weights, k=rng.randint(30, 80)))
+    } for _ in range(n_docs)]
+
+
+def build_topic_corpus(n_docs, n_topics=20, topic_words=15, n_words=400, seed=42):
+    """
+    Papers yang terkelompok per topik: sebagian besar kata dari kosakata
+    satu topik, sehingga setiap paper punya tetangga yang jelas
+
+    Returns:
+        List of paper dictionaries dengan 'title' dan 'abstract'
+    """
+    rng = random.Random(seed)
+    words = make_words(n_words, seed)
+    topics = [rng.sample(words, topic_words) for _ in range(n_topics)]
+    papers = []
+    for i in range(n_docs):
+        topic = topics[i % n_topics]
+        papers.append({
+            'title': ' '.join(rng.choices(topic, k=6)),
+            'abstract': ' '.join(rng.choices(topic, k=40) + rng.choices(words, k=5))
+        })
+    return papers
@@ -0,0 +1,52 @@
+"""
+Uji index LSH untuk similar papers
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+
+from src.core.ann_index import RandomProjectionLSH, evaluate_recall
+
+
+def random_matrix(n_docs, n_features, nnz_per_doc=30, n_topics=50, seed=0):
+    """Vektor ter-normalisasi L2 yang terkelompok per topik"""
+    rng = np.random.default_rng(seed)
+    topics = [rng.choice(n_features, 36, replace=False) for _ in range(n_topics)]
+    rows, cols = [], []
+    for i in range(n_docs):
+        rows.extend([i] * nnz_per_doc)
+        cols.extend(rng.choice(topics[i % n_topics], nnz_per_doc, replace=False))
+    data = rng.random(len(rows)) + 0.1
+    return normalize(sp.csr_matrix((data, (rows, cols)), shape=(n_docs, n_features)))
+
+
+def test_hashing_feature_space_has_no_dense_planes():
+    matrix = random_matrix(500, 2 ** 20)
+    index = RandomProjectionLSH.from_matrix(matrix)
+
+    # Tidak ada array sebesar n_features x (n_tables * n_bits)
+    arrays = [v for v in vars(index).values() if isinstance(v, np.ndarray)]
+    assert max(a.nbytes for a in arrays) < 1e6
+    assert evaluate_recall(index, list(range(0, 500, 5)), k=5)['recall'] >= 0.75
+
+
+def test_planes_are_deterministic_per_seed():
+    columns = np.array([0, 7, 2 ** 20 - 1])
+    a = RandomProjectionLSH(2 ** 20, seed=1).planes(columns)
+    assert np.array_equal(a, RandomProjectionLSH(2 ** 20, seed=1).planes(columns))
+    assert not np.array_equal(a, RandomProjectionLSH(2 ** 20, seed=2).planes(columns))
+    assert set(np.unique(a)) == {-1.0, 1.0}
+
+
+def test_incremental_add_matches_full_build():
+    matrix = random_matrix(400, 5000, seed=3)
+    full = RandomProjectionLSH.from_matrix(matrix)
+    incremental = RandomProjectionLSH(matrix.shape[1])
+    incremental.add(matrix[:150])
+    incremental.add(matrix[150:])
+
+    assert np.array_equal(full._keys, incremental._keys)
+    for row in range(0, 400, 37):
+        assert full.search_scored(matrix[row], 10, exclude=row) == \
+            incremental.search_scored(matrix[row], 10, exclude=row)
@@ -0,0 +1,55 @@
+"""
+Uji detail perhitungan CBF (get_cbf_calculation_details)
+"""
+
+import functools
+
+import numpy as np
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.core import content_based_filter
+from src.core.content_based_filter import ContentBasedFilter, get_cbf_calculation_details
+from src.core.paper_index import PaperIndex
+
+from synthetic import build_corpus
+from test_paper_index import PAPERS
+
+
+def test_details_in_hashing_mode_report_hash_columns(monkeypatch):
+    hashing = functools.partial(ContentBasedFilter, vectorizer_mode='hashing', n_hash_features=2 ** 12)
+    monkeypatch.setattr(content_based_filter, 'ContentBasedFilter', hashing)
+
+    details = get_cbf_calculation_details(PAPERS, 'neural networks')
+
+    top_terms = details['tfidf']['top_terms']
+    assert top_terms and all(t['term'].startswith('#') for t in top_terms)
+    assert details['tfidf']['total_terms'] == details['statistics']['total_unique_terms'] > 0
+    assert len(details['similarity_matrix']) == len(PAPERS)
+
+
+def test_details_from_index_use_term_names():
+    index = PaperIndex(PAPERS)
+    details = get_cbf_calculation_details(index.papers[:3], 'neural networks', index=index)
+
+    terms = {t['term'] for t in details['tfidf']['top_terms']}
+    assert 'neural' in terms or 'network' in terms or 'networks' in terms
+    assert details['tfidf']['total_terms'] == len(index.cbf.get_feature_names())
+
+
+def test_details_match_dense_calculation():
+    index = PaperIndex(build_corpus(300))
+    selected = index.papers[:120]
+    details = get_cbf_calculation_details(selected, 'machine learning', index=index)
+
+    dense = index.tfidf_matrix[index.locate_all(selected)].toarray()
+    avg_scores = dense.mean(axis=0)
+    for term in details['tfidf']['top_terms']:
+        col = index.vectorizer.vocabulary_[term['term']]
+        assert abs(term['score'] - avg_scores[col]) <= 1e-12
+        assert term['df'] == int(np.sum(dense[:, col] > 0))
+    np.testing.assert_allclose([t['score'] for t in details['tfidf']['top_terms']],
+                               np.sort(avg_scores)[::-1][:30], rtol=0, atol=1e-12)
+    np.testing.assert_allclose(details['similarity_matrix'], cosine_similarity(dense[:10]), rtol=0, atol=1e-12)
+    for i, analysis in enumerate(details['papers_analysis'][:50]):
+        expected = sorted((round(w, 4) for w in dense[i] if w > 0), reverse=True)[:8]
+        assert [t['weight'] for t in analysis['top_tfidf_terms']] == expected
@@ -0,0 +1,180 @@
+"""
+Uji fan-out source: fallback Semantic Scholar, deadline sejak fetch mulai
+dan pembatalan fetch yang sedang berjalan (fetcher stub, server HTTP lokal)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.scrapers import fanout
+from src.scrapers.fanout import search_sources
+from src.scrapers.http_client import DeadlineExceeded, FetchDeadline, HttpClient, current_deadline, deadline_scope
+from src.scrapers.rate_limiter import RateLimiter, RetryPolicy
+
+PAPER = {'title': 'Graph Neural Networks', 'abstract': 'GNN survey'}
+
+
+class Recorder:
+    """Fetcher stub yang mencatat panggilan"""
+
+    def __init__(self, result=None, error=None, delay=0.0):
+        self.result = result if result is not None else []
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    def __call__(self, query, max_results, filters, on_page=None):
+        self.calls += 1
+        if self.delay:
+            time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [dict(p) for p in self.result]
+
+
+def deadline_loop(query, max_results, filters, on_page=None):
+    """Fetcher 'lambat' yang, seperti HttpClient, berhenti saat deadline lewat"""
+    deadline = current_deadline()
+    while True:
+        deadline.check('stub')
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='test-fetch')
+    monkeypatch.setattr(fanout, '_executor', pool)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+def test_scholar_success_does_not_call_fallback(executor):
+    semantic = Recorder([PAPER])
+    papers, report = search_sources('gnn', 'scholar', 10,
+                                    fetchers={'scholar': Recorder([PAPER]), 'semantic': semantic})
+    assert [p['source'] for p in papers] == ['Google Scholar']
+    assert semantic.calls == 0
+    assert report['semantic']['status'] == 'skipped'
+    assert list(report) == ['scholar', 'semantic']
+
+
+@pytest.mark.parametrize('scholar', [Recorder([]), Recorder(error=RuntimeError('blocked'))])
+def test_fallback_runs_when_scholar_fails_or_is_empty(executor, scholar):
+    semantic = Recorder([PAPER])
+    papers, report = search_sources('gnn', 'scholar', 10,
+                                    fetchers={'scholar': scholar, 'semantic': semantic})
+    assert [p['source'] for p in papers] == ['Semantic Scholar']
+    assert semantic.calls == 1
+    assert report['semantic']['status'] == 'ok'
+
+
+def test_fallback_starts_near_scholar_deadline(executor):
+    semantic = Recorder([PAPER])
+    started = time.perf_counter()
+    papers, report = search_sources('gnn', 'scholar', 10,
+                                    timeouts={'scholar': 0.6, 'semantic': 0.3},
+                                    fetchers={'scholar': deadline_loop, 'semantic': semantic})
+    elapsed = time.perf_counter() - started
+    assert report['scholar']['status'] == 'timeout'
+    assert report['semantic']['status'] == 'ok'
+    assert [p['source'] for p in papers] == ['Semantic Scholar']
+    # Fallback dimulai sekitar 0.3s sebelum deadline Scholar, bukan setelahnya
+    assert elapsed < 0.6 + 0.3
+
+
+def test_timed_out_fetch_is_cancelled(executor):
+    finished = threading.Event()
+
+    def slow(query, max_results, filters, on_page=None):
+        try:
+            deadline_loop(query, max_results, filters)
+        finally:
+            finished.set()
+
+    papers, report = search_sources('gnn', 'mendeley', 10, timeouts={'mendeley': 0.2},
+                                    fetchers={'mendeley': slow})
+    assert papers == [] and report['mendeley']['status'] == 'timeout'
+    assert finished.wait(1.0)
+
+
+def test_saturated_pool_does_not_cause_false_timeouts(executor):
+    # 2 worker, 4 pencarian: deadline dihitung sejak fetch mulai, bukan sejak antre
+    fast = Recorder([PAPER], delay=0.2)
+    with ThreadPoolExecutor(max_workers=4) as clients:
+        runs = list(clients.map(
+            lambda _: search_sources('gnn', 'semantic', 10, timeouts={'semantic': 0.35},
+                                     fetchers={'semantic': fast}),
+            range(4)
+        ))
+    assert [report['semantic']['status'] for _, report in runs] == ['ok'] * 4
+
+
+class _Handler(BaseHTTPRequestHandler):
+    status = 503
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        self.send_response(self.status)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{httpd.server_address[1]}/'
+    httpd.shutdown()
+    httpd.server_close()
+    _Handler.status, _Handler.delay = 503, 0.0
+
+
+def make_client(**retry):
+    return HttpClient(rate_limiter=RateLimiter(default=(1000.0, 1000)),
+                      retry=RetryPolicy(**dict({'max_retries': 3}, **retry)))
+
+
+def test_request_timeout_is_clamped_to_deadline(server):
+    _Handler.status, _Handler.delay = 200, 1.0
+    client = make_client(max_retries=0)
+    started = time.perf_counter()
+    with deadline_scope(FetchDeadline(0.2)):
+        with pytest.raises(requests.Timeout):
+            client.get(server, timeout=30)
+    assert time.perf_counter() - started < 0.9
+
+
+def test_retry_backoff_stops_at_deadline(server):
+    client = make_client(backoff_base=5.0, backoff_max=5.0)
+    started = time.perf_counter()
+    with deadline_scope(FetchDeadline(1.0)):
+        try:
+            response = client.get(server)
+        except DeadlineExceeded:
+            response = None
+    # Backoff 0-5s: ditunggu hanya jika masih muat sebelum deadline
+    assert time.perf_counter() - started < 1.5
+    assert response is None or response.status_code == 503
+
+
+def test_cancelled_deadline_stops_next_request(server):
+    _Handler.status = 200
+    client = make_client()
+    deadline = FetchDeadline(10)
+    with deadline_scope(deadline):
+        assert client.get(server).status_code == 200
+        deadline.cancel()
+        with pytest.raises(DeadlineExceeded):
+            client.get(server)
+    assert client.rate_limiter.stats()['127.0.0.1']['requests'] == 1
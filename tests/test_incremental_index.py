@@ -0,0 +1,56 @@
+"""
+Uji update incremental (add_papers / remove_papers / reweight) terhadap
+TfidfVectorizer ber-vocabulary tetap yang di-fit ulang pada corpus akhir
+"""
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from src.core.content_based_filter import ContentBasedFilter
+from synthetic import build_topic_corpus
+
+PAPERS = build_topic_corpus(460, n_topics=30)
+CORPUS, NEW_PAPERS = PAPERS[:400], PAPERS[400:]
+
+
+def fixed_vocabulary_fit(cbf):
+    vectorizer = cbf.vectorizer
+    reference = TfidfVectorizer(vocabulary=vectorizer.vocabulary_, stop_words=vectorizer.stop_words,
+                                ngram_range=vectorizer.ngram_range, sublinear_tf=vectorizer.sublinear_tf,
+                                token_pattern=vectorizer.token_pattern)
+    return reference.fit_transform(cbf.paper_texts)
+
+
+def assert_same_matrix(expected, actual):
+    assert expected.shape == actual.shape
+    assert abs(expected - actual).max() < 1e-12
+
+
+def test_added_rows_use_current_idf():
+    cbf = ContentBasedFilter(idf_drift_threshold=None).fit(CORPUS)
+    assert cbf.add_papers(NEW_PAPERS[:20]) == list(range(400, 420))
+    cbf.add_papers(NEW_PAPERS[20:])
+
+    assert len(cbf.papers) == len(PAPERS)
+    assert_same_matrix(cbf.vectorizer.transform(cbf.paper_texts[400:]), cbf.tfidf_matrix[400:])
+
+
+def test_reweight_matches_refit():
+    cbf = ContentBasedFilter(idf_drift_threshold=None).fit(CORPUS)
+    cbf.add_papers(NEW_PAPERS)
+    cbf.reweight()
+    assert_same_matrix(fixed_vocabulary_fit(cbf), cbf.tfidf_matrix)
+
+    assert cbf.remove_papers(list(range(0, 460, 9))) == 52
+    cbf.reweight()
+    assert len(cbf.papers) == 460 - 52
+    assert_same_matrix(fixed_vocabulary_fit(cbf), cbf.tfidf_matrix)
+
+
+def test_background_reweight_matches_refit():
+    cbf = ContentBasedFilter(idf_drift_threshold=0.0).fit(CORPUS)
+    cbf.add_papers(NEW_PAPERS[:30])
+    cbf.add_papers(NEW_PAPERS[30:])
+    cbf.wait_for_reweight()
+
+    assert cbf.update_stats()['reweights'] >= 1
+    assert_same_matrix(fixed_vocabulary_fit(cbf), cbf.tfidf_matrix)
@@ -0,0 +1,78 @@
+"""
+Uji snapshot index: restore float32 memory-mapped vs filter asli, dan
+embedding LSA yang ikut tersimpan
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from src.core.content_based_filter import ContentBasedFilter
+from src.core.index_snapshot import load_snapshot, save_snapshot
+from src.core.lsa import LSAFilter
+from src.core.ranking import top_k_indices
+from synthetic import build_corpus, build_topic_corpus
+
+QUERIES = ['machine learning classification', 'deep neural network', 'text mining sentiment']
+
+
+def test_restored_filter_matches_original(tmp_path):
+    cbf = ContentBasedFilter(search_backend='matrix')
+    cbf.fit(build_corpus(300))
+    queries = QUERIES + [' '.join(cbf.paper_texts[0].split()[:3])]
+    save_snapshot(cbf, str(tmp_path / 'index'))
+    restored = load_snapshot(str(tmp_path / 'index'))
+
+    assert restored.vectorizer.vocabulary_ == cbf.vectorizer.vocabulary_
+    np.testing.assert_array_equal(restored.vectorizer.idf_, cbf.vectorizer.idf_)
+    assert list(restored.papers) == cbf.papers
+    assert list(restored.paper_texts) == cbf.paper_texts
+    for query in queries:
+        expected, actual = cbf.query_scores(query), restored.query_scores(query)
+        # float32: skor berbeda sedikit, himpunan top-k sama
+        assert np.abs(expected - actual).max() < 1e-6
+        np.testing.assert_array_equal(np.sort(top_k_indices(expected, 20)), np.sort(top_k_indices(actual, 20)))
+
+
+def test_lsa_embeddings_are_restored_without_refit(tmp_path):
+    tfidf = ContentBasedFilter(search_backend='matrix')
+    tfidf.fit(build_topic_corpus(300))
+    lsa = LSAFilter.from_filter(tfidf, n_components=16)
+    save_snapshot(lsa, str(tmp_path / 'index'))
+    restored = load_snapshot(str(tmp_path / 'index'))
+
+    assert isinstance(restored, LSAFilter) and restored.embeddings is not None
+    for query in [' '.join(text.split()[:2]) for text in tfidf.paper_texts[:10]]:
+        np.testing.assert_allclose(lsa.query_scores(query), restored.query_scores(query), atol=1e-6)
+
+
+def test_overwrite_keeps_loaded_snapshot_readable(tmp_path):
+    path = str(tmp_path / 'index')
+    old_cbf = ContentBasedFilter(search_backend='matrix').fit(build_corpus(200, seed=1))
+    new_cbf = ContentBasedFilter(search_backend='matrix').fit(build_corpus(150, seed=2))
+    save_snapshot(old_cbf, path)
+    loaded = load_snapshot(path)
+    expected = loaded.query_scores(QUERIES[0]).copy()
+
+    save_snapshot(new_cbf, path)
+    # Versi lama sudah dihapus dari disk, tetapi filter yang dimuat tetap konsisten
+    assert sorted(os.listdir(tmp_path)) == sorted(['index', os.readlink(path)])
+    assert loaded.papers[-1] == old_cbf.papers[-1]
+    assert list(loaded.paper_texts) == old_cbf.paper_texts
+    np.testing.assert_array_equal(loaded.query_scores(QUERIES[0]), expected)
+
+    assert list(load_snapshot(path).papers) == new_cbf.papers
+
+
+def test_paper_values_use_query_cache_json_types(tmp_path):
+    cbf = ContentBasedFilter(search_backend='matrix').fit(build_corpus(50))
+    cbf.papers[0]['citations'] = np.int64(7)
+    save_snapshot(cbf, str(tmp_path / 'index'))
+    assert load_snapshot(str(tmp_path / 'index')).papers[0]['citations'] == 7
+
+    cbf.papers[0]['citations'] = {7}
+    with pytest.raises(TypeError):
+        save_snapshot(cbf, str(tmp_path / 'other'))
+    # Save yang gagal tidak meninggalkan direktori versi setengah jadi
+    assert sorted(os.listdir(tmp_path)) == sorted(['index', os.readlink(str(tmp_path / 'index'))])
@@ -0,0 +1,49 @@
+"""
+Uji Mendeley scraper terhadap response API stub
+"""
+
+import pytest
+
+from src.scrapers import mendeley_scraper
+from src.scrapers.fanout import search_sources
+from src.scrapers.http_client import UpstreamError
+
+DOCUMENTS = [
+    {'id': 'a1', 'title': 'Graph Neural Networks', 'abstract': 'GNN survey', 'year': 2021,
+     'reader_count': 12, 'authors': [{'first_name': 'Ada', 'last_name': 'Lovelace'}]},
+    {'id': 'b2', 'title': 'Text Mining', 'abstract': 'Sentiment', 'year': 2019, 'reader_count': 40},
+]
+
+
+@pytest.fixture
+def no_web_fallback(monkeypatch):
+    monkeypatch.setattr(mendeley_scraper, 'scrape_mendeley_web',
+                        lambda *args, **kwargs: pytest.fail('web scraping fallback must not run'))
+
+
+@pytest.mark.parametrize('status', [429, 500, 503])
+def test_rejected_request_raises_upstream_error(monkeypatch, no_web_fallback, status):
+    monkeypatch.setattr(mendeley_scraper, 'cached_get_json', lambda *args, **kwargs: (status, None))
+
+    with pytest.raises(UpstreamError) as excinfo:
+        mendeley_scraper.scrape_mendeley_papers('graph', max_results=5)
+    assert excinfo.value.host == 'api.mendeley.com'
+    assert excinfo.value.status_code == status
+
+
+def test_successful_response_is_parsed(monkeypatch, no_web_fallback):
+    monkeypatch.setattr(mendeley_scraper, 'cached_get_json', lambda *args, **kwargs: (200, DOCUMENTS))
+
+    papers = mendeley_scraper.scrape_mendeley_papers('graph', filters={'sortBy': 'citations'})
+    assert [p['title'] for p in papers] == ['Text Mining', 'Graph Neural Networks']
+    assert papers[1]['authors'] == 'Ada Lovelace'
+
+
+def test_fanout_reports_upstream_error(monkeypatch, no_web_fallback):
+    monkeypatch.setattr(mendeley_scraper, 'cached_get_json', lambda *args, **kwargs: (503, None))
+
+    papers, report = search_sources('graph', 'mendeley', 10,
+                                    fetchers={'mendeley': mendeley_scraper.scrape_mendeley_papers})
+    assert papers == []
+    assert report['mendeley']['status'] == 'error'
+    assert '503' in report['mendeley']['error']
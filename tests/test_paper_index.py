@@ -0,0 +1,112 @@
+"""
+Uji PaperIndex (index hasil pencarian yang dipakai ulang endpoint lanjutan)
+"""
+
+import threading
+
+import numpy as np
+
+from src.core.paper_index import PaperIndex
+
+PAPERS = [
+    {'title': 'Deep Learning for Natural Language Processing',
+     'abstract': 'A survey of deep learning techniques for NLP tasks including sentiment analysis, '
+                 'machine translation and text classification.'},
+    {'title': 'Machine Learning in Healthcare',
+     'abstract': 'Applications of machine learning algorithms in medical diagnosis, patient outcome '
+                 'prediction and drug discovery.'},
+    {'title': 'Neural Networks for Image Recognition',
+     'abstract': 'Convolutional neural networks for image classification and object detection tasks.'},
+    {'title': 'Text Mining and Sentiment Analysis',
+     'abstract': 'Extracting opinions and sentiments from text data using NLP and machine learning.'},
+    {'title': 'Reinforcement Learning in Robotics',
+     'abstract': 'Reinforcement learning algorithms for robot navigation and manipulation tasks.'},
+    {'title': 'Graph Neural Networks for Recommendation',
+     'abstract': 'Recommendation systems with graph neural networks over user item interactions.'},
+]
+
+
+def test_neighbor_graph_is_built_on_first_similar_call():
+    index = PaperIndex(PAPERS)
+    assert 'graph' not in index._derived
+
+    # Matriks similarity untuk cbf-details tidak membangun graph
+    block = index.pair_scores([0, 3])
+    assert 'graph' not in index._derived
+    assert np.isclose(block[0, 0], 1.0)
+
+    similar = index.similar(0, 3)
+    assert 'graph' in index._derived
+    assert similar == index.cbf.get_similar_papers(0, 3)
+    np.testing.assert_allclose(index.pair_scores([0, 3]), block)
+
+
+def test_doc_ids_stay_stable_after_remove():
+    index = PaperIndex(PAPERS[:4])
+    assert index.remove_papers([1]) == 1
+
+    papers, missing = index.find_papers([0, 1, 2, 3])
+    assert [p['title'] for p in papers] == [PAPERS[i]['title'] for i in (0, 2, 3)]
+    assert missing == [1]
+    assert index.remove_papers([1]) == 0
+
+    # doc_id yang dihapus tidak dipakai ulang
+    assert index.add_papers(PAPERS[4:]) == [4, 5]
+    assert [p['doc_id'] for p in index.papers] == [0, 2, 3, 4, 5]
+    assert index.get_papers([5])[0]['title'] == PAPERS[5]['title']
+    assert index.locate({'doc_id': 3}) == 2
+    assert index.locate({'title': PAPERS[1]['title']}) is None
+
+
+def test_snapshot_keeps_its_version():
+    index = PaperIndex(PAPERS[:4])
+    view = index.snapshot()
+    index.add_papers(PAPERS[4:])
+    index.remove_papers([0])
+
+    assert len(view) == 4 and view.tfidf_matrix.shape[0] == 4
+    assert view.get_papers([0])[0]['title'] == PAPERS[0]['title']
+    assert len(index) == 5 and index.tfidf_matrix.shape[0] == 5
+    assert index.get_papers([0]) == []
+
+
+def test_graph_extended_on_add_matches_exact():
+    index = PaperIndex(PAPERS[:4])
+    index.cbf.idf_drift_threshold = None
+    index.similar(0, 3)
+    old_graph = index.graph
+    index.add_papers(PAPERS[4:])
+
+    # Graph diperluas saat add_papers (tidak dibangun ulang), graph lama utuh
+    assert index._derived['graph'][0] is index.tfidf_matrix
+    assert index.graph is not old_graph and len(old_graph) == 4
+    for row in range(len(index)):
+        assert index.similar(row, 3) == index.cbf.get_similar_papers(row, 3)
+
+
+def test_readers_see_consistent_state_during_updates():
+    index = PaperIndex(PAPERS[:2])
+    index.cbf.background_reweight = False
+    errors = []
+    done = threading.Event()
+
+    def reader():
+        while not done.is_set():
+            state = index.cbf.state
+            if not len(state.papers) == len(state.paper_texts) == state.tfidf_matrix.shape[0]:
+                errors.append((len(state.papers), state.tfidf_matrix.shape[0]))
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(10):
+            doc_ids = index.add_papers(PAPERS[2:])
+            index.remove_papers(doc_ids)
+    finally:
+        done.set()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert [p['doc_id'] for p in index.papers] == [0, 1]
@@ -0,0 +1,102 @@
+"""
+Uji parity fit paralel (parallel_ingest) dengan fit TfidfVectorizer serial
+"""
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+
+from src.core import parallel_ingest
+from src.core.content_based_filter import ContentBasedFilter
+from src.core.parallel_ingest import limit_features, merge_counts, sklearn_supported
+
+TOPICS = ['neural network image', 'sentiment text opinion', 'robot control navigation',
+          'graph recommendation user', 'medical diagnosis patient', 'protein folding structure']
+
+
+def make_papers(n):
+    papers = []
+    for i in range(n):
+        words = f"{TOPICS[i % len(TOPICS)]} {TOPICS[(i * 7) % len(TOPICS)]} topic{i % 13} study{i % 5}"
+        papers.append({'title': f"Paper {i} {TOPICS[i % len(TOPICS)]}",
+                       'abstract': f"We present {words} results with {words.split()[0]} methods."})
+    return papers
+
+
+def assert_same_fit(a, b):
+    assert a.vectorizer.vocabulary_ == b.vectorizer.vocabulary_
+    np.testing.assert_array_equal(a.vectorizer.idf_, b.vectorizer.idf_)
+    assert (a.tfidf_matrix != b.tfidf_matrix).nnz == 0
+    np.testing.assert_array_equal(a.tfidf_matrix.indptr, b.tfidf_matrix.indptr)
+    np.testing.assert_array_equal(a.tfidf_matrix.indices, b.tfidf_matrix.indices)
+    assert a.paper_texts == b.paper_texts
+
+
+def test_installed_sklearn_is_supported():
+    # Gagal saat scikit-learn di luar SKLEARN_TESTED: uji parity lalu perbarui rentangnya
+    assert sklearn_supported()
+    assert sklearn_supported('1.9.1')
+    assert not sklearn_supported('2.0.0')
+    assert not sklearn_supported('1.10.0')
+    assert not sklearn_supported('1.8.0')
+    assert not sklearn_supported('unknown')
+
+
+@pytest.mark.parametrize('max_features,min_df,max_df', [(None, 1, 1.0), (40, 2, 0.9), (15, 0.05, 30)])
+def test_merge_and_limit_match_count_vectorizer(max_features, min_df, max_df):
+    texts = [p['abstract'].lower() for p in make_papers(60)]
+    analyze = CountVectorizer(ngram_range=(1, 2)).build_analyzer()
+    blocks = []
+    for start in range(0, len(texts), 17):
+        vocabulary = {}
+        rows = []
+        for text in texts[start:start + 17]:
+            row = {}
+            for feature in analyze(text):
+                idx = vocabulary.setdefault(feature, len(vocabulary))
+                row[idx] = row.get(idx, 0) + 1
+            rows.append(row)
+        counts = np.zeros((len(rows), len(vocabulary)))
+        for r, row in enumerate(rows):
+            for c, v in row.items():
+                counts[r, c] = v
+        blocks.append((list(vocabulary), sp.csr_matrix(counts)))
+
+    vocabulary, counts = merge_counts(blocks)
+    vocabulary, counts = limit_features(counts, vocabulary, max_df, min_df, max_features)
+    expected = CountVectorizer(ngram_range=(1, 2), max_features=max_features, min_df=min_df, max_df=max_df)
+    expected_counts = expected.fit_transform(texts)
+
+    assert vocabulary == expected.vocabulary_
+    assert (counts != expected_counts).nnz == 0
+
+
+def test_parallel_fit_matches_serial_fit():
+    papers = make_papers(240)
+    serial = ContentBasedFilter()
+    serial.fit(papers)
+
+    parallel = ContentBasedFilter(n_workers=2)
+    parallel.PARALLEL_MIN_DOCS = 0
+    assert parallel._use_parallel_fit(papers)
+    parallel.fit(papers)
+
+    assert_same_fit(parallel, serial)
+    assert parallel.calculate_similarity_to_query('sentiment text', 5) == \
+        serial.calculate_similarity_to_query('sentiment text', 5)
+
+
+def test_untested_sklearn_falls_back_to_serial_fit(monkeypatch):
+    monkeypatch.setattr(parallel_ingest, 'SKLEARN_TESTED', ((0, 1), (0, 2)))
+    papers = make_papers(60)
+    cbf = ContentBasedFilter(n_workers=2)
+    cbf.PARALLEL_MIN_DOCS = 0
+    assert not cbf._use_parallel_fit(papers)
+
+    monkeypatch.setattr(parallel_ingest, 'parallel_count',
+                        lambda *args, **kwargs: pytest.fail('parallel_count must not run'))
+    cbf.fit(papers)
+    serial = ContentBasedFilter()
+    serial.fit(papers)
+    assert_same_fit(cbf, serial)
@@ -0,0 +1,69 @@
+"""
+Uji cache hasil /api/search (QueryResultCache)
+"""
+
+import numpy as np
+
+from src.core import paper_index
+from src.core.paper_index import build_paper_index
+from src.core.query_cache import QueryResultCache
+
+from test_paper_index import PAPERS
+
+
+def make_key(cache, query='neural networks'):
+    return cache.make_key(query, 'semantic', {'year': '2020'}, 10, True, 'tfidf', 50)
+
+
+def test_numpy_values_are_converted_explicitly():
+    cache = QueryResultCache()
+    key = make_key(cache)
+    cache.put(key, {'papers': [{'score': np.float32(0.5), 'rank': np.int64(3)}],
+                    'vector': np.arange(3), 'total': 1})
+
+    assert cache.get(key) == {'papers': [{'score': 0.5, 'rank': 3}], 'vector': [0, 1, 2], 'total': 1}
+
+
+def test_unknown_types_are_not_cached_as_strings():
+    cache = QueryResultCache()
+    key = make_key(cache)
+    cache.put(key, {'papers': [{'when': object()}]})
+
+    assert cache.get(key) is None
+    assert cache.stats()['size'] == 0
+
+
+def test_entry_follows_index_version():
+    cache = QueryResultCache()
+    index = build_paper_index(PAPERS[:4])
+    key = make_key(cache)
+    cache.put(key, {'result_set_id': index.result_set_id, 'papers': []}, index=index)
+    other_key = make_key(cache, 'text mining')
+    cache.put(other_key, {'result_set_id': None, 'papers': []})
+
+    assert cache.get(key) is not None
+    index.add_papers(PAPERS[4:])
+    assert cache.get(key) is None
+    assert cache.stats()['stale'] == 1
+    # Entri tanpa index tidak ikut terbuang
+    assert cache.get(other_key) is not None
+
+
+def test_entry_dropped_with_its_index():
+    cache = QueryResultCache()
+    index = build_paper_index(PAPERS)
+    key = make_key(cache)
+    cache.put(key, {'result_set_id': index.result_set_id, 'papers': []}, index=index)
+
+    paper_index._registry.remove(index.result_set_id)
+    assert cache.get(key) is None
+
+
+def test_invalidate_changes_fingerprint():
+    cache = QueryResultCache()
+    key = make_key(cache)
+    cache.put(key, {'papers': []})
+    cache.invalidate()
+
+    assert make_key(cache) != key
+    assert cache.get(key) is None
@@ -0,0 +1,83 @@
+"""
+Uji ranker BM25F dan LSA
+"""
+
+import numpy as np
+
+from src.core.bm25 import BM25Filter
+from src.core.content_based_filter import ContentBasedFilter
+from src.core.lsa import LSAFilter
+from synthetic import build_corpus
+
+PAPERS = [
+    {'title': 'Deep Learning for Natural Language Processing',
+     'abstract': 'A survey of deep learning techniques for NLP tasks including sentiment analysis, '
+                 'machine translation and text classification.'},
+    {'title': 'Machine Learning in Healthcare',
+     'abstract': 'Applications of machine learning algorithms in medical diagnosis, patient outcome '
+                 'prediction and drug discovery.'},
+    {'title': 'Neural Networks for Image Recognition',
+     'abstract': 'Convolutional neural networks for image classification and object detection tasks.'},
+    {'title': 'Text Mining and Sentiment Analysis',
+     'abstract': 'Extracting opinions and sentiments from text data using NLP and machine learning.'},
+    {'title': 'Reinforcement Learning in Robotics',
+     'abstract': 'Reinforcement learning algorithms for robot navigation and manipulation tasks.'},
+    {'title': 'Graph Neural Networks for Recommendation',
+     'abstract': 'Recommendation systems with graph neural networks over user item interactions.'},
+]
+
+
+def test_bm25_add_and_remove_match_fresh_fit():
+    bm25 = BM25Filter().fit(PAPERS[:4])
+    assert bm25.add_papers(PAPERS[4:]) == [4, 5]
+    assert bm25.remove_papers([1, 3]) == 2
+
+    expected = BM25Filter().fit([PAPERS[i] for i in (0, 2, 4, 5)])
+    assert [p['title'] for p in bm25.papers] == [p['title'] for p in expected.papers]
+    np.testing.assert_allclose(bm25.bm25_matrix.toarray(), expected.bm25_matrix.toarray())
+    assert bm25.calculate_similarity_to_query('neural networks', 3) == \
+        expected.calculate_similarity_to_query('neural networks', 3)
+
+
+def test_lsa_updates_match_from_filter():
+    lsa = LSAFilter(n_components=3, background_reweight=False).fit(PAPERS[:4])
+    assert lsa.add_papers(PAPERS[4:]) == [4, 5]
+    assert lsa.remove_papers([1]) == 1
+
+    cbf = ContentBasedFilter(background_reweight=False)
+    cbf.fit(PAPERS[:4])
+    cbf.add_papers(PAPERS[4:])
+    cbf.remove_papers([1])
+    expected = LSAFilter.from_filter(cbf, n_components=3)
+
+    assert lsa.embeddings.shape == (5, 3)
+    np.testing.assert_allclose(lsa.embeddings, expected.embeddings, atol=1e-6)
+    assert lsa.calculate_similarity_to_query('neural networks', 3) == \
+        expected.calculate_similarity_to_query('neural networks', 3)
+
+
+def test_bm25_scores_match_direct_formula():
+    papers = build_corpus(200)
+    bm25 = BM25Filter().fit(papers)
+    analyze = bm25.vectorizer.build_analyzer()
+    vocab = bm25.vectorizer.vocabulary_
+    fields = {
+        'title': [analyze(bm25.preprocess_text(p['title'])) for p in papers],
+        'abstract': [analyze(bm25.preprocess_text(p['abstract'])) for p in papers]
+    }
+    avg_length = {f: np.mean([len(tokens) for tokens in fields[f]]) for f in fields}
+
+    for query in [' '.join(bm25.paper_texts[i].split()[:3]) for i in range(0, 200, 40)]:
+        scores = bm25.query_scores(query)
+        query_terms = [t for t in analyze(bm25.preprocess_text(query)) if t in vocab]
+        max_score = sum(bm25.idf[vocab[t]] * (bm25.k1 + 1) for t in query_terms)
+        for doc in range(len(papers)):
+            expected = 0.0
+            for term in query_terms:
+                tf = 0.0
+                for f, tokens in fields.items():
+                    b = bm25.field_b[f]
+                    norm = 1 - b + b * len(tokens[doc]) / avg_length[f]
+                    tf += bm25.field_weights[f] * tokens[doc].count(term) / norm
+                expected += bm25.idf[vocab[term]] * tf * (bm25.k1 + 1) / (tf + bm25.k1)
+            assert abs(expected / max_score - scores[doc]) <= 1e-9
@@ -0,0 +1,82 @@
+"""
+Uji kesamaan ranking: top-k vs sort penuh, inverted index (MaxScore) vs
+matriks, batch vs query satu per satu, dan graph similar papers vs exact
+"""
+
+import random
+
+import numpy as np
+import pytest
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.core.bm25 import BM25Filter
+from src.core.content_based_filter import ContentBasedFilter
+from src.core.inverted_index import InvertedIndex
+from src.core.neighbor_graph import NeighborGraph
+from src.core.ranking import dot_scores, top_k_scored
+from synthetic import build_corpus, build_topic_corpus
+
+
+@pytest.fixture(scope='module')
+def cbf():
+    cbf = ContentBasedFilter(search_backend='matrix')
+    cbf.fit(build_corpus(400))
+    return cbf
+
+
+def sample_queries(cbf, n_queries, seed=7):
+    rng = random.Random(seed)
+    words = sorted(set(' '.join(cbf.paper_texts[:100]).split()))
+    return [' '.join(rng.sample(words, rng.randint(1, 4))) for _ in range(n_queries)]
+
+
+def test_top_k_matches_full_sort(cbf):
+    for query in sample_queries(cbf, 20):
+        query_vector = cbf.vectorizer.transform([cbf.preprocess_text(query)])
+        similarities = cosine_similarity(query_vector, cbf.tfidf_matrix).flatten()
+        expected = sorted(enumerate(similarities), key=lambda x: x[1], reverse=True)[:20]
+
+        actual = cbf.calculate_similarity_to_query(query, top_k=20)
+        # Urutan index bisa beda hanya pada skor yang sama
+        assert len(actual) == len(expected)
+        np.testing.assert_allclose([s for _, s in actual], [s for _, s in expected], rtol=0, atol=1e-9)
+
+
+@pytest.mark.parametrize('selective', [True, False])
+def test_maxscore_matches_matrix_top_k(cbf, selective):
+    inverted = InvertedIndex(cbf.tfidf_matrix)
+    df = cbf.tfidf_matrix.getnnz(axis=0)
+    terms = cbf.vectorizer.get_feature_names_out()
+    by_df = sorted(range(len(terms)), key=lambda t: df[t])
+    third = len(by_df) // 3
+    vocab = [terms[t] for t in (by_df[:third] if selective else by_df[-third:])]
+
+    rng = random.Random(3)
+    for _ in range(50):
+        query_vector = cbf.vectorizer.transform([' '.join(rng.sample(vocab, 3))])
+        for k in (1, 10):
+            assert inverted.search_scored(query_vector, k) == top_k_scored(dot_scores(query_vector, cbf.tfidf_matrix), k)
+
+
+def test_batch_matches_single_queries(cbf):
+    queries = sample_queries(cbf, 30)
+    assert cbf.rank_papers_batch(queries, 10) == [cbf.rank_papers_by_relevance(q, 10) for q in queries]
+
+    bm25 = BM25Filter().fit(cbf.papers)
+    assert bm25.calculate_similarity_batch(queries, 10) == \
+        [bm25.calculate_similarity_to_query(q, 10) for q in queries]
+
+
+def test_neighbor_graph_matches_exact_and_incremental_build():
+    cbf = ContentBasedFilter(search_backend='matrix', similar_backend='exact')
+    cbf.fit(build_topic_corpus(300))
+    matrix = cbf.tfidf_matrix
+    graph = NeighborGraph(matrix, k=10)
+
+    for row in range(0, 300, 7):
+        assert graph.neighbors(row, 10) == cbf.get_similar_papers(row, 10)
+
+    incremental = NeighborGraph(matrix[:240], k=10)
+    incremental.add(matrix[240:])
+    np.testing.assert_array_equal(incremental.ids, graph.ids)
+    np.testing.assert_array_equal(incremental.scores, graph.scores)
@@ -0,0 +1,98 @@
+"""
+Uji rate limiter + retry dan connection pool HttpClient terhadap stub API
+lokal (kuota token bucket di server, 429 + Retry-After, 5xx acak)
+"""
+
+import json
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.scrapers.http_client import HttpClient
+from src.scrapers.rate_limiter import RateLimiter, RetryPolicy, TokenBucket, parse_retry_after
+from stub_server import start_stub_server
+
+BODY = json.dumps({'data': []}).encode()
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def serve(respond):
+        server, base_url = start_stub_server(respond)
+        servers.append(server)
+        return server, f"{base_url}/graph/v1/paper/search"
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('2.5') == 2.5
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:05 GMT', now=1445412480) == 5.0
+    assert parse_retry_after('soon') is None
+    assert parse_retry_after(None) is None
+
+
+def test_acquire_with_max_wait_returns_the_token():
+    limiter = RateLimiter(default=(1.0, 1))
+    assert limiter.acquire('api') == 0.0
+    with pytest.raises(TimeoutError):
+        limiter.acquire('api', max_wait=0.1)
+    # Token yang ditolak dikembalikan: antrean tidak bertambah panjang
+    assert limiter._bucket('api').tokens >= 0
+
+
+def test_retries_reach_quota_without_failures(stub):
+    quota = TokenBucket(50.0, burst=10)
+    rng = random.Random(29)
+    rng_lock = threading.Lock()
+
+    def respond(path, params):
+        if quota.reserve() > 0:
+            quota.release()  # Request ditolak tidak memakai kuota
+            return 429, BODY, {'Retry-After': '0.2'}
+        with rng_lock:
+            failed = rng.random() < 0.05
+        return (503, BODY, {}) if failed else BODY
+
+    _, url = stub(respond)
+    client = HttpClient(pool_maxsize=4, rate_limiter=RateLimiter(default=(100.0, 10)),
+                        retry=RetryPolicy(max_retries=5, backoff_base=0.05, backoff_max=1.0))
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        statuses = list(executor.map(lambda i: client.get(url, params={'query': i}).status_code, range(80)))
+    stats = client.stats()['rate_limits']['127.0.0.1']
+    client.close()
+
+    assert statuses == [200] * 80
+    assert stats['failures'] == 0
+    assert stats['throttled_responses'] > 0
+    assert stats['rate'] < 100.0
+
+
+def test_retry_exhausted_returns_last_response(stub):
+    server, url = stub(lambda path, params: (503, BODY, {}))
+    client = HttpClient(rate_limiter=RateLimiter(default=(1000.0, 1000)),
+                        retry=RetryPolicy(max_retries=2, backoff_base=0.0))
+    assert client.get(url).status_code == 503
+    assert server.requests == 3
+    assert client.rate_limiter.stats()['127.0.0.1']['failures'] == 1
+
+
+def test_connections_are_reused(stub):
+    server, url = stub(lambda path, params: BODY)
+    client = HttpClient(pool_maxsize=4, rate_limiter=RateLimiter(default=(1e6, 10 ** 6)))
+    assert all(client.get(url, params={'query': i}).json() == {'data': []} for i in range(20))
+    assert client.stats()['connections'] == 1
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(lambda i: client.get(url, params={'query': i}).json(), range(40)))
+    stats = client.stats()
+    client.close()
+    assert stats['requests'] == 60
+    assert stats['connections'] <= 5
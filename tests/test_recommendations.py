@@ -0,0 +1,43 @@
+"""
+Uji rekomendasi Rocchio dengan dan tanpa PaperIndex
+"""
+
+from src.core.content_based_filter import ContentBasedFilter, get_paper_recommendations
+from src.core.paper_index import PaperIndex
+
+from test_paper_index import PAPERS
+
+
+def test_fallback_matches_index_recommendations():
+    index = PaperIndex(PAPERS)
+    selected = [index.papers[0], index.papers[3]]
+
+    with_index = get_paper_recommendations(selected, [], top_n=3, index=index)
+    without_index = get_paper_recommendations(selected, PAPERS, top_n=3)
+
+    assert [p['title'] for p in without_index] == [p['title'] for p in with_index]
+    assert [p['similarity_score'] for p in without_index] == [p['similarity_score'] for p in with_index]
+    assert not {p['title'] for p in selected} & {p['title'] for p in without_index}
+
+
+def test_fallback_accepts_selected_papers_outside_corpus():
+    outside = {'title': 'Sentiment Analysis of Product Reviews',
+               'abstract': 'Text classification of opinions and sentiment in reviews with machine learning.'}
+    recommendations = get_paper_recommendations([outside], PAPERS, top_n=2)
+
+    assert len(recommendations) == 2
+    assert recommendations[0]['title'] == 'Text Mining and Sentiment Analysis'
+    assert get_paper_recommendations([outside], [], top_n=2) == []
+
+
+def test_filter_method_matches_module_recommendations(monkeypatch):
+    selected = [PAPERS[0], PAPERS[3]]
+    expected = get_paper_recommendations(selected, PAPERS, top_n=3)
+    assert ContentBasedFilter().get_recommendations(selected, PAPERS, top_n=3) == expected
+
+    # Filter yang sudah di-fit pada papers yang sama: tanpa fit ulang
+    cbf = ContentBasedFilter().fit(PAPERS)
+    fits = []
+    monkeypatch.setattr(ContentBasedFilter, 'fit', lambda self, papers: fits.append(papers))
+    assert cbf.get_recommendations(selected, cbf.papers, top_n=3) == expected
+    assert not fits
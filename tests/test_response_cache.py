@@ -0,0 +1,120 @@
+"""
+Uji response cache scraper dan pagination Semantic Scholar terhadap stub
+API lokal
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.scrapers import semantic_scholar
+from src.scrapers.response_cache import configure_response_cache
+from stub_server import start_stub_server, stub_semantic_scholar
+
+QUERIES = ['machine learning classification', 'deep learning neural network',
+           'content based filtering recommendation']
+
+# Varian penulisan query dan limit yang lebih kecil memakai entri yang sama
+WORKLOAD = [(variant, limit) for query in QUERIES
+            for variant, limit in ((query, 20), (query.upper(), 20), ('  ' + query.replace(' ', '  '), 10))]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    def serve(respond=stub_semantic_scholar):
+        server, base_url = start_stub_server(respond)
+        servers.append(server)
+        monkeypatch.setattr(semantic_scholar, 'SEMANTIC_SCHOLAR_API', f"{base_url}/graph/v1/paper/search")
+        return server
+
+    servers = []
+    yield serve
+    configure_response_cache()
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def search_all(workload):
+    return [semantic_scholar.search_semantic_scholar(query, limit) for query, limit in workload]
+
+
+def test_cache_serves_repeated_searches(api, tmp_path):
+    server = api()
+    configure_response_cache(ttl_seconds=0)
+    expected = search_all(WORKLOAD)
+    assert server.requests == len(WORKLOAD)
+
+    path = str(tmp_path / 'responses.sqlite')
+    configure_response_cache(path=path)
+    before = server.requests
+    assert search_all(WORKLOAD * 2) == expected * 2
+    assert server.requests - before == len(QUERIES)
+
+    # Dibuka ulang dari disk (seperti restart proses): tanpa request API
+    configure_response_cache(path=path)
+    before = server.requests
+    assert search_all(WORKLOAD) == expected
+    assert server.requests == before
+
+
+def test_stale_entries_are_returned_and_refreshed(api):
+    server = api()
+    cache = configure_response_cache()
+    expected = search_all([(query, 20) for query in QUERIES])
+
+    with cache._lock:
+        cache._conn.execute('UPDATE responses SET created_at = created_at - ?', (cache.ttl_seconds + 1,))
+        cache._conn.commit()
+    before = server.requests
+    assert search_all([(query, 20) for query in QUERIES]) == expected
+    assert cache.stale_hits == len(QUERIES)
+
+    for _ in range(200):
+        if not cache._inflight:
+            break
+        time.sleep(0.01)
+    assert server.requests - before == len(QUERIES)
+
+    # Setelah refresh: hit biasa
+    hits = cache.hits
+    semantic_scholar.search_semantic_scholar(QUERIES[0], 20)
+    assert cache.hits == hits + 1
+
+
+def test_concurrent_pages_match_serial_without_duplicates(api, monkeypatch):
+    def respond(path, params):
+        body = json.loads(stub_semantic_scholar(path, params))
+        offset = int(params.get('offset', 0))
+        if offset and body['data']:
+            # Paper terakhir halaman sebelumnya muncul lagi (hasil API bergeser)
+            previous = stub_semantic_scholar(path, dict(params, offset=offset - 1, limit=1))
+            body['data'][0] = json.loads(previous)['data'][0]
+        return json.dumps(body).encode()
+
+    api(respond)
+    configure_response_cache(ttl_seconds=0)
+    outputs = {}
+    for n_workers in (1, 4):
+        monkeypatch.setattr(semantic_scholar, 'MAX_PAGE_WORKERS', n_workers)
+        pages = []
+        outputs[n_workers] = semantic_scholar.search_semantic_scholar('machine learning', 500,
+                                                                      on_page=pages.append)
+        assert sum(len(page) for page in pages) == len(outputs[n_workers])
+
+    ids = [p['paper_id'] for p in outputs[4]]
+    assert outputs[1] == outputs[4]
+    assert len(ids) == len(set(ids)) == 500 - 4
+
+
+def test_counters_are_exact_under_concurrent_hits(api):
+    api()
+    cache = configure_response_cache()
+    semantic_scholar.search_semantic_scholar(QUERIES[0], 20)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda i: semantic_scholar.search_semantic_scholar(QUERIES[0], 20), range(400)))
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (400, 1)
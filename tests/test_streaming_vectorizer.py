@@ -0,0 +1,38 @@
+"""
+Uji mode hashing (partial_fit / transform per chunk): identik dengan
+TF-IDF dari count vocabulary yang dijumlahkan per kolom hash
+"""
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, HashingVectorizer
+from sklearn.preprocessing import normalize
+
+from src.core.content_based_filter import ContentBasedFilter
+from synthetic import build_corpus
+
+TOKEN_PATTERN = r'(?u)\b[a-zA-Z]{3,}\b'
+
+
+def test_chunked_hashing_matches_vocabulary_counts():
+    n_features = 2 ** 12   # Kecil: ada tabrakan hash yang ikut diuji
+    papers = build_corpus(300)
+    stream = ContentBasedFilter(vectorizer_mode='hashing', n_hash_features=n_features)
+    chunks = [papers[i:i + 64] for i in range(0, len(papers), 64)]
+    for chunk in chunks:
+        stream.partial_fit(chunk)
+    hashed = np.vstack([stream.transform_papers(chunk).toarray() for chunk in chunks])
+
+    texts = [stream._paper_text(p) for p in papers]
+    counts = CountVectorizer(stop_words=stream.analyzer.stop_words_list, ngram_range=(1, 2),
+                             token_pattern=TOKEN_PATTERN)
+    vocabulary_counts = counts.fit_transform(texts)
+    term_hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None,
+                                    analyzer=lambda term: [term])
+    projection = term_hasher.transform(counts.get_feature_names_out())
+    assert len(np.unique(projection.indices)) < projection.shape[0]
+
+    bucket_counts = (vocabulary_counts @ projection).astype(np.float64).tocsr()
+    df = bucket_counts.getnnz(axis=0)
+    idf = np.log((1 + len(papers)) / (1 + df)) + 1
+    bucket_counts.data = (np.log(bucket_counts.data) + 1) * idf[bucket_counts.indices]
+    np.testing.assert_allclose(hashed, normalize(bucket_counts).toarray(), rtol=0, atol=1e-12)
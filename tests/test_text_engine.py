@@ -0,0 +1,151 @@
+"""
+Uji PreprocessEngine terhadap tokenizer NLTK dan tabel lemma.
+
+Tokenizer kata NLTK (NLTKWordTokenizer, bagian word_tokenize setelah
+pemecahan kalimat) tidak membutuhkan data punkt, sehingga uji ini tetap
+membandingkan dengan NLTK - bukan dengan fallback split() - di lingkungan
+tanpa data NLTK. Tanpa paket nltk, uji gagal.
+"""
+
+import re
+import threading
+
+from nltk.tokenize import NLTKWordTokenizer
+from nltk.tokenize.destructive import MacIntyreContractions
+
+from src.core import text_engine
+from src.core.text_engine import LemmaTable, PreprocessEngine, WORD_TOKENIZE_SPLITS, reference_preprocess
+
+STOP_WORDS = frozenset({'the', 'and', 'for', 'are', 'was', 'not', 'with', 'this', 'can', 'see'})
+
+TEXTS = [
+    '',
+    'Machine Learning for NLP, 2nd edition (2023)!',
+    'We cannot say; gonna wanna gotta lemme gimme',
+    'wanna',
+    'i wanna',
+    'wanna go wanna',
+    'wannabe cannotx xgonna gottaa lemmes gimmee',
+    'CANNOT Wanna GoNNa',
+    'See https://example.org/paper?id=1 or www.example.com/x for details',
+    'Contact author@example.com, or ahttp://x@y and foo@http://bar',
+    'Deep-learning based     text_classification\tand\nsentiment analyses',
+    'Studies of the networks were running analyses on data corpora',
+    'Penelitian ini menggunakan metode klasifikasi dengan algoritma SVM',
+]
+
+
+class SuffixLemmatizer:
+    """Lemmatizer deterministik tanpa data WordNet: buang akhiran 's'"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def lemmatize(self, token):
+        self.calls += 1
+        if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+            return token[:-1]
+        return token
+
+
+def clean(text):
+    """Teks setelah regex pipeline acuan (input word_tokenize)"""
+    text = str(text).lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'[^a-zA-Z\s]', ' ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def make_engine(lemmatizer=None):
+    engine = PreprocessEngine(STOP_WORDS, lemmatizer or SuffixLemmatizer())
+    # Selalu uji jalur word_tokenize, juga jika data punkt tidak terpasang
+    engine.split_contractions = True
+    return engine
+
+
+def test_contraction_table_covers_nltk():
+    # Kontraksi NLTK tanpa apostrof harus ada di tabel, dan sebaliknya
+    nltk_splits = {}
+    for pattern in MacIntyreContractions.CONTRACTIONS2:
+        parts = re.findall(r'\(([a-z]+)\)', pattern)
+        if len(parts) == 2:
+            nltk_splits[''.join(parts)] = tuple(parts)
+    assert nltk_splits == WORD_TOKENIZE_SPLITS
+
+
+def test_tokenize_matches_nltk_word_tokenizer():
+    tokenizer = NLTKWordTokenizer()
+    engine = make_engine()
+    for text in TEXTS:
+        assert engine.tokenize(text) == tokenizer.tokenize(clean(text)), text
+
+
+def test_process_matches_reference_pipeline(monkeypatch):
+    # word_tokenize untuk satu kalimat tanpa tanda baca = NLTKWordTokenizer
+    monkeypatch.setattr(text_engine, 'word_tokenize', NLTKWordTokenizer().tokenize)
+    engine = make_engine()
+    for text in TEXTS:
+        assert engine.process(text) == reference_preprocess(text, STOP_WORDS, SuffixLemmatizer()), text
+
+
+def test_lemma_table_evicts_least_recently_used():
+    table = LemmaTable(SuffixLemmatizer(), max_entries=2)
+    table.lookup('networks')
+    table.lookup('models')
+    table.lookup('networks')   # dipakai lagi: models jadi yang terlama
+    table.lookup('graphs')
+
+    assert list(table._table) == ['networks', 'graphs']
+    assert table.stats()['hits'] == 1
+    assert table.stats()['misses'] == 3
+
+
+def test_lemma_table_counters_are_thread_safe():
+    table = LemmaTable(SuffixLemmatizer(), max_entries=50)
+    tokens = [f'token{i}s' for i in range(100)]
+    n_threads, rounds = 8, 20
+
+    def worker():
+        for _ in range(rounds):
+            for token in tokens:
+                table.lookup(token)
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = table.stats()
+    assert stats['hits'] + stats['misses'] == n_threads * rounds * len(tokens)
+    assert stats['size'] <= 50
+
+
+def test_lemmatizer_error_is_not_permanent():
+    class FlakyLemmatizer(SuffixLemmatizer):
+        def lemmatize(self, token):
+            if self.calls == 0:
+                self.calls += 1
+                raise RuntimeError('temporary failure')
+            return super().lemmatize(token)
+
+    table = LemmaTable(FlakyLemmatizer())
+    assert table.lookup('networks') == 'networks'   # gagal: token tidak diubah
+    assert table.lookup('networks') == 'network'    # kegagalan tidak disimpan
+    assert table.lookup('models') == 'model'
+    assert table.stats()['errors'] == 1
+
+
+def test_missing_wordnet_is_cached_per_token():
+    class MissingData:
+        calls = 0
+
+        def lemmatize(self, token):
+            self.calls += 1
+            raise LookupError('Resource wordnet not found')
+
+    lemmatizer = MissingData()
+    table = LemmaTable(lemmatizer)
+    assert [table.lookup(t) for t in ('networks', 'networks', 'models')] == ['networks', 'networks', 'models']
+    assert lemmatizer.calls == 2